@@ -9,6 +9,9 @@ interface AuthContextType {
     user: any;
     token: string | null;
     isManager: boolean;
+    // Dashboard / analytics / financials datasets from /api/bootstrap/
+    bootstrap: any;
+    refreshBootstrap: () => Promise<void>;
     login: (username: string, pass: string) => Promise<void>;
     logout: () => void;
     isLoading: boolean;
@@ -20,18 +23,20 @@ export const AuthProvider = ({ children }: { children: React.ReactNode }) => {
     const [user, setUser] = useState<any>(null);
     const [token, setToken] = useState<string | null>(localStorage.getItem('token'));
     const [isManager, setIsManager] = useState(false);
+    const [bootstrap, setBootstrap] = useState<any>(null);
     const [isLoading, setIsLoading] = useState(true);
 
-    // Helper to fetch profile
+    // Helper to fetch profile (+ the app shell's datasets, in the same request)
     const fetchProfile = async (currentToken: string) => {
         try {
             axios.defaults.headers.common['Authorization'] = `Token ${currentToken}`;
             // UPDATED: Use API_URL constant
-            const res = await axios.get(`${API_URL}/api/me/`);
+            const res = await axios.get(`${API_URL}/api/bootstrap/`);
 
-            console.log("🔍 API CHECK:", res.data);
-            setUser({ username: res.data.username });
-            setIsManager(res.data.is_manager);
+            const { user: profile, ...datasets } = res.data;
+            setUser({ username: profile.username });
+            setIsManager(profile.is_manager);
+            setBootstrap(datasets);
         } catch (error) {
             console.error("Failed to load profile", error);
         }
@@ -50,10 +55,17 @@ export const AuthProvider = ({ children }: { children: React.ReactNode }) => {
         await fetchProfile(newToken);
     };
 
+    const refreshBootstrap = async () => {
+        if (token) await fetchProfile(token);
+    };
+
     const logout = () => {
+        // Revoke the token server-side too; the local session ends either way
+        if (token) axios.post(`${API_URL}/api/logout/`, null, { headers: { Authorization: `Token ${token}` } }).catch(() => {});
         setToken(null);
         setUser(null);
         setIsManager(false);
+        setBootstrap(null);
         localStorage.removeItem('token');
         delete axios.defaults.headers.common['Authorization'];
     };
@@ -67,7 +79,7 @@ export const AuthProvider = ({ children }: { children: React.ReactNode }) => {
     }, [token]);
 
     return (
-        <AuthContext.Provider value={{ user, token, isManager, login, logout, isLoading }}>
+        <AuthContext.Provider value={{ user, token, isManager, bootstrap, refreshBootstrap, login, logout, isLoading }}>
             {children}
         </AuthContext.Provider>
     );
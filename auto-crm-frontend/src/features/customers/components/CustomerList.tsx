@@ -9,35 +9,36 @@ export const CustomerList = () => {
   const [customers, setCustomers] = useState<any[]>([]);
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState('');
+  const [nextPage, setNextPage] = useState<string | null>(null);
   
   // Modal State
   const [selectedCustomer, setSelectedCustomer] = useState(null);
 
+  const token = localStorage.getItem('token');
+  // Use the environment variable here
+  const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+  const headers = { Authorization: `Token ${token}` };
+
+  // The directory is paginated + searched on the server (profiles table)
+  const fetchCustomers = async (url: string, append = false) => {
+    try {
+      const res = await axios.get(url, { headers });
+      setCustomers(prev => append ? [...prev, ...res.data.results] : res.data.results);
+      setNextPage(res.data.next);
+    } catch (error) {
+      console.error("Failed to load customers", error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   useEffect(() => {
-    const fetchCustomers = async () => {
-      try {
-        const token = localStorage.getItem('token');
-        
-        // Use the environment variable here
-        const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
-        
-        const res = await axios.get(`${API_URL}/api/customers/360/`, {
-            headers: { Authorization: `Token ${token}` }
-        });
-        setCustomers(res.data);
-      } catch (error) {
-        console.error("Failed to load customers", error);
-      } finally {
-        setLoading(false);
-      }
-    };
-    fetchCustomers();
-  }, []);
-  // Filter
-  const filteredCustomers = customers.filter(c => 
-    c.name.toLowerCase().includes(searchTerm.toLowerCase()) || 
-    c.phone.includes(searchTerm)
-  );
+    const timer = setTimeout(() => {
+      const params = new URLSearchParams({ search: searchTerm.trim() });
+      fetchCustomers(`${API_URL}/api/customers/360/?${params}`);
+    }, 300);
+    return () => clearTimeout(timer);
+  }, [searchTerm]);
 
   return (
     <div className="space-y-6">
@@ -70,7 +71,7 @@ export const CustomerList = () => {
              <div className="text-center py-20 text-apex-muted animate-pulse">Loading directory...</div>
           ) : (
             <div className="divide-y divide-apex-border/50">
-              {filteredCustomers.map((customer, idx) => (
+              {customers.map((customer, idx) => (
                 <div 
                   key={idx} 
                   className="flex items-center justify-between py-4 px-3 hover:bg-apex-black/50 rounded-lg cursor-pointer transition-all duration-200 group border border-transparent hover:border-apex-border/50 my-1"
@@ -105,7 +106,16 @@ export const CustomerList = () => {
                 </div>
               ))}
 
-              {filteredCustomers.length === 0 && (
+              {nextPage && (
+                  <button
+                    className="w-full py-3 mt-2 text-sm font-bold text-apex-muted hover:text-white transition-colors"
+                    onClick={() => fetchCustomers(nextPage, true)}
+                  >
+                    Load more
+                  </button>
+              )}
+
+              {customers.length === 0 && (
                   <div className="py-12 text-center text-apex-muted italic border border-dashed border-apex-border rounded-xl mt-4">
                       No customers found matching "{searchTerm}"
                   </div>
@@ -1,3 +1,5 @@
+import { useState, useEffect } from "react";
+import axios from "axios";
 import { Dialog, DialogContent, DialogTitle, DialogDescription } from "@/components/ui/dialog";
 import { Badge } from "@/components/ui/badge";
 import { Button } from "@/components/ui/button"; 
@@ -5,17 +7,21 @@ import { Car, Wrench, Calendar, User, DollarSign, History, X } from "lucide-reac
 
 interface HistoryEvent {
   type: 'SALE' | 'SERVICE';
+  id: number;
   date: string;
   status: string;
   description: string;
   amount: number;
 }
 
+// Summary row from /api/customers/360/ - the timeline is fetched separately
 interface Customer {
+  id: number;
   name: string;
   phone: string;
   lifetime_value: number;
-  history: HistoryEvent[];
+  lead_count: number;
+  service_count: number;
 }
 
 interface Props {
@@ -25,6 +31,35 @@ interface Props {
 }
 
 export const CustomerProfileModal = ({ customer, isOpen, onClose }: Props) => {
+  const [history, setHistory] = useState<HistoryEvent[]>([]);
+  const [nextPage, setNextPage] = useState<string | null>(null);
+  const [loading, setLoading] = useState(false);
+
+  const API_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
+  const fetchTimeline = async (url: string, append = false) => {
+    setLoading(true);
+    try {
+      const token = localStorage.getItem('token');
+      const res = await axios.get(url, { headers: { Authorization: `Token ${token}` } });
+      setHistory(prev => append ? [...prev, ...res.data.results] : res.data.results);
+      setNextPage(res.data.next);
+    } catch (error) {
+      console.error("Failed to load customer timeline", error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
+  // Load the first page of the journey only when a profile is opened
+  useEffect(() => {
+    setHistory([]);
+    setNextPage(null);
+    if (customer && isOpen) {
+      fetchTimeline(`${API_URL}/api/customers/360/${customer.id}/timeline/`);
+    }
+  }, [customer?.id, isOpen]);
+
   if (!customer) return null;
 
   return (
@@ -83,13 +118,13 @@ export const CustomerProfileModal = ({ customer, isOpen, onClose }: Props) => {
                 <History className="w-4 h-4" /> Customer Journey
              </h3>
              <Badge variant="outline" className="text-apex-muted border-apex-border text-[10px] md:text-xs">
-                {customer.history.length} Records
+                {customer.lead_count + customer.service_count} Records
              </Badge>
           </div>
           
           <div className="space-y-3">
-            {customer.history.map((event, index) => (
-              <div key={index} className="flex gap-3 md:gap-4 items-start p-3 md:p-4 rounded-xl border border-apex-border bg-apex-black/40 hover:bg-apex-black hover:border-apex-gray transition-all group">
+            {history.map((event) => (
+              <div key={`${event.type}-${event.id}`} className="flex gap-3 md:gap-4 items-start p-3 md:p-4 rounded-xl border border-apex-border bg-apex-black/40 hover:bg-apex-black hover:border-apex-gray transition-all group">
                 {/* Icon Box */}
                 <div className={`p-2 md:p-3 rounded-xl border shadow-inner shrink-0 ${
                     event.type === 'SALE' 
@@ -126,7 +161,18 @@ export const CustomerProfileModal = ({ customer, isOpen, onClose }: Props) => {
               </div>
             ))}
 
-            {customer.history.length === 0 && (
+            {nextPage && (
+                <Button
+                  variant="ghost"
+                  className="w-full text-apex-muted hover:text-white"
+                  disabled={loading}
+                  onClick={() => fetchTimeline(nextPage, true)}
+                >
+                  {loading ? "Loading..." : "Load older events"}
+                </Button>
+            )}
+
+            {!loading && history.length === 0 && (
                 <div className="text-center py-8 md:py-12 text-apex-muted italic border-2 border-dashed border-apex-border rounded-xl bg-apex-black/20 text-sm">
                     No history found for this customer.
                 </div>
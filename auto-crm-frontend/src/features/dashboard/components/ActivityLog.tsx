@@ -2,11 +2,11 @@ import { useState, useEffect } from "react";
 import axios from "axios";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Badge } from "@/components/ui/badge";
-import { Wrench, Users, Calendar as CalendarIcon, Filter, Search, ChevronDown } from "lucide-react";
+import { Wrench, Users, Car, TrendingUp, Calendar as CalendarIcon, Filter, Search, ChevronDown } from "lucide-react";
 import { Input } from "@/components/ui/input";
 
 // Define Types
-type ActivityType = 'LEAD' | 'SERVICE' | 'APPOINTMENT';
+type ActivityType = 'LEAD' | 'SALE' | 'INVENTORY' | 'SERVICE' | 'APPOINTMENT';
 
 interface ActivityItem {
   id: string;
@@ -17,67 +17,45 @@ interface ActivityItem {
   status: string;
 }
 
+const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
 export const ActivityLog = () => {
   const [activities, setActivities] = useState<ActivityItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [filter, setFilter] = useState<string>('ALL');
   const [search, setSearch] = useState('');
+  // Keyset cursor for the next (older) page, null when there is none
+  const [nextCursor, setNextCursor] = useState<number | null>(null);
 
   useEffect(() => {
-    fetchAllActivity();
-  }, []);
+    fetchActivity();
+  }, [filter]);
 
-  const fetchAllActivity = async () => {
+  // GET /api/activity/ - the activity log, newest first (?type=, ?cursor=)
+  const fetchActivity = async (cursor?: number) => {
     try {
       setLoading(true);
       const token = localStorage.getItem('token');
-      const config = { headers: { Authorization: `Token ${token}` } };
-
-      // Define the base URL once
-      const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
-
-      const [leadsRes, serviceRes, apptRes] = await Promise.all([
-        axios.get(`${API_BASE_URL}/api/sales/leads/`, config),
-        axios.get(`${API_BASE_URL}/api/service/records/`, config),
-        axios.get(`${API_BASE_URL}/api/service/appointments/`, config)
-      ]);
-
-      // 1. Process Leads
-      const leads = leadsRes.data.map((l: any) => ({
-        id: `lead-${l.id}`,
-        type: 'LEAD',
-        title: `New Lead: ${l.first_name} ${l.last_name}`,
-        subtitle: `Vehicle Interest: ${l.vehicle_details?.model || 'Unknown'}`,
-        date: l.created_at,
-        status: l.status
-      }));
-
-      // 2. Process Service Jobs
-      const services = serviceRes.data.map((s: any) => ({
-        id: `svc-${s.id}`,
-        type: 'SERVICE',
-        title: `Service Job: ${s.description}`,
-        subtitle: `Plate: ${s.vehicle_details?.license_plate || 'N/A'}`,
-        date: s.date,
-        status: s.status
-      }));
-
-      // 3. Process Appointments
-      const appointments = apptRes.data.map((a: any) => ({
-        id: `appt-${a.id}`,
-        type: 'APPOINTMENT',
-        title: `Appointment: ${a.title}`,
-        subtitle: `Scheduled for Customer #${a.customer}`,
-        date: a.start_time,
-        status: a.status
+      const params: Record<string, string | number> = { limit: 50 };
+      if (filter !== 'ALL') params.type = filter;
+      if (cursor) params.cursor = cursor;
+
+      const res = await axios.get(`${API_BASE_URL}/api/activity/`, {
+        headers: { Authorization: `Token ${token}` },
+        params
+      });
+
+      const items: ActivityItem[] = res.data.results.map((e: any) => ({
+        id: `event-${e.id}`,
+        type: e.type,
+        title: e.message,
+        subtitle: e.actor ? `by ${e.actor}` : 'System',
+        date: e.time,
+        status: e.data?.to || e.action.toUpperCase()
       }));
 
-      // 4. Combine & SORT (Newest Date First)
-      const combined = [...leads, ...services, ...appointments].sort((a, b) =>
-        new Date(b.date).getTime() - new Date(a.date).getTime()
-      );
-
-      setActivities(combined);
+      setActivities(prev => cursor ? [...prev, ...items] : items);
+      setNextCursor(res.data.next_cursor);
     } catch (error) {
       console.error("Error loading activity", error);
     } finally {
@@ -85,33 +63,29 @@ export const ActivityLog = () => {
     }
   };
 
-  // --- FILTERING LOGIC ---
+  // --- FILTERING LOGIC (the type filter is applied by the server) ---
   const filteredActivities = activities.filter(item => {
-    const matchesType =
-      filter === 'ALL' ? true :
-        filter === 'LEAD' ? item.type === 'LEAD' :
-          filter === 'SERVICE' ? item.type === 'SERVICE' :
-            filter === 'APPOINTMENT' ? item.type === 'APPOINTMENT' : true;
-
     const searchLower = search.toLowerCase();
     const matchesSearch =
       item.title.toLowerCase().includes(searchLower) ||
       item.subtitle.toLowerCase().includes(searchLower) ||
       item.status.toLowerCase().includes(searchLower);
 
-    return matchesType && matchesSearch;
+    return matchesSearch;
   });
 
   const getIcon = (type: ActivityType) => {
     switch (type) {
       case 'LEAD': return <Users className="h-5 w-5 text-apex-info" />;
+      case 'SALE': return <TrendingUp className="h-5 w-5 text-apex-success" />;
+      case 'INVENTORY': return <Car className="h-5 w-5 text-apex-silver" />;
       case 'SERVICE': return <Wrench className="h-5 w-5 text-apex-warning" />;
       case 'APPOINTMENT': return <CalendarIcon className="h-5 w-5 text-purple-400" />;
     }
   };
 
   const getStatusColor = (status: string) => {
-    if (['COMPLETED', 'SOLD', 'WON'].includes(status)) return "bg-apex-success/20 text-apex-success border-apex-success/30";
+    if (['COMPLETED', 'SOLD', 'WON', 'CREATED'].includes(status)) return "bg-apex-success/20 text-apex-success border-apex-success/30";
     if (['PENDING', 'SCHEDULED', 'NEW', 'IN_PROGRESS'].includes(status)) return "bg-apex-info/20 text-apex-info border-apex-info/30";
     return "bg-apex-gray text-apex-silver border-apex-border";
   };
@@ -156,7 +130,9 @@ export const ActivityLog = () => {
                 >
                   <option value="ALL">All Events</option>
                   <option value="APPOINTMENT">Appointments</option>
+                  <option value="INVENTORY">Inventory</option>
                   <option value="LEAD">Sales Leads</option>
+                  <option value="SALE">Sales</option>
                   <option value="SERVICE">Service Jobs</option>
                 </select>
                 {/* Custom Arrow Icon */}
@@ -170,7 +146,7 @@ export const ActivityLog = () => {
 
         {/* ACTIVITY LIST */}
         <CardContent className="p-0 bg-apex-surface rounded-b-xl">
-          {loading ? (
+          {loading && activities.length === 0 ? (
             <div className="p-12 text-center text-apex-muted animate-pulse">Loading activities...</div>
           ) : filteredActivities.length === 0 ? (
             <div className="p-12 text-center text-apex-muted italic border-dashed border-t border-apex-border">No matching records found.</div>
@@ -208,6 +184,19 @@ export const ActivityLog = () => {
               ))}
             </div>
           )}
+
+          {/* Older events (keyset pagination) */}
+          {nextCursor && (
+            <div className="p-4 border-t border-apex-border text-center">
+              <button
+                onClick={() => fetchActivity(nextCursor)}
+                disabled={loading}
+                className="text-sm text-apex-muted hover:text-white hover:underline transition-colors disabled:opacity-50"
+              >
+                {loading ? 'Loading...' : 'Load older activity'}
+              </button>
+            </div>
+          )}
         </CardContent>
       </Card>
     </div>
@@ -5,8 +5,22 @@ import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Car, Users, Wrench, TrendingUp, Activity, Calendar as CalendarIcon, Settings, Briefcase } from "lucide-react";
 import { RevenueChart } from './RevenueChart';
 import { LeadSourceChart } from './LeadSourceChart';
+import { useAuth } from '@/context/AuthContext';
+
+const activityIcon = (type: string) => {
+  switch (type) {
+    case 'LEAD': return <Users className="h-4 w-4 text-apex-info" />;
+    case 'SALE': return <TrendingUp className="h-4 w-4 text-apex-success" />;
+    case 'SERVICE': return <Wrench className="h-4 w-4 text-apex-warning" />;
+    case 'APPOINTMENT': return <CalendarIcon className="h-4 w-4 text-purple-400" />;
+    default: return <Car className="h-4 w-4 text-apex-silver" />;
+  }
+};
 
 export const Dashboard = () => {
+  // KPI cards and charts arrive with the login bootstrap (/api/bootstrap/)
+  const { bootstrap, refreshBootstrap } = useAuth();
+
   const [stats, setStats] = useState({
     totalCars: 0,
     activeLeads: 0,
@@ -25,6 +39,79 @@ export const Dashboard = () => {
     fetchDashboardData();
   }, []);
 
+  useEffect(() => {
+    if (!bootstrap) return;
+    setStats(prev => ({ ...prev, inventoryValue: bootstrap.dashboard.stats.inventory_value }));
+    setAnalytics({
+      revenue: bootstrap.analytics.revenue_chart,
+      sources: bootstrap.analytics.lead_sources
+    });
+    // Latest entries of the activity log (/api/activity/)
+    setRecentActivity(bootstrap.dashboard.activity.map((event: any) => ({
+      id: `event-${event.id}`,
+      type: event.type,
+      text: event.message,
+      date: event.time,
+      icon: activityIcon(event.type)
+    })));
+  }, [bootstrap]);
+
+  const reloadAll = () => {
+    fetchDashboardData();
+    refreshBootstrap();
+  };
+
+  // Live updates pushed by the server: new leads, sales, finished jobs, KPI cards
+  useEffect(() => {
+    const token = localStorage.getItem('token');
+    const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+    const source = new EventSource(`${API_BASE_URL}/api/dashboard/live/?token=${token}`);
+
+    const addActivity = (item: any) => setRecentActivity(prev => [item, ...prev].slice(0, 5));
+
+    source.addEventListener('lead', (e: MessageEvent) => {
+      const lead = JSON.parse(e.data);
+      setStats(prev => ({ ...prev, activeLeads: prev.activeLeads + 1 }));
+      addActivity({
+        id: `lead-${lead.id}`,
+        type: 'LEAD',
+        text: `New Lead: ${lead.name} interested in ${lead.vehicle || 'Vehicle'}`,
+        date: lead.created_at,
+        icon: <Users className="h-4 w-4 text-apex-info" />
+      });
+    });
+    source.addEventListener('sale', (e: MessageEvent) => {
+      const sale = JSON.parse(e.data);
+      setStats(prev => ({ ...prev, totalCars: Math.max(prev.totalCars - 1, 0) }));
+      addActivity({
+        id: `sale-${sale.id}`,
+        type: 'SALE',
+        text: `Vehicle Sold: ${sale.vehicle}`,
+        date: sale.sold_date,
+        icon: <TrendingUp className="h-4 w-4 text-apex-success" />
+      });
+    });
+    source.addEventListener('service', (e: MessageEvent) => {
+      const job = JSON.parse(e.data);
+      addActivity({
+        id: `svc-${job.id}`,
+        type: 'SERVICE',
+        text: `Service Completed: ${job.description}`,
+        date: job.date,
+        icon: <Wrench className="h-4 w-4 text-apex-warning" />
+      });
+    });
+    source.addEventListener('kpi', (e: MessageEvent) => {
+      const kpi = JSON.parse(e.data);
+      setStats(prev => ({ ...prev, inventoryValue: kpi.inventory_value }));
+    });
+    // Bulk imports, or we missed events while disconnected: reload everything
+    source.addEventListener('leads', reloadAll);
+    source.addEventListener('resync', reloadAll);
+
+    return () => source.close();
+  }, []);
+
   const fetchDashboardData = async () => {
     try {
       const token = localStorage.getItem('token');
@@ -33,65 +120,24 @@ export const Dashboard = () => {
       // Define the base URL from environment variables
       const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
-      const [carsRes, leadsRes, serviceRes, apptRes, analyticsRes, statsRes] = await Promise.all([
+      const [carsRes, leadsRes, serviceRes] = await Promise.all([
         axios.get(`${API_BASE_URL}/api/inventory/vehicles/`, config),
         axios.get(`${API_BASE_URL}/api/sales/leads/`, config),
-        axios.get(`${API_BASE_URL}/api/service/records/`, config),
-        axios.get(`${API_BASE_URL}/api/service/appointments/`, config),
-        axios.get(`${API_BASE_URL}/api/analytics/`, config),
-        axios.get(`${API_BASE_URL}/api/dashboard/stats/`, config)
+        axios.get(`${API_BASE_URL}/api/service/records/`, config)
       ]);
 
       const cars = carsRes.data;
       const leads = leadsRes.data;
       const services = serviceRes.data;
-      const backendStats = statsRes.data.stats;
 
       const stockCount = cars.filter((c: any) => c.status === 'AVAILABLE' || c.status === 'RESERVED').length;
 
-      setStats({
+      setStats(prev => ({
+        ...prev,
         totalCars: stockCount,
         activeLeads: leads.filter((l: any) => l.status !== 'SOLD' && l.status !== 'LOST').length,
-        serviceJobs: services.length,
-        inventoryValue: backendStats.inventory_value
-      });
-
-      setAnalytics({
-        revenue: analyticsRes.data.revenue_chart,
-        sources: analyticsRes.data.lead_sources
-      });
-
-      // Activity Logic
-      const recentLeads = leads.map((l: any) => ({
-        id: `lead-${l.id}`,
-        type: 'LEAD',
-        text: `New Lead: ${l.first_name} ${l.last_name} interested in ${l.vehicle_details?.model || 'Vehicle'}`,
-        date: l.created_at,
-        icon: <Users className="h-4 w-4 text-apex-info" />
+        serviceJobs: services.length
       }));
-
-      const recentServices = services.map((s: any) => ({
-        id: `svc-${s.id}`,
-        type: 'SERVICE',
-        text: `Service Job: ${s.description}`,
-        date: s.date,
-        icon: <Wrench className="h-4 w-4 text-apex-warning" />
-      }));
-
-      const recentAppts = apptRes.data.map((a: any) => ({
-        id: `appt-${a.id}`,
-        type: 'APPOINTMENT',
-        text: `Scheduled: ${a.title} (Cust #${a.customer})`,
-        date: a.start_time,
-        icon: <CalendarIcon className="h-4 w-4 text-apex-success" />
-      }));
-
-      const combined = [...recentLeads, ...recentServices, ...recentAppts]
-        .sort((a, b) => new Date(b.date).getTime() - new Date(a.date).getTime())
-        .slice(0, 5);
-
-      setRecentActivity(combined);
-
     } catch (error) {
       console.error("Dashboard load failed", error);
     }
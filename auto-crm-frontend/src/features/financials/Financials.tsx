@@ -6,12 +6,16 @@ import { DollarSign, TrendingUp, Briefcase, AlertTriangle} from 'lucide-react';
 import { useAuth } from '@/context/AuthContext';
 
 export const Financials = () => {
-    const { isManager } = useAuth();
+    const { isManager, bootstrap } = useAuth();
     const [data, setData] = useState<any>(null);
     const [loading, setLoading] = useState(true);
 
     useEffect(() => {
-        if (isManager) {
+        // Already loaded with the login bootstrap
+        if (isManager && bootstrap?.financials) {
+            setData(bootstrap.financials);
+            setLoading(false);
+        } else if (isManager) {
             const token = localStorage.getItem('token');
 
             // Define the base URL from environment variables
@@ -24,7 +28,7 @@ export const Financials = () => {
                 .catch(err => console.error(err))
                 .finally(() => setLoading(false));
         }
-    }, [isManager]);
+    }, [isManager, bootstrap]);
 
     if (!isManager) {
         return (
@@ -1,5 +1,6 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import axios from 'axios';
+import { emptyList, syncList } from '@/lib/sync';
 import { Card, CardContent } from '@/components/ui/card';
 import { Input } from '@/components/ui/input';
 import { Badge } from '@/components/ui/badge';
@@ -41,14 +42,14 @@ export const InventoryList = () => {
   const [searchTerm, setSearchTerm] = useState('');
   const [statusFilter, setStatusFilter] = useState<string>('ALL');
 
+  // Full list once, then only what changed (?since=)
+  const synced = useRef(emptyList<Vehicle>());
+
   const fetchInventory = async () => {
     setLoading(true);
     try {
-      // Define the base URL
-      const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
-
-      const res = await axios.get(`${API_BASE_URL}/api/inventory/vehicles/`);
-      setVehicles(res.data);
+      synced.current = await syncList('api/inventory/vehicles/', synced.current);
+      setVehicles(synced.current.rows);
     } catch (error) {
       console.error("Failed to load inventory", error);
     } finally {
@@ -1,4 +1,4 @@
-import { useState, useEffect } from "react";
+import { useState, useEffect, useRef } from "react";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
 import { Badge } from "@/components/ui/badge";
@@ -7,6 +7,7 @@ import { Button } from "@/components/ui/button";
 import { Users, Phone, CarFront, Search, Trash2, ChevronDown} from "lucide-react";
 import { useAuth } from '@/context/AuthContext';
 import api from "@/lib/api";
+import { emptyList, syncList } from "@/lib/sync";
 
 interface Lead {
   id: number;
@@ -39,10 +40,13 @@ export const LeadsList = () => {
     fetchLeads();
   }, []);
 
+  // Full list once, then only what changed (?since=)
+  const synced = useRef(emptyList<Lead>());
+
   const fetchLeads = async () => {
     try {
-      const res = await api.get("api/sales/leads/");
-      setLeads(res.data);
+      synced.current = await syncList("api/sales/leads/", synced.current);
+      setLeads(synced.current.rows);
     } catch (error) {
       console.error("Error fetching leads", error);
     } finally {
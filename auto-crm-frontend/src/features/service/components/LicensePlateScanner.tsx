@@ -8,6 +8,7 @@ import { useReactToPrint } from 'react-to-print';
 import { PrintableJobCard } from './PrintableJobCard';
 import { PrintableInvoice } from './PrintableInvoice';
 import api from '@/lib/api';
+import { emptyList, syncList } from '@/lib/sync';
 
 
 // --- TYPES ---
@@ -62,12 +63,15 @@ export const LicensePlateScanner = () => {
   }, []);
 
   // --- 1. FETCH ACTIVE JOBS ---
+  // Full job list once, then only what changed (?since=)
+  const syncedJobs = useRef(emptyList<ServiceRecord>());
+
   const fetchActiveJobs = async () => {
     try {
-      const res = await api.get("api/service/records/");
+      syncedJobs.current = await syncList("api/service/records/", syncedJobs.current);
       const todayStr = new Date().toDateString();
 
-      const todaysJobs = res.data.filter((job: any) => {
+      const todaysJobs = syncedJobs.current.rows.filter((job: any) => {
         const jobDate = new Date(job.date).toDateString();
         return jobDate === todayStr; 
       });
@@ -131,14 +135,12 @@ export const LicensePlateScanner = () => {
     if (!manualPlate) return;
     setLoading(true);
     try {
-      const res = await api.get('api/service/vehicles/');
+      const res = await api.get('api/service/vehicles/', {
+        params: { license_plate: manualPlate, expand: 'history' }
+      });
       const vehicles: VehicleData[] = res.data;
 
-      const found = vehicles.find(v =>
-        v.license_plate.toUpperCase() === manualPlate.toUpperCase()
-      );
-
-      processScanResult(manualPlate.toUpperCase(), found || null);
+      processScanResult(manualPlate.toUpperCase(), vehicles[0] || null);
     } catch (error) {
       alert("Search failed.");
     } finally {
@@ -159,27 +161,27 @@ export const LicensePlateScanner = () => {
     }
   };
 
-  // --- 6. REGISTER NEW CUSTOMER ---
+  // --- 6. WALK-IN CHECK-IN (Customer + Vehicle + Job in one request) ---
   const handleRegister = async () => {
+    if (!newJob) return alert("Please describe the service needed.");
     try {
-      const custRes = await api.post('api/service/customers/', {
+      const res = await api.post('api/service/check-in/', {
         name: newCustomer.name,
-        phone: newCustomer.phone
-      });
-
-      const vehRes = await api.post('api/service/vehicles/', {
+        phone: newCustomer.phone,
         license_plate: detectedPlate,
         make: newCustomer.make,
         model: newCustomer.model,
         year: newCustomer.year || 2020,
-        owner: custRes.data.id
+        description: newJob
       });
 
-      alert("Customer Registered! ✅");
-      setExistingVehicle(vehRes.data);
+      alert("Customer Checked In! ✅");
+      setExistingVehicle(res.data.vehicle);
       setIsNewCustomer(false);
+      setNewJob("");
+      fetchActiveJobs();
     } catch (error) {
-      alert("Error registering customer.");
+      alert("Error checking in customer.");
     }
   };
 
@@ -395,8 +397,9 @@ export const LicensePlateScanner = () => {
                   <div className="space-y-2"><Label className="text-apex-muted">Make</Label><Input className={inputClass} value={newCustomer.make} onChange={(e) => setNewCustomer({ ...newCustomer, make: e.target.value })} /></div>
                   <div className="space-y-2"><Label className="text-apex-muted">Model</Label><Input className={inputClass} value={newCustomer.model} onChange={(e) => setNewCustomer({ ...newCustomer, model: e.target.value })} /></div>
                 </div>
+                <div className="space-y-2"><Label className="text-apex-muted">Service Needed</Label><Input className={inputClass} placeholder="e.g. Oil Change & Tire Rotation" value={newJob} onChange={(e) => setNewJob(e.target.value)} /></div>
                 <Button className="w-full bg-apex-info hover:bg-blue-600 text-white font-bold" onClick={handleRegister}>
-                  <Save className="w-4 h-4 mr-2" /> Complete Registration
+                  <Save className="w-4 h-4 mr-2" /> Check In & Create Job
                 </Button>
               </CardContent>
             </Card>
@@ -7,7 +7,11 @@ export const PrintableInvoice = forwardRef((props: { job: any }, ref: any) => {
 
     const parts = Number(job.parts_cost) || 0;
     const labor = Number(job.labor_cost) || 0;
-    const total = parts + labor;
+    const discount = Number(job.discount) || 0;
+    const tax = Number(job.tax) || 0;
+    const subtotal = parts + labor - discount;
+    // total_cost is computed by the backend; fall back for older payloads
+    const total = job.total_cost != null ? Number(job.total_cost) : subtotal + tax;
 
     return (
         <div ref={ref} className="p-10 max-w-[800px] mx-auto bg-white text-slate-800 hidden print:block font-sans">
@@ -76,6 +80,12 @@ export const PrintableInvoice = forwardRef((props: { job: any }, ref: any) => {
                             <td className="py-4 font-medium text-slate-700">Labor Charges</td>
                             <td className="py-4 text-right font-mono text-slate-800">${labor.toFixed(2)}</td>
                         </tr>
+                        {discount > 0 && (
+                            <tr>
+                                <td className="py-4 font-medium text-slate-700">Discount</td>
+                                <td className="py-4 text-right font-mono text-slate-800">-${discount.toFixed(2)}</td>
+                            </tr>
+                        )}
                     </tbody>
                 </table>
             </div>
@@ -85,11 +95,11 @@ export const PrintableInvoice = forwardRef((props: { job: any }, ref: any) => {
                 <div className="w-1/2 bg-blue-50 p-6 rounded-lg">
                     <div className="flex justify-between mb-2">
                         <span className="text-slate-500">Subtotal</span>
-                        <span className="font-mono font-bold">${total.toFixed(2)}</span>
+                        <span className="font-mono font-bold">${subtotal.toFixed(2)}</span>
                     </div>
                     <div className="flex justify-between mb-4 border-b border-blue-200 pb-2">
-                        <span className="text-slate-500">Tax (0%)</span>
-                        <span className="font-mono font-bold">$0.00</span>
+                        <span className="text-slate-500">Tax</span>
+                        <span className="font-mono font-bold">${tax.toFixed(2)}</span>
                     </div>
                     <div className="flex justify-between text-xl font-extrabold text-blue-800">
                         <span>Total Due</span>
@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { format, addDays, subDays, addMonths, subMonths, startOfWeek, endOfWeek, startOfMonth, endOfMonth, isWithinInterval, isSameDay } from 'date-fns';
 import { Card, CardContent, CardHeader, CardTitle } from '@/components/ui/card';
 import { Button } from '@/components/ui/button';
@@ -6,6 +6,7 @@ import { Input } from '@/components/ui/input';
 import { Label } from '@/components/ui/label';
 import { Calendar as CalendarIcon, Clock, User, Save, Trash2, ChevronLeft, ChevronRight, ChevronDown, Loader2, CalendarDays } from 'lucide-react';
 import api from '@/lib/api';
+import { emptyList, syncList } from '@/lib/sync';
 
 // --- TYPES ---
 interface Appointment {
@@ -35,13 +36,31 @@ export const ServiceCalendar = () => {
 
   useEffect(() => {
     fetchAppointments();
-  }, []);
+  }, [view, currentDate]);
+
+  // Only ask the server for the range on screen
+  const getVisibleRange = () => {
+    if (view === 'day') return { start: currentDate, end: currentDate };
+    if (view === 'week') return { start: startOfWeek(currentDate), end: endOfWeek(currentDate) };
+    return { start: startOfMonth(currentDate), end: endOfMonth(currentDate) };
+  };
+
+  // Full range once, then only what changed (?since=) until the range moves
+  const synced = useRef({ span: '', list: emptyList<Appointment>() });
 
   const fetchAppointments = async () => {
     try {
       setLoading(true);
-      const res = await api.get('api/service/appointments/');
-      setAppointments(res.data);
+      const range = getVisibleRange();
+      const params = {
+        start: format(range.start, 'yyyy-MM-dd'),
+        end: format(range.end, 'yyyy-MM-dd')
+      };
+      const span = `${params.start}/${params.end}`;
+      const list = synced.current.span === span ? synced.current.list : emptyList<Appointment>();
+
+      synced.current = { span, list: await syncList('api/service/appointments/', list, params) };
+      setAppointments(synced.current.list.rows);
     } catch (error) {
       console.error("Error fetching appointments", error);
     } finally {
@@ -73,8 +92,9 @@ export const ServiceCalendar = () => {
       fetchAppointments();
       alert("Appointment Booked!");
 
-    } catch (error) {
-      alert("Failed to book appointment.");
+    } catch (error: any) {
+      const detail = error?.response?.data?.start_time?.[0] || error?.response?.data?.end_time?.[0];
+      alert(detail || "Failed to book appointment.");
     }
   };
 
@@ -0,0 +1,42 @@
+import api from './api';
+
+// Delta sync for list endpoints (backend: sync/delta.py).
+// The first load is the full list plus its X-Sync-Cursor header. After that
+// only the rows changed and the ids deleted since the cursor are fetched and
+// merged into the list we already hold, so a refresh costs what changed.
+export interface SyncedList<T> {
+  rows: T[];
+  cursor: string | null;
+}
+
+export const emptyList = <T,>(): SyncedList<T> => ({ rows: [], cursor: null });
+
+export const syncList = async <T extends { id: number }>(
+  url: string,
+  list: SyncedList<T>,
+  params: Record<string, string> = {}
+): Promise<SyncedList<T>> => {
+  if (list.cursor) {
+    try {
+      const res = await api.get(url, { params: { ...params, since: list.cursor } });
+      const changed = new Map<number, T>(res.data.changed.map((row: T) => [row.id, row]));
+      const deleted = new Set<number>(res.data.deleted);
+
+      const rows = list.rows
+        .filter(row => !deleted.has(row.id))
+        .map(row => {
+          const updated = changed.get(row.id);
+          changed.delete(row.id);
+          return updated ?? row;
+        });
+      // Rows we didn't have yet go first (lists are newest first)
+      return { rows: [...changed.values(), ...rows], cursor: res.data.cursor };
+    } catch (error: any) {
+      // 410 Gone: the cursor is too old - fall back to a full load
+      if (error?.response?.status !== 410) throw error;
+    }
+  }
+
+  const res = await api.get(url, { params });
+  return { rows: res.data, cursor: res.headers['x-sync-cursor'] ?? null };
+};
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ActivityEvent
+
+@admin.register(ActivityEvent)
+class ActivityEventAdmin(admin.ModelAdmin):
+    list_display = ('at', 'category', 'action', 'message', 'actor_name')
+    list_filter = ('category', 'action')
+    search_fields = ('message',)
+    readonly_fields = [field.name for field in ActivityEvent._meta.fields]
+    show_full_result_count = False  # no COUNT(*) over the whole log per page
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class ActivityConfig(AppConfig):
+    name = 'activity'
+
+    def ready(self):
+        # Records Lead / Vehicle / ServiceRecord / ServiceAppointment changes
+        from . import signals  # noqa: F401
@@ -0,0 +1,62 @@
+# activity/backfill.py
+"""
+Seeds an empty activity log from the rows that already exist
+(`python manage.py backfill_activity --if-empty`): a "created" event per
+lead, stocked car and service job, a "sold" event per sold car and a
+"completed" one per finished job - the history that can be read back off
+the tables. Status steps and edits before the log existed are lost.
+
+Only the last ACTIVITY_RETENTION_DAYS are seeded, and the sources are merged
+by time before inserting, so event ids run in time order like live ones -
+the feed pages by id.
+"""
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import ServiceRecord
+from .log import event, record_many
+from .signals import lead_created, record_completed, record_created, vehicle_created, vehicle_sold
+
+
+def _stream(queryset, date_field, describe, chunk_size):
+    """(time, event) pairs for `queryset`, oldest first."""
+    rows = queryset.order_by(date_field, 'pk').iterator(chunk_size=chunk_size)
+    for row in rows:
+        at = getattr(row, date_field)
+        yield at, event(row, *describe(row), at=at)
+
+
+def _service(record):
+    return record_completed(record) if record.status == 'COMPLETED' else record_created(record)
+
+
+def backfill(chunk_size=5000):
+    """Inserts the seeded events in chunks; yields the running total."""
+    since = timezone.now() - timedelta(days=settings.ACTIVITY_RETENTION_DAYS)
+    streams = [
+        _stream(Lead.objects.filter(created_at__gte=since).select_related('vehicle'),
+                'created_at', lead_created, chunk_size),
+        _stream(Vehicle.objects.filter(created_at__gte=since), 'created_at', vehicle_created, chunk_size),
+        _stream(Vehicle.objects.filter(status='SOLD', sold_date__gte=since), 'sold_date', vehicle_sold, chunk_size),
+        _stream(ServiceRecord.objects.filter(date__gte=since).select_related('vehicle'),
+                'date', _service, chunk_size),
+    ]
+
+    written = 0
+    batch = []
+    for _, seeded in heapq.merge(*streams, key=lambda pair: pair[0]):
+        batch.append(seeded)
+        if len(batch) == chunk_size:
+            record_many(batch)
+            written += len(batch)
+            batch = []
+            yield written
+    if batch:
+        record_many(batch)
+        written += len(batch)
+        yield written
@@ -0,0 +1,170 @@
+# activity/log.py
+"""
+The activity log: writing, reading and pruning ActivityEvent rows.
+
+Writing: record() is called by the receivers in activity/signals.py inside
+the transaction of the change, so an event exists exactly when its change
+committed. The actor is the user of the request being handled
+(ActorMiddleware below); background jobs record no actor.
+
+Reading: feed() pages newest first on the primary key - "the events before
+id N" - which is one index range scan however far back the page is, also
+when filtered by category or subject (indexes on (category, id) and
+(subject_type, subject_id, id)).
+
+Pruning (`python manage.py prune_activity`), so the table stays at a few
+months of rows however busy the dealership is:
+
+- compaction: the routine actions (edits, intermediate status changes,
+  reschedules) are deleted once older than ACTIVITY_COMPACT_AFTER_DAYS -
+  creations, sales, completions and deletions stay;
+- retention: everything older than ACTIVITY_RETENTION_DAYS is deleted.
+
+Both delete in primary-key ranges of ACTIVITY_PRUNE_BATCH ids, one short
+transaction each, found from the `at` index once per run.
+"""
+from contextvars import ContextVar
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ActivityEvent
+
+# Deleted by compaction
+ROUTINE_ACTIONS = ['updated', 'status', 'rescheduled']
+
+FEED_FIELDS = ['id', 'at', 'category', 'action', 'subject_type', 'subject_id', 'actor_name', 'message', 'data']
+
+_request = ContextVar('activity_request', default=None)
+
+
+# --- 1. ACTOR ---
+
+class ActorMiddleware:
+    """Makes the request's user the actor of events recorded while handling it."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request.set(request)
+        try:
+            return self.get_response(request)
+        finally:
+            _request.reset(token)
+
+
+def current_actor():
+    """(user id, name) of whoever is making the current request, or (None, '')."""
+    # DRF copies the user it authenticated onto the Django request
+    user = getattr(_request.get(), 'user', None)
+    if user is None or not user.is_authenticated:
+        return None, ''
+    return user.pk, user.get_full_name() or user.get_username()
+
+
+# --- 2. WRITING ---
+
+def event(subject, category, action, message, data=None, at=None, actor=(None, '')):
+    """An unsaved ActivityEvent about model instance `subject`."""
+    return ActivityEvent(
+        at=at or timezone.now(),
+        category=category,
+        action=action,
+        subject_type=subject._meta.model_name,
+        subject_id=subject.pk,
+        actor_id=actor[0],
+        actor_name=actor[1][:150],
+        message=message[:255],
+        data=data or {},
+    )
+
+
+def record(subject, category, action, message, data=None):
+    event(subject, category, action, message, data, actor=current_actor()).save()
+
+
+def record_many(events, batch_size=1000):
+    ActivityEvent.objects.bulk_create(events, batch_size=batch_size)
+
+
+# --- 3. READING ---
+
+def feed(cursor=None, limit=50, category=None, subject=None):
+    """
+    Newest events first: (events, next_cursor). `cursor` is the next_cursor of
+    the previous page, `subject` a (model name, pk) pair.
+    """
+    queryset = ActivityEvent.objects.order_by('-id')
+    if category:
+        queryset = queryset.filter(category=category)
+    if subject:
+        queryset = queryset.filter(subject_type=subject[0], subject_id=subject[1])
+    if cursor:
+        queryset = queryset.filter(id__lt=cursor)
+
+    rows = list(queryset.values(*FEED_FIELDS)[:limit + 1])
+    events = [
+        {
+            'id': row['id'],
+            'type': row['category'],
+            'action': row['action'],
+            'message': row['message'],
+            'time': row['at'],
+            'actor': row['actor_name'] or None,
+            'subject': {'type': row['subject_type'], 'id': row['subject_id']},
+            'data': row['data'],
+        }
+        for row in rows[:limit]
+    ]
+    next_cursor = events[-1]['id'] if len(rows) > limit else None
+    return events, next_cursor
+
+
+# --- 4. PRUNING ---
+
+def _last_id_before(moment):
+    return (
+        ActivityEvent.objects.filter(at__lt=moment)
+        .order_by('-at').values_list('id', flat=True).first()
+    )
+
+
+def _delete_ids(queryset, low, high, batch_size):
+    deleted = 0
+    while low <= high:
+        upper = min(low + batch_size - 1, high)
+        deleted += queryset.filter(id__gte=low, id__lte=upper).delete()[0]
+        low = upper + 1
+    return deleted
+
+
+def prune(compacted_through=None, now=None, batch_size=None):
+    """
+    Compacts and expires old events. Returns (stats, compacted_through); pass
+    compacted_through to the next call so compaction resumes where it ended
+    instead of re-reading the months it already did.
+    """
+    now = now or timezone.now()
+    batch_size = batch_size or settings.ACTIVITY_PRUNE_BATCH
+    stats = {'compacted': 0, 'deleted': 0}
+
+    first = ActivityEvent.objects.order_by('id').values_list('id', flat=True).first()
+    if first is None:
+        return stats, compacted_through
+
+    expired = _last_id_before(now - timedelta(days=settings.ACTIVITY_RETENTION_DAYS))
+    if expired is not None:
+        stats['deleted'] = _delete_ids(ActivityEvent.objects.all(), first, expired, batch_size)
+        first = expired + 1
+
+    routine = _last_id_before(now - timedelta(days=settings.ACTIVITY_COMPACT_AFTER_DAYS))
+    if routine is not None:
+        start = max(first, (compacted_through or 0) + 1)
+        stats['compacted'] = _delete_ids(
+            ActivityEvent.objects.filter(action__in=ROUTINE_ACTIONS), start, routine, batch_size,
+        )
+        compacted_through = max(routine, compacted_through or 0)
+
+    return stats, compacted_through
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from activity.backfill import backfill
+from activity.models import ActivityEvent
+
+
+class Command(BaseCommand):
+    help = "Seeds the activity log from existing leads, cars and service jobs (last ACTIVITY_RETENTION_DAYS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Events per insert")
+        parser.add_argument('--if-empty', action='store_true', help="Only run when the log is empty (deploy hook)")
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and ActivityEvent.objects.exists():
+            self.stdout.write("Activity log already has events - skipping.")
+            return
+
+        started = time.perf_counter()
+        written = 0
+        for written in backfill(chunk_size=options['chunk_size']):
+            self.stdout.write(f"  {written} events ({time.perf_counter() - started:.1f}s)")
+
+        self.stdout.write(f"Seeded {written} activity events in {time.perf_counter() - started:.1f}s")
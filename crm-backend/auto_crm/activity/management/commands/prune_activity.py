@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from activity.log import prune
+
+
+class Command(BaseCommand):
+    help = "Compacts and expires old activity events (ACTIVITY_COMPACT_AFTER_DAYS / ACTIVITY_RETENTION_DAYS)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Run again every --interval seconds (worker mode)")
+        parser.add_argument('--interval', type=float, default=3600.0, help="Seconds between runs in --loop mode")
+        parser.add_argument('--batch-size', type=int, default=None, help="Ids per DELETE (default: ACTIVITY_PRUNE_BATCH)")
+
+    def handle(self, *args, **options):
+        compacted_through = None
+        while True:
+            started = time.perf_counter()
+            stats, compacted_through = prune(compacted_through, batch_size=options['batch_size'])
+            self.stdout.write(
+                f"Compacted {stats['compacted']} and expired {stats['deleted']} activity events "
+                f"in {time.perf_counter() - started:.1f}s"
+            )
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
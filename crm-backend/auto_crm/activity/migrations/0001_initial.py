@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-19 11:52
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ActivityEvent',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('category', models.CharField(choices=[('LEAD', 'Lead'), ('SALE', 'Sale'), ('INVENTORY', 'Inventory'), ('SERVICE', 'Service Job'), ('APPOINTMENT', 'Appointment')], max_length=12)),
+                ('action', models.CharField(max_length=12)),
+                ('subject_type', models.CharField(max_length=30)),
+                ('subject_id', models.BigIntegerField()),
+                ('actor_id', models.IntegerField(blank=True, null=True)),
+                ('actor_name', models.CharField(blank=True, max_length=150)),
+                ('message', models.CharField(max_length=255)),
+                ('data', models.JSONField(blank=True, default=dict)),
+            ],
+            options={
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['at'], name='activity_at_idx'), models.Index(fields=['category', 'id'], name='activity_category_idx'), models.Index(fields=['subject_type', 'subject_id', 'id'], name='activity_subject_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,50 @@
+from django.db import models
+from django.utils import timezone
+
+
+class ActivityEvent(models.Model):
+    """
+    One thing that happened - a lead came in or changed status, a car was
+    stocked, re-priced or sold, a job was opened or finished, an appointment
+    was booked or moved. Append-only: rows are written by activity/log.py in
+    the same transaction as the change and never updated; old ones are
+    compacted and then deleted by `python manage.py prune_activity`.
+    """
+    CATEGORY_CHOICES = [
+        ('LEAD', 'Lead'),
+        ('SALE', 'Sale'),
+        ('INVENTORY', 'Inventory'),
+        ('SERVICE', 'Service Job'),
+        ('APPOINTMENT', 'Appointment'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    at = models.DateTimeField(default=timezone.now)
+    category = models.CharField(max_length=12, choices=CATEGORY_CHOICES)
+    # created, status, sold, completed, updated, rescheduled, deleted
+    action = models.CharField(max_length=12)
+
+    # What it happened to: model name + pk (no foreign key - deleted rows keep their history)
+    subject_type = models.CharField(max_length=30)
+    subject_id = models.BigIntegerField()
+
+    # Who did it (None for background jobs). The name is copied so the feed needs no join
+    actor_id = models.IntegerField(null=True, blank=True)
+    actor_name = models.CharField(max_length=150, blank=True)
+
+    message = models.CharField(max_length=255)
+    # e.g. {"from": "NEW", "to": "CONTACTED"}
+    data = models.JSONField(default=dict, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        indexes = [
+            # Retention: where "older than N days" ends
+            models.Index(fields=['at'], name='activity_at_idx'),
+            # Feed filtered by ?type= / ?subject=, newest first
+            models.Index(fields=['category', 'id'], name='activity_category_idx'),
+            models.Index(fields=['subject_type', 'subject_id', 'id'], name='activity_subject_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.at:%Y-%m-%d %H:%M} {self.message}"
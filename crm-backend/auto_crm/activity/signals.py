@@ -0,0 +1,140 @@
+# activity/signals.py
+"""
+Turns Lead / Vehicle / ServiceRecord / ServiceAppointment writes into
+activity events (activity/log.py).
+
+pre_save notes the fields we report on (one primary-key lookup), post_save
+compares and records creations and the changes that matter; post_delete
+records deletions. A save that changes none of them records nothing - e.g.
+Lead.save() re-saving an already sold car.
+
+bulk_create / queryset.update() skip these signals - callers that use them
+record their events with log.record_many() (see sales/ingest.py).
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import ServiceAppointment, ServiceRecord
+from .log import record
+
+# Model -> fields whose changes are recorded
+TRACKED = {
+    Lead: ['status'],
+    Vehicle: ['status', 'selling_price'],
+    ServiceRecord: ['status'],
+    ServiceAppointment: ['status', 'start_time'],
+}
+
+
+def _name(lead):
+    return f"{lead.first_name} {lead.last_name}".strip()
+
+
+def _car(vehicle):
+    return f"{vehicle.year or ''} {vehicle.make} {vehicle.model}".strip()
+
+
+# --- 1. MESSAGES (also used by `manage.py backfill_activity`) ---
+
+def lead_created(lead):
+    return 'LEAD', 'created', f"New Lead: {lead.first_name} interested in {lead.vehicle or 'Inventory'}"
+
+
+def vehicle_created(vehicle):
+    return 'INVENTORY', 'created', f"Stocked: {vehicle}"
+
+
+def vehicle_sold(vehicle):
+    return 'SALE', 'sold', f"Vehicle Sold: {_car(vehicle)}"
+
+
+def record_created(record):
+    return 'SERVICE', 'created', f"Service Job: {record.description} ({record.vehicle.license_plate})"
+
+
+def record_completed(record):
+    return 'SERVICE', 'completed', f"Service Completed: {record.description}"
+
+
+def appointment_created(appointment):
+    return 'APPOINTMENT', 'created', f"Scheduled: {appointment.title}"
+
+
+def _changes(sender, instance, before):
+    """(category, action, message, data) for each reportable change since `before`."""
+    status = before['status'], instance.status
+    moved = {'from': status[0], 'to': status[1]}
+
+    if sender is Lead and status[0] != status[1]:
+        yield 'LEAD', 'status', f"Lead {_name(instance)}: {status[0]} → {status[1]}", moved
+
+    elif sender is Vehicle:
+        if status[0] != status[1]:
+            if status[1] == 'SOLD':
+                yield *vehicle_sold(instance), {'price': str(instance.selling_price)}
+            else:
+                yield 'INVENTORY', 'status', f"{instance}: {status[0]} → {status[1]}", moved
+        if before['selling_price'] != instance.selling_price:
+            price = {'from': str(before['selling_price']), 'to': str(instance.selling_price)}
+            yield 'INVENTORY', 'updated', f"Price change: {instance} {price['from']} → {price['to']}", price
+
+    elif sender is ServiceRecord and status[0] != status[1]:
+        if status[1] == 'COMPLETED':
+            yield *record_completed(instance), moved
+        else:
+            yield 'SERVICE', 'status', f"Service Job {instance.description}: {status[0]} → {status[1]}", moved
+
+    elif sender is ServiceAppointment:
+        if status[0] != status[1]:
+            yield 'APPOINTMENT', 'status', f"Appointment {instance.title}: {status[0]} → {status[1]}", moved
+        if before['start_time'] != instance.start_time:
+            when = {'from': before['start_time'].isoformat(), 'to': instance.start_time.isoformat()}
+            yield 'APPOINTMENT', 'rescheduled', f"Rescheduled: {instance.title}", when
+
+
+CREATED = {
+    Lead: lead_created,
+    Vehicle: vehicle_created,
+    ServiceRecord: record_created,
+    ServiceAppointment: appointment_created,
+}
+
+DELETED = {
+    Lead: lambda lead: ('LEAD', f"Lead removed: {_name(lead)}"),
+    Vehicle: lambda vehicle: ('INVENTORY', f"Removed from stock: {vehicle}"),
+    ServiceRecord: lambda record: ('SERVICE', f"Service Job removed: {record.description}"),
+    ServiceAppointment: lambda appointment: ('APPOINTMENT', f"Appointment removed: {appointment.title}"),
+}
+
+
+# --- 2. RECEIVERS ---
+
+def remember_fields(sender, instance, raw=False, **kwargs):
+    if not raw and instance.pk and not instance._state.adding:
+        instance._activity_before = sender.objects.filter(pk=instance.pk).values(*TRACKED[sender]).first()
+
+
+def record_save(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        events = [(*CREATED[sender](instance), None)]
+        if sender is Vehicle and instance.status == 'SOLD':
+            events.append((*vehicle_sold(instance), {'price': str(instance.selling_price)}))
+    else:
+        before = getattr(instance, '_activity_before', None)
+        events = _changes(sender, instance, before) if before else []
+    for category, action, message, data in events:
+        record(instance, category, action, message, data)
+
+
+def record_delete(sender, instance, **kwargs):
+    category, message = DELETED[sender](instance)
+    record(instance, category, 'deleted', message)
+
+
+for model in TRACKED:
+    pre_save.connect(remember_fields, sender=model, dispatch_uid=f'activity-pre-save-{model.__name__}')
+    post_save.connect(record_save, sender=model, dispatch_uid=f'activity-post-save-{model.__name__}')
+    post_delete.connect(record_delete, sender=model, dispatch_uid=f'activity-post-delete-{model.__name__}')
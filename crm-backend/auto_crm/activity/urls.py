@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import ActivityFeedView
+
+urlpatterns = [
+    path('', ActivityFeedView.as_view()),
+]
@@ -0,0 +1,49 @@
+from urllib.parse import urlencode
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .log import feed
+from .models import ActivityEvent
+
+CATEGORIES = {choice for choice, _ in ActivityEvent.CATEGORY_CHOICES}
+
+
+def _subject(value):
+    """'lead:12' -> ('lead', 12)."""
+    subject_type, _, pk = value.partition(':')
+    if not subject_type or not pk.isdigit():
+        raise ValueError("subject must look like lead:12")
+    return subject_type, int(pk)
+
+
+class ActivityFeedView(APIView):
+    """
+    GET /api/activity/ -> every recorded change, newest first
+    ?type=LEAD|SALE|INVENTORY|SERVICE|APPOINTMENT, ?subject=lead:12, ?limit= (max 200), ?cursor=
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        try:
+            category = params.get('type') or None
+            if category and category not in CATEGORIES:
+                raise ValueError(f"type must be one of {', '.join(sorted(CATEGORIES))}")
+            subject = _subject(params['subject']) if params.get('subject') else None
+            cursor = int(params['cursor']) if params.get('cursor') else None
+            limit = min(max(int(params.get('limit', 50)), 1), 200)
+        except ValueError as error:
+            return Response({"error": str(error)}, status=400)
+
+        events, next_cursor = feed(cursor, limit, category, subject)
+        next_url = None
+        if next_cursor:
+            query = {key: params[key] for key in ('type', 'subject') if params.get(key)}
+            next_url = request.build_absolute_uri('?' + urlencode({**query, 'limit': limit, 'cursor': next_cursor}))
+        return Response({
+            "next": next_url,
+            "next_cursor": next_cursor,
+            "results": events,
+        })
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import DailyRevenue
+
+@admin.register(DailyRevenue)
+class DailyRevenueAdmin(admin.ModelAdmin):
+    # Derived table - rebuilt from vehicles/service records, so read-only here
+    list_display = ('day', 'sales_count', 'sales_revenue', 'sales_profit', 'service_count', 'service_revenue')
+    date_hierarchy = 'day'
+    readonly_fields = [field.name for field in DailyRevenue._meta.fields]
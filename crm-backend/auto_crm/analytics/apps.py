@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class AnalyticsConfig(AppConfig):
+    name = 'analytics'
+
+    def ready(self):
+        # Keeps DailyRevenue in sync with Vehicle / ServiceRecord changes
+        from . import signals  # noqa: F401
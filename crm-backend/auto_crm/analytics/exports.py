@@ -0,0 +1,194 @@
+# analytics/exports.py
+"""
+Full ledger exports for accounting - every vehicle, sale, lead or service
+job in a date range - as CSV or JSON Lines, optionally gzipped.
+
+Rows are read as plain tuples with QuerySet.iterator(chunk_size=...) - a
+server-side cursor on PostgreSQL, fetchmany() batches on SQLite - and each
+batch is encoded (and compressed) before the next one is fetched, so memory
+stays flat however many rows there are. Used by
+GET /api/exports/<ledger>.<csv|jsonl> (auto_crm/export_view.py) and
+`manage.py export_ledger`, both of which read from the read replica when
+there is one (`using`, auto_crm/replica.py).
+
+Lead names and emails come from the public ingest endpoint and the CSV is
+opened in Excel, so text cells Excel would run as a formula are written
+with a leading apostrophe.
+"""
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice
+
+from django.conf import settings
+from django.db.models import F
+from django.utils.dateparse import parse_date
+
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import ServiceRecord
+from .rollup import _window
+
+FORMATS = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+VEHICLE_COLUMNS = [
+    'id', 'stock_number', 'vin', 'year', 'make', 'model', 'trim', 'body_style',
+    'color', 'mileage', 'license_plate', 'status', 'cost_price', 'selling_price',
+    'created_at', 'sold_date',
+]
+
+# name -> how to read it. `date` is the field ?start=&end= filter on;
+# columns are output names, `lookups` the value_list() paths behind them.
+LEDGERS = {
+    'inventory': {
+        'queryset': lambda: Vehicle.objects.all(),
+        'date': 'created_at',
+        'order': ['pk'],
+        'columns': VEHICLE_COLUMNS,
+    },
+    'sales': {
+        'queryset': lambda: Vehicle.objects.filter(status='SOLD').annotate(
+            gross_profit=F('selling_price') - F('cost_price'),
+        ),
+        'date': 'sold_date',
+        'order': ['sold_date', 'pk'],
+        'columns': [
+            'id', 'sold_date', 'stock_number', 'vin', 'year', 'make', 'model',
+            'cost_price', 'selling_price', 'gross_profit',
+        ],
+    },
+    'leads': {
+        'queryset': lambda: Lead.objects.all(),
+        'date': 'created_at',
+        'order': ['pk'],
+        'columns': [
+            'id', 'created_at', 'first_name', 'last_name', 'phone', 'email', 'source',
+            'status', 'vehicle_stock_number', 'quoted_price', 'down_payment',
+            'monthly_payment', 'term_months',
+        ],
+        'lookups': {'vehicle_stock_number': 'vehicle__stock_number'},
+    },
+    'service': {
+        'queryset': lambda: ServiceRecord.objects.all(),
+        'date': 'date',
+        'order': ['pk'],
+        'columns': [
+            'id', 'date', 'status', 'license_plate', 'customer', 'description',
+            'parts_cost', 'labor_cost', 'discount', 'tax', 'total_cost',
+        ],
+        'lookups': {'license_plate': 'vehicle__license_plate', 'customer': 'vehicle__owner__name'},
+    },
+}
+
+
+def export_window(params):
+    """
+    Reads optional ?start=YYYY-MM-DD&end=YYYY-MM-DD (inclusive). Returns
+    (start, end), either None when absent, or raises ValueError.
+    """
+    days = []
+    for name in ('start', 'end'):
+        value = params.get(name)
+        try:
+            day = parse_date(value) if value else None
+        except ValueError:
+            day = None  # well formed but not a real date
+        if value and day is None:
+            raise ValueError("start and end must be dates (YYYY-MM-DD).")
+        days.append(day)
+    if days[0] and days[1] and days[0] > days[1]:
+        raise ValueError("start must not be after end.")
+    return tuple(days)
+
+
+def export_filename(ledger, fmt, start=None, end=None, compress=False):
+    parts = [ledger] + [day.isoformat() for day in (start, end) if day]
+    return '-'.join(parts) + f'.{fmt}' + ('.gz' if compress else '')
+
+
+# --- 1. ROWS ---
+
+def ledger_rows(ledger, start=None, end=None, chunk_size=None, using=None):
+    """Yields the ledger's rows as tuples in LEDGERS[ledger]['columns'] order."""
+    spec = LEDGERS[ledger]
+    lookups = [spec.get('lookups', {}).get(column, column) for column in spec['columns']]
+    rows = (
+        spec['queryset']()
+        .using(using)
+        .filter(_window(spec['date'], start, end))
+        .order_by(*spec['order'])
+        .values_list(*lookups)
+    )
+    return rows.iterator(chunk_size=chunk_size or settings.EXPORT_CHUNK_SIZE)
+
+
+def _text(value):
+    # Exact amounts and ISO timestamps - what the API's serializers return
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+# --- 2. ENCODING ---
+
+# A text cell starting with one of these is a formula to Excel (=HYPERLINK(...))
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    # Only text: amounts (a negative gross profit) stay numbers
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return _text(value)
+
+
+def _csv_batches(columns, batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for batch in batches:
+        writer.writerows([[_csv_cell(value) for value in row] for row in batch])
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()  # header only - no rows
+
+
+def _jsonl_batches(columns, batches):
+    for batch in batches:
+        yield ''.join(
+            json.dumps(dict(zip(columns, [_text(value) for value in row]))) + '\n'
+            for row in batch
+        ).encode()
+
+
+def export_chunks(ledger, fmt, start=None, end=None, compress=False, chunk_size=None, using=None):
+    """
+    The export as a stream of bytes chunks (one per batch of rows), gzipped
+    when `compress`. Nothing is read from the database until the first chunk
+    is requested. `using` is the database alias to read from (default: routed).
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    rows = ledger_rows(ledger, start, end, chunk_size, using)
+    batches = iter(lambda: list(islice(rows, chunk_size)), [])
+    encode = _csv_batches if fmt == 'csv' else _jsonl_batches
+    chunks = encode(LEDGERS[ledger]['columns'], batches)
+
+    if not compress:
+        yield from chunks
+        return
+    gzip = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: gzip container
+    for chunk in chunks:
+        compressed = gzip.compress(chunk)
+        if compressed:
+            yield compressed
+    yield gzip.flush()
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client, RequestFactory
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from auto_crm import roles
+from auto_crm.authentication import CachedTokenAuthentication, token_cache
+from auto_crm.benchmarks import rolled_back, timed
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks per-request authentication: DRF's TokenAuthentication against "
+        "CachedTokenAuthentication, and GET /api/me/ with cold and warm caches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3000)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with rolled_back():
+            user = get_user_model().objects.create_user('bench-auth', password=None)
+            user.groups.add(Group.objects.get_or_create(name='Manager')[0])
+            key = Token.objects.create(user=user).key
+            request = RequestFactory().get('/api/me/', HTTP_AUTHORIZATION=f'Token {key}')
+
+            for label, backend in (('TokenAuthentication', TokenAuthentication()),
+                                   ('CachedTokenAuthentication', CachedTokenAuthentication())):
+                ms, queries = self.measure(lambda: backend.authenticate(request), repeat)
+                self.stdout.write(f"authenticate(), {label:<26} {ms * 1000:8.1f} us  {queries} queries")
+
+            client = Client(HTTP_AUTHORIZATION=f'Token {key}')
+
+            def cold():
+                # What every request cost before: token + user, then the role
+                token_cache.clear()
+                roles.forget([user.pk])
+                return client.get('/api/me/')
+
+            for label, call in (('cold (token + role loaded)', cold), ('warm (cached)', lambda: client.get('/api/me/'))):
+                ms, queries = self.measure(call, repeat)
+                self.stdout.write(f"GET /api/me/, {label:<28} {ms * 1000:8.1f} us  {queries} queries")
+
+    def measure(self, call, repeat):
+        """(median ms, queries made by one call after a warm-up call)."""
+        call()
+        queries = []
+
+        def count(execute, sql, *args):
+            # Not CaptureQueriesContext: the test client's request_started resets its log
+            queries.append(sql)
+            return execute(sql, *args)
+
+        with connection.execute_wrapper(count):
+            call()
+        return timed(call, repeat)[0], len(queries)
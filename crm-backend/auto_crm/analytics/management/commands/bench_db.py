@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connections, transaction
+from django.test import override_settings
+
+from auto_crm.db_profiles import PROFILES, configure
+from inventory.models import Vehicle
+from sales.models import Lead
+
+
+def _worker(kind, index, config, deadline, results):
+    """One process: writes (or reads) against the scratch copy until the deadline."""
+    connection = connections['default']
+    connection.settings_dict = config
+
+    # Lead saves publish live events: keep them in this process, off the real broker file
+    with override_settings(LIVE_BROKER_FILE=''):
+        vehicle_ids = list(Vehicle.objects.values_list('pk', flat=True)[:500])
+        done = errors = n = 0
+        latencies = []
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                if kind == 'writer':
+                    # A lead comes in for a car, which is updated too - with the app's signals
+                    with transaction.atomic():
+                        vehicle = Vehicle.objects.get(pk=vehicle_ids[(index * 97 + n) % len(vehicle_ids)])
+                        Lead.objects.create(first_name=f'Bench{index}', last_name=str(n), phone=f'07{index:02d}{n:06d}',
+                                            vehicle=vehicle, source='WEBSITE')
+                        vehicle.mileage += 1
+                        vehicle.save(update_fields=['mileage', 'updated_at'])
+                else:
+                    list(Lead.objects.order_by('-id').values_list('id', 'first_name')[:200])
+                    Lead.objects.filter(status='NEW').count()
+                done += 1
+                latencies.append(time.perf_counter() - started)
+            except OperationalError:  # "database is locked"
+                errors += 1
+                connection.close()
+            n += 1
+
+    latencies.sort()
+    results.put((kind, done, errors, latencies[len(latencies) // 2] if latencies else 0,
+                 latencies[int(len(latencies) * .99)] if latencies else 0))
+    connection.close()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks concurrent writers and readers on a scratch copy of the SQLite database, "
+        "per DB_PROFILE: write transactions/s, 'database is locked' errors, latency and reads/s."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--readers', type=int, default=2)
+        parser.add_argument('--seconds', type=float, default=10)
+        parser.add_argument('--profile', action='append', choices=PROFILES, help="Profiles to compare (default: all)")
+
+    def handle(self, *args, **options):
+        default = settings.DATABASES['default']
+        if not default['ENGINE'].endswith('sqlite3'):
+            raise CommandError("bench_db works on a copy of a SQLite database; the default database isn't one.")
+        if not Vehicle.objects.exists():
+            raise CommandError("Needs vehicles for the writers to update.")
+
+        scratch = tempfile.mkdtemp(prefix='bench_db_')
+        try:
+            for profile in options['profile'] or PROFILES:
+                self.run(profile, default, os.path.join(scratch, f'{profile}.sqlite3'), options)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    def run(self, profile, default, path, options):
+        # A fresh copy per profile, back in rollback-journal mode (WAL sticks to the file)
+        source, copy = sqlite3.connect(default['NAME']), sqlite3.connect(path)
+        source.backup(copy)
+        copy.execute('PRAGMA journal_mode=DELETE')
+        source.close()
+        copy.close()
+
+        config = configure({**default, 'NAME': path, 'OPTIONS': {}}, profile, **settings.DB_TUNING)
+        connections.close_all()  # nothing open may be shared with the forked workers
+
+        context = multiprocessing.get_context('fork')
+        results = context.Queue()
+        seconds = options['seconds']
+        deadline = time.time() + 2 + seconds  # the first ~2s go to starting the workers
+        workers = [context.Process(target=_worker, args=('writer', i, config, deadline, results))
+                   for i in range(options['writers'])]
+        workers += [context.Process(target=_worker, args=('reader', i, config, deadline, results))
+                    for i in range(options['readers'])]
+        for worker in workers:
+            worker.start()
+        finished = [results.get() for _ in workers]
+        for worker in workers:
+            worker.join()
+
+        writers = [r for r in finished if r[0] == 'writer']
+        readers = [r for r in finished if r[0] == 'reader']
+        with sqlite3.connect(path) as check:
+            journal = check.execute('PRAGMA journal_mode').fetchone()[0]
+        line = (
+            f"{profile:<6} journal={journal:<6} writers={len(writers)}: "
+            f"{sum(r[1] for r in writers) / seconds:7.1f} write txn/s, "
+            f"{sum(r[2] for r in writers)} 'database is locked' errors"
+        )
+        if writers:
+            line += (f", p50 {1000 * sorted(r[3] for r in writers)[len(writers) // 2]:.1f} ms, "
+                     f"p99 {1000 * max(r[4] for r in writers):.0f} ms")
+        self.stdout.write(
+            f"{line} | readers: {sum(r[1] for r in readers) / seconds:7.1f} reads/s, {sum(r[2] for r in readers)} errors"
+        )
@@ -0,0 +1,60 @@
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.exports import FORMATS, LEDGERS, export_chunks
+
+try:
+    import resource  # Unix only; peak RSS isn't reported elsewhere
+except ImportError:
+    resource = None
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024 if resource else float('nan')
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks a full ledger export to /dev/null: rows/s, size and peak RSS. Peak RSS is "
+        "per process, so run one export per invocation. --serializer measures the list "
+        "endpoint's way instead (every lead through LeadSerializer into one JSON document)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('ledger', choices=list(LEDGERS))
+        parser.add_argument('--format', dest='file_format', choices=list(FORMATS), default='csv')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--chunk-size', type=int, help="Rows fetched per batch (default: EXPORT_CHUNK_SIZE)")
+        parser.add_argument('--serializer', action='store_true', help="leads only: serialize like GET /api/sales/leads/")
+
+    def handle(self, *args, **options):
+        ledger = options['ledger']
+        rows = LEDGERS[ledger]['queryset']().count()
+        startup = _peak_rss_mb()
+        started = time.perf_counter()
+
+        if options['serializer']:
+            from sales.models import Lead
+            from sales.serializers import LeadSerializer
+
+            label = 'LeadSerializer + json.dumps'
+            rows = Lead.objects.count()
+            written = len(json.dumps(LeadSerializer(Lead.objects.all(), many=True).data, default=str))
+        else:
+            label = f"{ledger}.{options['file_format']}" + ('.gz' if options['gzip'] else '')
+            written = 0
+            with open(os.devnull, 'wb') as output:
+                for chunk in export_chunks(ledger, options['file_format'], compress=options['gzip'],
+                                           chunk_size=options['chunk_size']):
+                    output.write(chunk)
+                    written += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label}: {rows} rows, {written / 2**20:.0f} MB in {elapsed:.1f}s - {rows / elapsed:,.0f} rows/s, "
+            f"peak RSS {_peak_rss_mb():.0f} MB (after startup {startup:.0f} MB)"
+        )
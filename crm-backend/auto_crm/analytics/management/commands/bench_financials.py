@@ -0,0 +1,84 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.test import Client
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from analytics.rollup import rebuild_daily_revenue
+from auto_crm.benchmarks import rolled_back, timed
+from auto_crm.response_cache import invalidate
+from service.models import Customer, ServiceRecord, ServiceVehicle
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the revenue aggregates over ServiceRecord.total_cost and the financial "
+        "endpoints (uncached), optionally after seeding service records. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--records', type=int, default=0, help="Service records to seed first (e.g. 1000000)")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with rolled_back():
+            if options['records']:
+                self.seed(options['records'])
+            self.stdout.write(f"{ServiceRecord.objects.count()} service records")
+
+            completed = ServiceRecord.objects.filter(status='COMPLETED')
+            six_months = completed.filter(date__gte=timezone.now() - timedelta(days=183))
+            rows = [
+                ('revenue KPI, Sum(total_cost)', lambda: completed.aggregate(total=Sum('total_cost'))),
+                ('revenue KPI, summing the cost columns', lambda: completed.aggregate(
+                    total=Sum(F('parts_cost') + F('labor_cost') - F('discount') + F('tax')))),
+                ('6 months by month, Sum(total_cost)', lambda: list(
+                    six_months.annotate(month=TruncMonth('date')).values('month').annotate(total=Sum('total_cost')))),
+            ]
+            for label, query in rows:
+                ms, _ = timed(query, repeat)
+                self.stdout.write(f"{label:<40} {ms:9.1f} ms")
+
+            manager = get_user_model().objects.create_superuser('bench-financials', password=None)
+            client = Client(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=manager).key)
+
+            def uncached(url):
+                invalidate()  # the report itself, not the response cache
+                response = client.get(url)
+                assert response.status_code == 200, response.content[:200]
+
+            for url in ('/api/financials/', '/api/analytics/'):
+                ms, _ = timed(lambda: uncached(url), repeat)
+                self.stdout.write(f"GET {url:<36} {ms:9.1f} ms")
+
+    def seed(self, count):
+        """`count` jobs spread over the last three years, three in four completed."""
+        rng = random.Random(30)
+        owner = Customer.objects.create(name='Bench Owner', phone='555-0030')
+        vehicles = ServiceVehicle.objects.bulk_create([
+            ServiceVehicle(owner=owner, license_plate=f'BENCH{n:05d}', plate_key=f'BENCH{n:05d}', make='Kia', model='Rio')
+            for n in range(1000)
+        ])
+        days = 3 * 365
+        now = timezone.now()
+        for day in range(days):
+            # date is auto_now_add: created as now, then moved to its day
+            jobs = ServiceRecord.objects.bulk_create([
+                ServiceRecord(
+                    vehicle=rng.choice(vehicles), description='Bench job',
+                    status=rng.choice(['COMPLETED', 'COMPLETED', 'COMPLETED', 'PENDING']),
+                    parts_cost=rng.randint(0, 40000) / 100, labor_cost=rng.randint(0, 30000) / 100,
+                    tax=rng.randint(0, 5000) / 100,
+                )
+                for _ in range(count // days + (day < count % days))
+            ], batch_size=1000)
+            ServiceRecord.objects.filter(pk__in=[job.pk for job in jobs]).update(date=now - timedelta(days=day))
+        for _ in rebuild_daily_revenue():
+            pass
+        self.stdout.write(f"Seeded {count} service records")
@@ -0,0 +1,80 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from auto_crm.benchmarks import rolled_back
+from auto_crm.response_cache import invalidate
+from inventory.models import Vehicle
+from sales.models import Lead
+
+
+class Command(BaseCommand):
+    help = (
+        "Polling load test for conditional GET: polls each endpoint with and without "
+        "If-None-Match while a vehicle is edited every few polls. The edits are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--polls', type=int, default=100, help="Polls per endpoint and mode")
+        parser.add_argument('--write-every', type=int, default=20, help="Edit a vehicle every N polls")
+        parser.add_argument('--url', action='append', help="Endpoints to poll (default: a list, a detail, a window, a report)")
+
+    def handle(self, *args, **options):
+        vehicle_ids = list(Vehicle.objects.values_list('pk', flat=True))
+        lead = Lead.objects.order_by('pk').first()
+        if not vehicle_ids or lead is None:
+            raise CommandError("Needs vehicles and leads to poll.")
+
+        month = timezone.localdate().replace(day=1)
+        urls = options['url'] or [
+            '/api/inventory/vehicles/',
+            f'/api/sales/leads/{lead.pk}/',
+            f'/api/service/appointments/?start={month}&end={month.replace(day=28)}',
+            '/api/analytics/',
+        ]
+        rng = random.Random(47)
+
+        with rolled_back():
+            manager = get_user_model().objects.create_superuser('bench-polling', password=None)
+            client = Client(HTTP_AUTHORIZATION='Token ' + Token.objects.create(user=manager).key)
+            for url in urls:
+                for conditional in (False, True):
+                    seconds, size, not_modified, queries = self.poll(client, url, conditional, vehicle_ids, rng, options)
+                    polls = options['polls']
+                    self.stdout.write(
+                        f"{url:<55} {'ETag ' if conditional else 'plain'} {seconds * 1000 / polls:8.1f} ms/poll "
+                        f"{size / polls / 1024:9.1f} KB/poll  {not_modified:3d} x 304  {queries / polls:.1f} queries/poll"
+                    )
+
+    def poll(self, client, url, conditional, vehicle_ids, rng, options):
+        etag, seconds, size, not_modified, queries = None, 0.0, 0, 0, []
+
+        def count(execute, sql, *args):
+            queries.append(sql)
+            return execute(sql, *args)
+
+        for n in range(options['polls']):
+            if n and n % options['write_every'] == 0:
+                vehicle = Vehicle.objects.get(pk=rng.choice(vehicle_ids))
+                vehicle.mileage += 1
+                vehicle.save()
+                invalidate()  # what the edit's commit does to the cached reports
+
+            headers = {'HTTP_IF_NONE_MATCH': etag} if conditional and etag else {}
+            with connection.execute_wrapper(count):
+                started = time.perf_counter()
+                response = client.get(url, **headers)
+                seconds += time.perf_counter() - started
+            if response.status_code == 200:
+                etag = response.get('ETag')
+            elif response.status_code != 304:
+                raise CommandError(f"{url} returned {response.status_code}")
+            not_modified += response.status_code == 304
+            size += len(response.content)
+        return seconds, size, not_modified, len(queries)
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from auto_crm.benchmarks import timed
+from auto_crm.fast_list import plan_for
+from auto_crm.renderers import FastJSONRenderer, orjson
+from inventory.models import Vehicle
+from inventory.serializers import VehicleSerializer
+from sales.models import Lead
+from sales.serializers import LeadSerializer
+from service.models import ServiceAppointment, ServiceRecord
+from service.serializers import ServiceAppointmentSerializer, ServiceRecordSerializer
+
+
+def _lists():
+    # The list endpoints' querysets and serializers
+    return [
+        ('vehicles', Vehicle.objects.order_by('id'), VehicleSerializer),
+        ('leads', Lead.objects.select_related('vehicle').order_by('-created_at'), LeadSerializer),
+        ('service records', ServiceRecord.objects.select_related('vehicle__owner').order_by('id'), ServiceRecordSerializer),
+        ('appointments', ServiceAppointment.objects.select_related('customer', 'bay', 'technician').order_by('id'),
+         ServiceAppointmentSerializer),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks list rendering: serializer + DRF's JSONRenderer against the values_list "
+        "fast path + FastJSONRenderer, and checks both write the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10_000, help="Rows per list")
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write("orjson is not installed: FastJSONRenderer is DRF's renderer here.")
+        context = {'request': Request(APIRequestFactory().get('/'))}
+        rows, repeat = options['rows'], options['repeat']
+
+        for label, queryset, serializer_class in _lists():
+            queryset = queryset[:rows]
+            plan = plan_for(serializer_class(context=context))
+            if plan is None:
+                self.stdout.write(f"{label:<16} no fast path for {serializer_class.__name__}")
+                continue
+
+            serialize, data = timed(
+                # .all(): a fresh query each time, not the first run's result cache
+                lambda: serializer_class(queryset.all(), many=True, context=context).data, repeat)
+            values, fast_data = timed(lambda: plan.represent_all(queryset.values_list(*plan.columns)), repeat)
+            dumps, body = timed(lambda: JSONRenderer().render(data), repeat)
+            fast_dumps, fast_body = timed(lambda: FastJSONRenderer().render(fast_data), repeat)
+
+            before, after = serialize + dumps, values + fast_dumps
+            self.stdout.write(
+                f"{label:<16} {len(data):6d} rows {len(body) / 1024:7.0f} KB | serializer {serialize:7.1f} ms  "
+                f"values {values:6.1f} ms | JSONRenderer {dumps:6.1f} ms  FastJSONRenderer {fast_dumps:5.1f} ms | "
+                f"{before:7.1f} -> {after:6.1f} ms ({before / after:.1f}x)  "
+                + ("bytes identical" if body == fast_body else "BYTES DIFFER")
+            )
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from auto_crm.replica import REPLICA, replica_configured
+
+
+class Command(BaseCommand):
+    help = (
+        "Copies the SQLite database to the read replica file (DATABASE_REPLICA_URL) - "
+        "replication for trying the replica out locally."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Copy again every --interval seconds (worker mode)")
+        parser.add_argument('--interval', type=float, default=5.0, help="Seconds between copies in --loop mode")
+
+    def handle(self, *args, **options):
+        if not replica_configured():
+            raise CommandError("No read replica: set DATABASE_REPLICA_URL.")
+        if any(connections[alias].vendor != 'sqlite' for alias in (DEFAULT_DB_ALIAS, REPLICA)):
+            # Postgres: streaming replication, or pg_dump primary | psql replica for a local copy
+            raise CommandError("copy_replica only copies SQLite files.")
+
+        source, target = connections[DEFAULT_DB_ALIAS], connections[REPLICA]
+        while True:
+            started = time.perf_counter()
+            source.ensure_connection()
+            target.ensure_connection()
+            # Online backup: a consistent snapshot, while the app keeps writing
+            source.connection.backup(target.connection)
+            self.stdout.write(f"Copied the database to the replica in {time.perf_counter() - started:.1f}s")
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from analytics.models import DailyRevenue
+from analytics.rollup import rebuild_daily_revenue
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the daily revenue rollup from sold vehicles and completed service records, in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-days', type=int, default=365, help="Days per chunk")
+        parser.add_argument('--if-empty', action='store_true', help="Only run when the rollup is empty (deploy hook)")
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and DailyRevenue.objects.exists():
+            self.stdout.write("Daily revenue already built - skipping.")
+            return
+
+        started = time.perf_counter()
+        written = 0
+        for written in rebuild_daily_revenue(chunk_days=options['chunk_days']):
+            self.stdout.write(f"  {written} days ({time.perf_counter() - started:.1f}s)")
+
+        self.stdout.write(f"Rebuilt {written} days of revenue in {time.perf_counter() - started:.1f}s")
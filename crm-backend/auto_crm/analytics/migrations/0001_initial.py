@@ -0,0 +1,35 @@
+# Generated by Django 6.0 on 2026-10-19 11:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRevenue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(unique=True)),
+                ('sales_count', models.PositiveIntegerField(default=0)),
+                ('sales_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sales_cost', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('sales_profit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service_count', models.PositiveIntegerField(default=0)),
+                ('service_parts', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service_labor', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service_discount', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service_tax', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('service_revenue', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['day'],
+            },
+        ),
+    ]
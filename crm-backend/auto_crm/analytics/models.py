@@ -0,0 +1,34 @@
+from django.db import models
+
+
+class DailyRevenue(models.Model):
+    """
+    One row per calendar day (settings.TIME_ZONE) with that day's car sales
+    and completed service jobs. Derived data: maintained by
+    analytics/rollup.py and rebuilt with `python manage.py rebuild_daily_revenue`.
+    Every financial endpoint reads from here instead of the source tables.
+    """
+    day = models.DateField(unique=True)
+
+    # Car sales - vehicles with status SOLD, by sold_date
+    sales_count = models.PositiveIntegerField(default=0)
+    sales_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    sales_cost = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    # Selling - cost, over the sales with both prices filled in
+    sales_profit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    # Service - COMPLETED records, by date
+    service_count = models.PositiveIntegerField(default=0)
+    service_parts = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    service_labor = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    service_discount = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    service_tax = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    service_revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.day}: {self.sales_count} sales, {self.service_count} jobs"
@@ -0,0 +1,268 @@
+# analytics/rollup.py
+"""
+Builds DailyRevenue rows from Vehicle (sales) and ServiceRecord (service),
+and answers every revenue question - KPI totals and charts - from them.
+
+A day's row comes from two grouped queries over that day's index range, so
+keeping it current after a write is cheap, and reports sum at most a few
+thousand small rows instead of rescanning every sale and job. Days follow
+settings.TIME_ZONE; periods are keyed by their first day (ISO date), so
+January 2025 and January 2026 never share a bucket.
+"""
+import calendar
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+from django.db.models.functions import TruncDate, TruncMonth, TruncWeek, TruncYear
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from inventory.models import Vehicle
+from service.models import ServiceRecord
+from .models import DailyRevenue
+
+COUNT_FIELDS = ['sales_count', 'service_count']
+AMOUNT_FIELDS = [
+    'sales_revenue', 'sales_cost', 'sales_profit',
+    'service_parts', 'service_labor', 'service_discount', 'service_tax', 'service_revenue',
+]
+UPDATE_FIELDS = COUNT_FIELDS + AMOUNT_FIELDS + ['updated_at']
+
+
+# --- 1. AGGREGATE ---
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def local_day(moment):
+    return timezone.localdate(moment) if moment else None
+
+
+def _window(field, start=None, end=None):
+    """`field` falls on a day in [start, end] (either side open when None)."""
+    lookup = {}
+    if start is not None:
+        lookup[f'{field}__gte'] = day_start(start)
+    if end is not None:
+        lookup[f'{field}__lt'] = day_start(end + timedelta(days=1))
+    return Q(**lookup)
+
+
+def build_days(start=None, end=None):
+    """Returns {day: DailyRevenue (unsaved)} for every day in [start, end] with any activity."""
+    sales = (
+        Vehicle.objects.filter(Q(status='SOLD', sold_date__isnull=False) & _window('sold_date', start, end))
+        .annotate(day=TruncDate('sold_date'))
+        .values('day')
+        .annotate(
+            sales_count=Count('id'),
+            sales_revenue=Sum('selling_price'),
+            sales_cost=Sum('cost_price'),
+            # Same rule as the Gross Profit card: both prices must be filled in
+            sales_profit=Sum(F('selling_price') - F('cost_price'), filter=Q(selling_price__gt=0, cost_price__gt=0)),
+        )
+    )
+    service = (
+        ServiceRecord.objects.filter(Q(status='COMPLETED') & _window('date', start, end))
+        .annotate(day=TruncDate('date'))
+        .values('day')
+        .annotate(
+            service_count=Count('id'),
+            service_parts=Sum('parts_cost'),
+            service_labor=Sum('labor_cost'),
+            service_discount=Sum('discount'),
+            service_tax=Sum('tax'),
+            service_revenue=Sum('total_cost'),
+        )
+    )
+
+    days = {}
+    for row in chain(sales, service):
+        day = row.pop('day')
+        entry = days.setdefault(day, DailyRevenue(day=day))
+        for field, value in row.items():
+            setattr(entry, field, value or 0)
+    return days
+
+
+def save_days(rows, batch_size=1000):
+    DailyRevenue.objects.bulk_create(
+        rows, batch_size=batch_size,
+        update_conflicts=True, unique_fields=['day'], update_fields=UPDATE_FIELDS,
+    )
+
+
+# --- 2. INCREMENTAL REFRESH ---
+
+def refresh_days(days):
+    """Recomputes these days (deletes the ones with no sales or jobs left)."""
+    for day in sorted({day for day in days if day}):
+        rows = build_days(day, day)
+        with transaction.atomic():
+            if rows:
+                save_days(list(rows.values()))
+            else:
+                DailyRevenue.objects.filter(day=day).delete()
+
+
+def schedule_refresh(days):
+    """Refreshes these days once the current transaction commits (right away outside one)."""
+    days = {day for day in days if day}
+    if days:
+        transaction.on_commit(lambda: refresh_days(days))
+
+
+# --- 3. FULL REBUILD ---
+
+def _activity_bounds():
+    sold = Vehicle.objects.filter(status='SOLD').aggregate(first=Min('sold_date'), last=Max('sold_date'))
+    serviced = ServiceRecord.objects.filter(status='COMPLETED').aggregate(first=Min('date'), last=Max('date'))
+    moments = [moment for moment in (sold['first'], sold['last'], serviced['first'], serviced['last']) if moment]
+    if not moments:
+        return None, None
+    return local_day(min(moments)), local_day(max(moments))
+
+
+def rebuild_daily_revenue(chunk_days=365):
+    """
+    Recomputes the whole table `chunk_days` days at a time, walking the
+    sold_date / date indexes in order. Yields the running number of day rows
+    written after each chunk so callers can report progress.
+    """
+    first, last = _activity_bounds()
+    if first is None:
+        DailyRevenue.objects.all().delete()
+        yield 0
+        return
+
+    written = 0
+    start = first
+    while start <= last:
+        end = min(start + timedelta(days=chunk_days - 1), last)
+        rows = build_days(start, end)
+        with transaction.atomic():
+            save_days(list(rows.values()))
+            DailyRevenue.objects.filter(day__range=(start, end)).exclude(day__in=list(rows)).delete()
+        written += len(rows)
+        yield written
+        start = end + timedelta(days=1)
+
+    DailyRevenue.objects.filter(Q(day__lt=first) | Q(day__gt=last)).delete()
+
+
+# --- 4. REPORTS ---
+
+GRANULARITIES = {
+    'day': None,
+    'week': TruncWeek,    # ISO weeks, starting Monday
+    'month': TruncMonth,
+    'year': TruncYear,
+}
+MAX_PERIODS = 1000
+
+
+def period_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    if granularity == 'year':
+        return day.replace(month=1, day=1)
+    return day
+
+
+def next_period(day, granularity):
+    if granularity == 'week':
+        return day + timedelta(days=7)
+    if granularity == 'month':
+        return day + timedelta(days=calendar.monthrange(day.year, day.month)[1])
+    if granularity == 'year':
+        return day.replace(year=day.year + 1)
+    return day + timedelta(days=1)
+
+
+def period_label(day, granularity, with_year=True):
+    if granularity == 'year':
+        return day.strftime('%Y')
+    if granularity == 'month':
+        return day.strftime('%b %Y')
+    return day.strftime('%d %b %Y' if with_year else '%d %b')
+
+
+def report_window(params, default_months=6, default_granularity='month'):
+    """
+    Reads ?start=YYYY-MM-DD&end=YYYY-MM-DD&granularity=day|week|month|year
+    from a request's query params. By default: the last `default_months`
+    calendar months up to today. Returns (start, end, granularity) or raises
+    ValueError with a message for the client.
+    """
+    granularity = params.get('granularity') or default_granularity
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}.")
+
+    try:
+        end = parse_date(params['end']) if params.get('end') else timezone.localdate()
+        start = parse_date(params['start']) if params.get('start') else None
+    except ValueError:
+        end = None  # well formed but not a real date, e.g. 2025-02-30
+    if end is None or (params.get('start') and start is None):
+        raise ValueError("start and end must be dates (YYYY-MM-DD).")
+    if start is None:
+        start = end.replace(day=1)
+        for _ in range(default_months - 1):
+            start = (start - timedelta(days=1)).replace(day=1)
+    if start > end:
+        raise ValueError("start must not be after end.")
+
+    periods, day = 0, period_start(start, granularity)
+    while day <= end:
+        periods += 1
+        if periods > MAX_PERIODS:
+            raise ValueError(f"That range has more than {MAX_PERIODS} {granularity}s - use a coarser granularity.")
+        day = next_period(day, granularity)
+    return start, end, granularity
+
+
+def revenue_totals(start=None, end=None):
+    """Counts and amounts summed over [start, end] (all time when both are None)."""
+    lookup = {}
+    if start is not None:
+        lookup['day__gte'] = start
+    if end is not None:
+        lookup['day__lte'] = end
+    totals = DailyRevenue.objects.filter(**lookup).aggregate(
+        **{field: Sum(field) for field in COUNT_FIELDS + AMOUNT_FIELDS}
+    )
+    return {field: value or 0 for field, value in totals.items()}
+
+
+def revenue_series(start, end, granularity='month'):
+    """
+    One entry per period in [start, end] - empty periods included, as zeros -
+    with `period` (ISO date of its first day), a display `name`, and every
+    count/amount. Amounts are floats, ready for the charts.
+    """
+    truncate = GRANULARITIES[granularity]
+    queryset = DailyRevenue.objects.filter(day__range=(start, end))
+    queryset = queryset.annotate(period=truncate('day') if truncate else F('day'))
+    rows = {
+        row['period']: row
+        for row in queryset.values('period').annotate(
+            **{field: Sum(field) for field in COUNT_FIELDS + AMOUNT_FIELDS}
+        ).order_by('period')
+    }
+
+    with_year = start.year != end.year
+    series = []
+    day = period_start(start, granularity)
+    while day <= end:
+        row = rows.get(day, {})
+        entry = {'period': day.isoformat(), 'name': period_label(day, granularity, with_year)}
+        entry.update({field: row.get(field) or 0 for field in COUNT_FIELDS})
+        entry.update({field: float(row.get(field) or 0) for field in AMOUNT_FIELDS})
+        series.append(entry)
+        day = next_period(day, granularity)
+    return series
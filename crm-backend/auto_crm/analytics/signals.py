@@ -0,0 +1,123 @@
+# analytics/signals.py
+"""
+Incremental DailyRevenue maintenance.
+
+Same pattern as customers/signals.py: for every write to a Vehicle or
+ServiceRecord we note the day it counted towards before the change
+(pre_save / pre_delete) and after it (post_save), then recompute just those
+days when the transaction commits. Both sides matter - a sale can be undone,
+re-dated or re-priced, and a job can leave COMPLETED.
+
+Any Vehicle / Lead / ServiceRecord write also retires the cached dashboard
+responses (auto_crm/response_cache.py) and is pushed to live dashboards
+(auto_crm/live.py). Those receivers are connected after the rollup ones, so
+both happen after the days are refreshed. ServiceAppointment writes retire
+the cached responses too - they show in the dashboard's activity feed.
+
+bulk_create / queryset.update() skip these signals - callers that use them
+call rollup.schedule_refresh() / response_cache.invalidate_on_commit() /
+live.schedule_kpis_on_commit() themselves.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from auto_crm.live import publish_on_commit, schedule_kpis_on_commit
+from auto_crm.response_cache import invalidate_on_commit
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import ServiceAppointment, ServiceRecord
+from .rollup import local_day, schedule_refresh
+
+
+def _days(queryset, field):
+    return {local_day(moment) for moment in queryset.values_list(field, flat=True)}
+
+
+# Model -> the revenue days the row with this pk counts towards
+AFFECTED_DAYS = {
+    Vehicle: lambda pk: _days(Vehicle.objects.filter(pk=pk, status='SOLD'), 'sold_date'),
+    ServiceRecord: lambda pk: _days(ServiceRecord.objects.filter(pk=pk, status='COMPLETED'), 'date'),
+}
+
+
+def remember_days(sender, instance, raw=False, **kwargs):
+    # pre_save / pre_delete: where the row counted before this write
+    if not raw and instance.pk and not instance._state.adding:
+        instance._revenue_days = AFFECTED_DAYS[sender](instance.pk)
+
+
+def refresh_after_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        before = getattr(instance, '_revenue_days', set())
+        schedule_refresh(before | AFFECTED_DAYS[sender](instance.pk))
+
+
+def refresh_after_delete(sender, instance, **kwargs):
+    schedule_refresh(getattr(instance, '_revenue_days', set()))
+
+
+for model in AFFECTED_DAYS:
+    pre_save.connect(remember_days, sender=model, dispatch_uid=f'revenue-pre-save-{model.__name__}')
+    post_save.connect(refresh_after_save, sender=model, dispatch_uid=f'revenue-post-save-{model.__name__}')
+    pre_delete.connect(remember_days, sender=model, dispatch_uid=f'revenue-pre-delete-{model.__name__}')
+    post_delete.connect(refresh_after_delete, sender=model, dispatch_uid=f'revenue-post-delete-{model.__name__}')
+
+
+# --- CACHED DASHBOARD RESPONSES ---
+
+def invalidate_responses(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_on_commit()
+
+
+for model in (Vehicle, Lead, ServiceRecord, ServiceAppointment):
+    post_save.connect(invalidate_responses, sender=model, dispatch_uid=f'responses-post-save-{model.__name__}')
+    post_delete.connect(invalidate_responses, sender=model, dispatch_uid=f'responses-post-delete-{model.__name__}')
+
+
+# --- LIVE DASHBOARD EVENTS ---
+
+def push_lead(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        publish_on_commit('lead', {
+            'id': instance.pk,
+            'name': f"{instance.first_name} {instance.last_name}".strip(),
+            'source': instance.source,
+            'vehicle': str(instance.vehicle) if instance.vehicle_id else None,
+            'created_at': instance.created_at,
+        })
+    schedule_kpis_on_commit()
+
+
+def push_revenue(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    # Rows that didn't count as revenue before this save (see remember_days)
+    newly_counted = not getattr(instance, '_revenue_days', None)
+    if newly_counted and sender is Vehicle and instance.status == 'SOLD':
+        publish_on_commit('sale', {
+            'id': instance.pk,
+            'vehicle': f"{instance.year} {instance.make} {instance.model}",
+            'price': instance.selling_price,
+            'sold_date': instance.sold_date,
+        })
+    elif newly_counted and sender is ServiceRecord and instance.status == 'COMPLETED':
+        publish_on_commit('service', {
+            'id': instance.pk,
+            'description': instance.description,
+            'total': instance.total_cost,
+            'date': instance.date,
+        })
+    schedule_kpis_on_commit()
+
+
+def push_kpis(sender, **kwargs):
+    schedule_kpis_on_commit()
+
+
+post_save.connect(push_lead, sender=Lead, dispatch_uid='live-lead')
+for model in (Vehicle, ServiceRecord):
+    post_save.connect(push_revenue, sender=model, dispatch_uid=f'live-post-save-{model.__name__}')
+for model in (Vehicle, Lead, ServiceRecord):
+    post_delete.connect(push_kpis, sender=model, dispatch_uid=f'live-post-delete-{model.__name__}')
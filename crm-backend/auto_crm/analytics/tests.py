@@ -0,0 +1,32 @@
+import csv
+import io
+
+from django.test import TestCase
+
+from sales.models import Lead
+
+from .exports import export_chunks
+
+
+class CsvExportTests(TestCase):
+
+    def export(self, ledger):
+        data = b''.join(export_chunks(ledger, 'csv')).decode()
+        return list(csv.DictReader(io.StringIO(data)))
+
+    def test_formula_cells_are_escaped(self):
+        Lead.objects.create(
+            first_name='=HYPERLINK("http://evil.example","Ann")', last_name='@SUM(A1)',
+            phone='+1 555 0100', email='-2+3@example.com', quoted_price='-150.00',
+        )
+        Lead.objects.create(first_name='Bob', last_name='Ray', phone='555-0101')
+
+        evil, plain = self.export('leads')
+
+        self.assertEqual(evil['first_name'], '\'=HYPERLINK("http://evil.example","Ann")')
+        self.assertEqual(evil['last_name'], "'@SUM(A1)")
+        self.assertEqual(evil['phone'], "'+1 555 0100")
+        self.assertEqual(evil['email'], "'-2+3@example.com")
+        # Amounts are numbers, not text - left alone
+        self.assertEqual(evil['quoted_price'], '-150.00')
+        self.assertEqual((plain['first_name'], plain['phone']), ('Bob', '555-0101'))
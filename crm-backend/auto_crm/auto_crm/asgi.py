@@ -13,4 +13,16 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'auto_crm.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported after setup - it uses models
+from auto_crm.live_view import LIVE_PATH, live_dashboard  # noqa: E402
+
+
+async def application(scope, receive, send):
+    # The live dashboard stream is served outside Django's request handling so
+    # an idle connection costs a coroutine instead of a thread (auto_crm/live_view.py)
+    if scope['type'] == 'http' and scope['path'] == LIVE_PATH:
+        await live_dashboard(scope, receive, send)
+    else:
+        await django_application(scope, receive, send)
@@ -0,0 +1,28 @@
+from rest_framework.authtoken.models import Token
+from rest_framework.authtoken.views import ObtainAuthToken
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from auto_crm.authentication import token_expired
+
+
+class ExpiringObtainAuthToken(ObtainAuthToken):
+    """POST /api-token-auth/ - like DRF's, but an expired token is replaced by a new one."""
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        user = serializer.validated_data['user']
+        token, created = Token.objects.get_or_create(user=user)
+        if not created and token_expired(token):
+            token.delete()
+            token = Token.objects.create(user=user)
+        return Response({'token': token.key})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout_view(request):
+    """POST /api/logout/ - revokes the token the request was made with."""
+    request.auth.delete()
+    return Response(status=204)
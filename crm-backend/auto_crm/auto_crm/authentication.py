@@ -0,0 +1,181 @@
+# auto_crm/authentication.py
+"""
+Token authentication without a database query per request.
+
+CachedTokenAuthentication answers from an in-process LRU of token -> user
+(AUTH_TOKEN_CACHE_SIZE entries, each trusted for AUTH_TOKEN_CACHE_SECONDS);
+only a miss reads authtoken_token + auth_user like DRF's TokenAuthentication.
+The role comes from auto_crm/roles.py, which is cached the same way. Every
+request gets its own copy of the cached user, so per-request state (the
+resolved roles, attributes views set) never leaks between requests.
+
+Entries are dropped at once in this process when the token is deleted
+(logout, rotation) and when its user is saved or deleted (deactivation,
+password or role change). For every other worker - and the live stream,
+which authenticates through user_for_token() too - the change also stamps
+the token in the shared `responses` cache once it commits; a cached entry
+is only used while the stamp it was loaded under is still the current one.
+That is one cache read per request instead of the two table reads.
+
+With AUTH_TOKEN_EXPIRY_SECONDS set, tokens older than that are refused and
+replaced at the next login (auto_crm/auth_view.py). This module must not
+import DRF views: DRF imports it while setting its views up.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+
+# --- 1. TOKEN CACHE ---
+
+def _stamp_key(key):
+    return 'auth:token:' + hashlib.sha1(key.encode()).hexdigest()
+
+
+def token_stamp(key):
+    """The token's revocation stamp in the shared cache (None until it changes)."""
+    return caches['responses'].get(_stamp_key(key))
+
+
+def revoke_on_commit(keys):
+    """Stamps the tokens once the transaction commits, so every process reloads them."""
+    keys = list(keys)
+    if not keys:
+        return
+    # Entries live at most AUTH_TOKEN_CACHE_SECONDS, so the stamp needn't outlast that
+    transaction.on_commit(lambda: caches['responses'].set_many(
+        {_stamp_key(key): time.time_ns() for key in keys}, settings.AUTH_TOKEN_CACHE_SECONDS,
+    ))
+
+
+class TokenCache:
+    """LRU + TTL map of token key -> (user, token, fresh until, stamp)."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] < time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+        # Revoked in another process since it was loaded (outside the lock: cache I/O)
+        if token_stamp(key) != entry[3]:
+            self.forget_token(key)
+            return None
+        return entry[:2]
+
+    def put(self, key, user, token, stamp=None):
+        with self._lock:
+            self._drop(key)
+            self._entries[key] = (user, token, time.monotonic() + settings.AUTH_TOKEN_CACHE_SECONDS, stamp)
+            self._keys_by_user.setdefault(user.pk, set()).add(key)
+            while len(self._entries) > settings.AUTH_TOKEN_CACHE_SIZE:
+                self._drop(next(iter(self._entries)))
+
+    def forget_token(self, key):
+        with self._lock:
+            self._drop(key)
+
+    def forget_user(self, user_id):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user.get(entry[0].pk)
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[0].pk]
+
+
+token_cache = TokenCache()
+
+
+@receiver(post_save, sender=Token)
+@receiver(post_delete, sender=Token)
+def token_changed(sender, instance, **kwargs):
+    token_cache.forget_token(instance.key)
+    revoke_on_commit([instance.key])
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def token_user_changed(sender, instance, **kwargs):
+    token_cache.forget_user(instance.pk)
+    # Deleting the user deletes its tokens, which revokes them (token_changed)
+    if kwargs['signal'] is post_save:
+        revoke_on_commit(Token.objects.filter(user_id=instance.pk).values_list('key', flat=True))
+
+
+# --- 2. AUTHENTICATION ---
+
+def token_expired(token):
+    lifetime = settings.AUTH_TOKEN_EXPIRY_SECONDS
+    return bool(lifetime) and token.created < timezone.now() - timedelta(seconds=lifetime)
+
+
+def user_for_token(key):
+    """
+    (user, token) for a token key - the user a private copy - or raises
+    AuthenticationFailed with TokenAuthentication's messages.
+    """
+    entry = token_cache.get(key)
+    if entry is None:
+        # Read before the rows, so a revocation racing this load still shows up
+        stamp = token_stamp(key)
+        try:
+            token = Token.objects.select_related('user').get(key=key)
+        except Token.DoesNotExist:
+            raise exceptions.AuthenticationFailed(_('Invalid token.'))
+        if not token.user.is_active:
+            raise exceptions.AuthenticationFailed(_('User inactive or deleted.'))
+        token_cache.put(key, token.user, token, stamp)
+        entry = (token.user, token)
+
+    user, token = entry
+    if token_expired(token):
+        token_cache.forget_token(key)
+        raise exceptions.AuthenticationFailed(_('Token has expired.'))
+    return copy.copy(user), token
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """DRF TokenAuthentication ("Authorization: Token <key>") backed by token_cache."""
+
+    def authenticate_credentials(self, key):
+        return user_for_token(key)
+
@@ -0,0 +1,38 @@
+# auto_crm/benchmarks.py
+"""
+Shared bits of the bench_* management commands, which reproduce the numbers
+quoted when the matching features went in.
+
+Benchmarks that need data seed it inside rolled_back(), so a run leaves the
+database - and the response cache - as it found it. Timings are medians of
+several runs, taken in-process through Django's test client (no network).
+"""
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+
+def timed(fn, repeat=20):
+    """(median milliseconds of `repeat` calls to fn, the last call's result)."""
+    samples, result = [], None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+@contextmanager
+def rolled_back(using=None):
+    """Runs the block in a transaction that is always rolled back."""
+    from auto_crm.response_cache import invalidate
+
+    try:
+        with transaction.atomic(using=using):
+            yield
+            transaction.set_rollback(True, using=using)
+    finally:
+        # Reports cached from the seeded rows must not outlive them
+        invalidate()
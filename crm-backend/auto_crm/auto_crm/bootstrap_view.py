@@ -0,0 +1,120 @@
+# auto_crm/bootstrap_view.py
+"""
+GET /api/bootstrap/ - everything the app shell needs after login in one
+round trip: the user's profile and role flags, the dashboard KPI cards and
+activity, the dashboard charts and, for managers, the financial summary.
+
+The datasets share their inputs - stock value and the six-month revenue
+series are computed once for both the dashboard and the financials - and the
+independent queries run side by side on a small thread pool
+(BOOTSTRAP_WORKERS), so the response takes about as long as the slowest
+query rather than the sum of them. The datasets are cached per role like the
+individual endpoints (auto_crm/response_cache.py); the profile never is.
+Like those endpoints, the datasets are read from the read replica when
+there is one (auto_crm/replica.py).
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from analytics.rollup import report_window, revenue_series, revenue_totals
+from auto_crm import dashboard_view, finance_view
+from auto_crm.replica import replica_reads
+from auto_crm.response_cache import cached_data
+from auto_crm.roles import roles_for
+
+
+def user_profile(user):
+    roles = roles_for(user)
+    return {
+        'username': user.username,
+        'is_manager': roles.is_manager,
+        'is_sales': roles.is_sales,
+    }
+
+
+# --- 1. CONCURRENT QUERIES ---
+
+_pool = None
+
+
+def _run(func, args):
+    try:
+        return func(*args)
+    finally:
+        # Pool threads keep their connection between requests (CONN_MAX_AGE)
+        # and close it the way a request would when it's too old or broken
+        close_old_connections()
+
+
+def run_concurrently(tasks):
+    """{name: (func, *args)} -> {name: result}, on BOOTSTRAP_WORKERS threads."""
+    global _pool
+    if settings.BOOTSTRAP_WORKERS <= 1:
+        return {name: func(*args) for name, (func, *args) in tasks.items()}
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=settings.BOOTSTRAP_WORKERS, thread_name_prefix='bootstrap')
+    # Each task sees the request's context (replica routing) like an inline call would
+    futures = {
+        name: _pool.submit(contextvars.copy_context().run, _run, func, args)
+        for name, (func, *args) in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+# --- 2. DATASETS ---
+
+def build_datasets(is_manager):
+    # Same default windows as /api/dashboard/stats/, /api/analytics/ and /api/financials/
+    month_start, month_end, _ = report_window({}, default_months=1)
+    start, end, granularity = report_window({})
+
+    tasks = {
+        'inventory_value': (dashboard_view.inventory_value,),
+        'active_leads': (dashboard_view.active_leads,),
+        'month_totals': (revenue_totals, month_start, month_end),
+        'activity': (dashboard_view.recent_activity,),
+        'lead_sources': (dashboard_view.lead_sources,),
+        'series': (revenue_series, start, end, granularity),
+    }
+    if is_manager:
+        tasks['all_time_totals'] = (revenue_totals,)
+        tasks['recent_sales'] = (finance_view.recent_sales,)
+    with replica_reads():
+        parts = run_concurrently(tasks)
+
+    datasets = {
+        'dashboard': {
+            'stats': dashboard_view.stats_payload(parts['inventory_value'], parts['active_leads'], parts['month_totals']),
+            'activity': parts['activity'],
+        },
+        'analytics': {
+            'lead_sources': parts['lead_sources'],
+            'revenue_chart': dashboard_view.revenue_chart(parts['series']),
+        },
+        'financials': None,
+    }
+    if is_manager:
+        datasets['financials'] = finance_view.financial_summary(
+            parts['inventory_value'], parts['all_time_totals'], parts['series'],
+            parts['recent_sales'], (start, end, granularity),
+        )
+    return datasets
+
+
+# --- 3. ENDPOINT ---
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def bootstrap_view(request):
+    profile = user_profile(request.user)
+    datasets, hit = cached_data('bootstrap', request, lambda: build_datasets(profile['is_manager']))
+
+    response = Response({'user': profile, **datasets})
+    response['X-Cache'] = 'HIT' if hit else 'MISS'
+    return response
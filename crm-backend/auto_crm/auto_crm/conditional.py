@@ -0,0 +1,94 @@
+# auto_crm/conditional.py
+"""
+Conditional GET (ETag / If-None-Match) for the list and detail endpoints
+and the cached dashboard reports.
+
+The ETag is worked out *before* the expensive part of the request, from
+what changes whenever the response would:
+
+- viewsets (ConditionalGetMixin): the newest updated_at and the row count of
+  the filtered queryset - one aggregate over the updated_at index - plus the
+  newest updated_at of each model the serializer nests (etag_depends_on).
+  An insert or an edit moves the newest updated_at, a delete lowers the count;
+- reports (response_cache.cache_response): the write generation, which every
+  Vehicle / Lead / ServiceRecord / ServiceAppointment write renews.
+
+Both also cover the caller (user and role), the query string and ETAG_SALT.
+A request whose If-None-Match still matches gets 304 with no body: nothing is
+fetched or serialized. Responses carry `Cache-Control: private, no-cache`,
+so browsers keep the body and revalidate on every fetch by themselves.
+
+queryset.update() skips auto_now - callers that use it set updated_at
+themselves (same rule as delta sync, sync/delta.py).
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+
+from auto_crm.roles import roles_for
+
+
+# --- 1. VALIDATORS ---
+
+def make_etag(request, *state):
+    """A strong ETag for `state` as seen by this caller with this query string."""
+    query = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    caller = (request.user.pk, roles_for(request.user).role)
+    digest = hashlib.sha1(repr((settings.ETAG_SALT, caller, query, state)).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def add_validator(response, etag):
+    response['ETag'] = etag
+    # Store it, but ask us every time; per user, never in shared caches
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+def not_modified(request, etag):
+    """A 304 if the client's If-None-Match already has `etag`, else None."""
+    probe = add_validator(HttpResponse(), etag)
+    response = get_conditional_response(request, etag=etag, response=probe)
+    return None if response is probe else response
+
+
+# --- 2. VIEWSETS ---
+
+class ConditionalGetMixin:
+    """For ModelViewSets of models with updated_at: list() / retrieve() answer 304."""
+
+    # Models the serializer nests (names, details) - their edits change our output too
+    etag_depends_on = ()
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.conditional(queryset, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset()).filter(**{self.lookup_field: kwargs[lookup]})
+        return self.conditional(queryset, super().retrieve, request, *args, **kwargs)
+
+    def conditional(self, queryset, view, request, *args, **kwargs):
+        etag = self.etag(queryset)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            add_validator(response, etag)
+        return response
+
+    def get_etag_depends_on(self):
+        return self.etag_depends_on
+
+    def etag(self, queryset):
+        state = [queryset.aggregate(newest=Max('updated_at'), rows=Count('pk'))]
+        for model in self.get_etag_depends_on():
+            state.append(model.objects.aggregate(newest=Max('updated_at'))['newest'])
+        return make_etag(self.request, type(self).__name__, self.get_serializer_class().__name__, state)
@@ -1,62 +1,105 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework import status
 from inventory.models import Vehicle
 from sales.models import Lead
-from service.models import ServiceRecord
-from django.db.models import Sum, Count, Q
-from django.utils import timezone
-from datetime import timedelta
+from activity.log import feed
+from analytics.rollup import report_window, revenue_series, revenue_totals
+from auto_crm.replica import use_replica
+from auto_crm.response_cache import cache_response, cache_stats
+from auto_crm.roles import is_manager
+from django.db.models import Count, Sum
+from django.utils.decorators import method_decorator
 
+# --- DATASETS (shared with /api/bootstrap/ and the live stream) ---
+
+def inventory_value():
+    # Old Logic: status='AVAILABLE', Sum('selling_price')
+    # New Logic: status=['AVAILABLE', 'RESERVED'], Sum('cost_price')
+    return Vehicle.objects.filter(
+        status__in=['AVAILABLE', 'RESERVED']
+    ).aggregate(total=Sum('cost_price'))['total'] or 0
+
+def active_leads():
+    # Negotiation phase
+    return Lead.objects.filter(status='NEGOTIATION').count()
+
+def stats_payload(inventory_value, active_leads, totals):
+    """The KPI cards, from the pieces above + revenue_totals() for the window."""
+    return {
+        "inventory_value": inventory_value,
+        "active_leads": active_leads,
+        "monthly_sales": totals['sales_count'],
+        "sales_revenue": totals['sales_revenue'],
+        "service_revenue": totals['service_revenue'],
+    }
+
+def dashboard_stats(start, end):
+    """The KPI cards. Also pushed to live dashboards (auto_crm/live.py)."""
+    return stats_payload(inventory_value(), active_leads(), revenue_totals(start, end))
+
+def recent_activity():
+    # The last five entries of the activity log (activity/log.py)
+    return feed(limit=5)[0]
+
+def lead_sources():
+    return list(Lead.objects.values('source').annotate(value=Count('id')).order_by('-value'))
+
+def revenue_chart(series):
+    # Service revenue + car sales profit per period (rows from revenue_series())
+    return [
+        {
+            'period': row['period'],
+            'name': row['name'],
+            'total': row['service_revenue'] + row['sales_profit'],
+        }
+        for row in series
+    ]
+
+# --- ENDPOINTS ---
+
+@method_decorator(use_replica, name='get')
+@method_decorator(cache_response('dashboard-stats'), name='get')
 class DashboardStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        # 1. TOTAL INVENTORY VALUE (The Fix)
-        # Old Logic: status='AVAILABLE', Sum('selling_price')
-        # New Logic: status=['AVAILABLE', 'RESERVED'], Sum('cost_price')
-        inventory_value = Vehicle.objects.filter(
-            status__in=['AVAILABLE', 'RESERVED']
-        ).aggregate(total=Sum('cost_price'))['total'] or 0
-
-        # 2. ACTIVE LEADS (Negotiation phase)
-        active_leads = Lead.objects.filter(status='NEGOTIATION').count()
-
-        # 3. SALES THIS MONTH
-        first_day_month = timezone.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        sales_this_month = Vehicle.objects.filter(
-            status='SOLD', 
-            updated_at__gte=first_day_month
-        ).count()
-
-        # 4. RECENT ACTIVITY LOG
-        # (Simple combined list of recent actions)
-        recent_activity = []
-        
-        # New Leads
-        for lead in Lead.objects.order_by('-created_at')[:3]:
-            recent_activity.append({
-                "type": "LEAD",
-                "message": f"New Lead: {lead.first_name} interested in {lead.vehicle or 'Inventory'}",
-                "time": lead.created_at
-            })
-            
-        # Recent Sales
-        for sale in Vehicle.objects.filter(status='SOLD').order_by('-updated_at')[:3]:
-            recent_activity.append({
-                "type": "SALE",
-                "message": f"Vehicle Sold: {sale.year} {sale.make} {sale.model}",
-                "time": sale.updated_at
-            })
-
-        # Sort combined activity by time
-        recent_activity.sort(key=lambda x: x['time'], reverse=True)
+        # This month by default; ?start=&end= (YYYY-MM-DD) report another window
+        try:
+            start, end, _ = report_window(request.query_params, default_months=1)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         return Response({
-            "stats": {
-                "inventory_value": inventory_value,
-                "active_leads": active_leads,
-                "monthly_sales": sales_this_month,
-            },
-            "activity": recent_activity[:5]
-        })
\ No newline at end of file
+            "stats": dashboard_stats(start, end),
+            "activity": recent_activity()
+        })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@use_replica
+@cache_response('analytics')
+def dashboard_analytics(request):
+    # 1. LEAD SOURCES (Pie Chart)
+    # 2. COMBINED REVENUE/PROFIT (Bar Chart) - from the daily revenue rollup
+    # ?start=&end=&granularity=
+    try:
+        start, end, granularity = report_window(request.query_params)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'lead_sources': lead_sources(),
+        'revenue_chart': revenue_chart(revenue_series(start, end, granularity))
+    })
+
+class ResponseCacheStatsView(APIView):
+    """GET /api/dashboard/cache/ - hit rate of the cached report endpoints (managers only)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not is_manager(request.user):
+            return Response({"error": "Access Denied"}, status=status.HTTP_403_FORBIDDEN)
+        return Response(cache_stats())
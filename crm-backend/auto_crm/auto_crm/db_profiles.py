@@ -0,0 +1,85 @@
+# auto_crm/db_profiles.py
+"""
+Connection tuning for settings.DATABASES, per engine (DB_PROFILE).
+
+Imported by settings.py, so this only rewrites the dict dj_database_url built.
+
+'tuned' (the default):
+
+- SQLite: WAL journal, so readers and the writer no longer block each other;
+  a busy timeout, so a second writer waits for the lock instead of failing
+  with "database is locked"; BEGIN IMMEDIATE, so a transaction takes the
+  write lock when it starts rather than failing when a read turns into a
+  write halfway through; synchronous=NORMAL (with WAL a process crash loses
+  nothing, a power cut can lose the last commits); mmap and a larger page
+  cache. The pragmas run on every new connection.
+- Postgres: persistent connections with health checks, or a psycopg 3
+  connection pool (DB_POOL_SIZE, needs `psycopg[pool]`); statement, lock and
+  idle-in-transaction timeouts; server-side cursors for QuerySet.iterator()
+  (exports, backfills), unless DB_DISABLE_SERVER_SIDE_CURSORS - required
+  behind PgBouncer in transaction mode.
+
+'plain' leaves the connection as dj_database_url built it.
+"""
+import importlib.util
+
+from django.core.exceptions import ImproperlyConfigured
+
+PROFILES = ('tuned', 'plain')
+
+
+def configure(config, profile='tuned', *, sqlite_busy_timeout=20, sqlite_mmap_mb=128, sqlite_cache_mb=32,
+              pool_size=0, statement_timeout_ms=30000, lock_timeout_ms=10000, idle_timeout_ms=60000,
+              server_side_cursors=True):
+    """Returns `config` (a DATABASES entry) with the profile applied."""
+    if profile not in PROFILES:
+        raise ImproperlyConfigured(f"DB_PROFILE must be one of {', '.join(PROFILES)}, not {profile!r}")
+    if profile == 'plain':
+        return config
+
+    config = {**config, 'OPTIONS': dict(config.get('OPTIONS', {}))}
+    engine = config['ENGINE']
+    if engine.endswith('sqlite3'):
+        _sqlite(config, sqlite_busy_timeout, sqlite_mmap_mb, sqlite_cache_mb)
+    elif engine.endswith('postgresql'):
+        _postgres(config, pool_size, statement_timeout_ms, lock_timeout_ms, idle_timeout_ms, server_side_cursors)
+    return config
+
+
+# --- 1. SQLITE ---
+
+def _sqlite(config, busy_timeout, mmap_mb, cache_mb):
+    options = config['OPTIONS']
+    options.setdefault('timeout', busy_timeout)
+    options.setdefault('transaction_mode', 'IMMEDIATE')
+    options.setdefault('init_command', '; '.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA mmap_size={mmap_mb * 1024 * 1024}',
+        f'PRAGMA cache_size=-{cache_mb * 1024}',  # negative = KiB
+        'PRAGMA temp_store=MEMORY',
+    ]))
+
+
+# --- 2. POSTGRES ---
+
+def _postgres(config, pool_size, statement_timeout_ms, lock_timeout_ms, idle_timeout_ms, server_side_cursors):
+    options = config['OPTIONS']
+
+    if pool_size:
+        if importlib.util.find_spec('psycopg_pool') is None:
+            raise ImproperlyConfigured("DB_POOL_SIZE needs psycopg 3 with its pool: pip install 'psycopg[binary,pool]'")
+        # The pool keeps the connections; Django must hand each one back after the request
+        options['pool'] = {'min_size': 1, 'max_size': pool_size, 'timeout': 10}
+        config['CONN_MAX_AGE'] = 0
+    config['CONN_HEALTH_CHECKS'] = True
+
+    # Server-side defaults for every session (libpq `options`)
+    timeouts = [
+        f'-c statement_timeout={statement_timeout_ms}',
+        f'-c lock_timeout={lock_timeout_ms}',
+        f'-c idle_in_transaction_session_timeout={idle_timeout_ms}',
+    ]
+    options['options'] = ' '.join(filter(None, [options.get('options', '')] + timeouts))
+
+    config['DISABLE_SERVER_SIDE_CURSORS'] = not server_side_cursors
@@ -0,0 +1,217 @@
+# auto_crm/documents.py
+"""
+Server-side PDFs (invoice, job card, bill of sale) for emailing and archiving.
+
+Each document is rendered from a small dict of the values it prints. The
+SHA-256 of that dict (plus the template version) is the cache key, so a PDF
+is only rendered again when something on it actually changed - editing the
+record, the customer's name, the vehicle, etc. all produce a new key, and
+the stale file for that record is removed when the new one is written.
+
+Month-end runs go through `render_batch()`, which renders on a process pool
+(see `manage.py render_documents`).
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.db.models.functions import Coalesce
+from django.http import HttpResponse
+from django.utils import timezone
+
+from . import pdf_templates
+
+KINDS = tuple(pdf_templates.RENDERERS)
+
+
+# --- 1. CONTEXTS (everything a document prints, as plain strings) ---
+
+def _day(value):
+    return timezone.localtime(value).strftime('%m/%d/%Y') if value else ''
+
+
+def _amount(value):
+    return str(value if value is not None else '0.00')
+
+
+def _service_context(record):
+    vehicle = record.vehicle
+    owner = vehicle.owner
+    return {
+        'id': record.pk,
+        'number': str(record.pk).zfill(6),
+        'date': _day(record.date),
+        'status': record.status,
+        'description': record.description,
+        'customer_name': owner.name,
+        'customer_phone': owner.phone,
+        'license_plate': vehicle.license_plate,
+        'vehicle': " ".join(str(part) for part in (vehicle.year, vehicle.make, vehicle.model) if part),
+    }
+
+
+def invoice_context(record):
+    ctx = _service_context(record)
+    ctx.update({
+        'parts_cost': _amount(record.parts_cost),
+        'labor_cost': _amount(record.labor_cost),
+        'discount': _amount(record.discount),
+        'tax': _amount(record.tax),
+        'subtotal': _amount(record.parts_cost + record.labor_cost - record.discount),
+        'total_cost': _amount(record.total_cost),
+    })
+    return ctx
+
+
+def job_card_context(record):
+    return _service_context(record)
+
+
+def bill_of_sale_context(lead):
+    vehicle = lead.vehicle
+    price = lead.quoted_price if lead.quoted_price is not None else vehicle.selling_price
+    down = lead.down_payment or 0
+    return {
+        'id': lead.pk,
+        'number': str(lead.pk).zfill(6),
+        'date': _day(vehicle.sold_date or lead.created_at),
+        'buyer_name': f"{lead.first_name} {lead.last_name}".strip(),
+        'buyer_phone': lead.phone,
+        'buyer_email': lead.email or '',
+        'vehicle': " ".join(str(part) for part in (vehicle.year, vehicle.make, vehicle.model) if part),
+        'vin': vehicle.vin,
+        'stock_number': vehicle.stock_number,
+        'color': vehicle.color,
+        'price': _amount(price),
+        'down_payment': _amount(down),
+        'amount_financed': _amount(price - down),
+        'term_months': lead.term_months,
+        'monthly_payment': _amount(lead.monthly_payment),
+    }
+
+
+CONTEXTS = {
+    'invoice': invoice_context,
+    'job_card': job_card_context,
+    'bill_of_sale': bill_of_sale_context,
+}
+
+
+# --- 2. CONTENT-HASH CACHE ---
+
+def cache_dir():
+    return Path(getattr(settings, 'DOCUMENT_CACHE_DIR', Path(settings.BASE_DIR) / 'var' / 'documents'))
+
+
+def content_hash(kind, ctx):
+    payload = json.dumps(
+        {'kind': kind, 'version': pdf_templates.TEMPLATE_VERSION, 'ctx': ctx},
+        sort_keys=True, separators=(',', ':'), default=str,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _cache_path(kind, pk, digest):
+    return cache_dir() / kind / str(pk) / f"{digest}.pdf"
+
+
+def _store(path, data):
+    """Atomic write, then drop older versions of the same document."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+    for old in path.parent.glob('*.pdf'):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def get_pdf(kind, obj):
+    """Returns (pdf_bytes, digest), rendering only if this exact content isn't cached."""
+    ctx = CONTEXTS[kind](obj)
+    digest = content_hash(kind, ctx)
+    path = _cache_path(kind, obj.pk, digest)
+
+    if path.exists():
+        return path.read_bytes(), digest
+
+    data = pdf_templates.render(kind, ctx)
+    _store(path, data)
+    return data, digest
+
+
+def pdf_response(kind, obj, filename):
+    data, digest = get_pdf(kind, obj)
+    response = HttpResponse(data, content_type='application/pdf')
+    response['Content-Disposition'] = f'inline; filename="{filename}"'
+    response['X-Document-Hash'] = digest
+    return response
+
+
+# --- 3. MONTH-END BATCH ---
+
+def month_jobs(year, month, kinds=KINDS):
+    """(kind, obj) pairs for every document dated in the given month."""
+    from sales.models import Lead
+    from service.models import ServiceRecord
+
+    start = timezone.make_aware(datetime(year, month, 1))
+    end = timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1))
+
+    records = ServiceRecord.objects.filter(date__gte=start, date__lt=end).select_related('vehicle__owner')
+    if 'invoice' in kinds:
+        for record in records.filter(status='COMPLETED').iterator(chunk_size=500):
+            yield 'invoice', record
+    if 'job_card' in kinds:
+        for record in records.iterator(chunk_size=500):
+            yield 'job_card', record
+    if 'bill_of_sale' in kinds:
+        sold = (
+            Lead.objects.filter(status='SOLD', vehicle__isnull=False)
+            .annotate(sold_on=Coalesce('vehicle__sold_date', 'created_at'))
+            .filter(sold_on__gte=start, sold_on__lt=end)
+            .select_related('vehicle')
+        )
+        for lead in sold.iterator(chunk_size=500):
+            yield 'bill_of_sale', lead
+
+
+def render_batch(jobs, workers=None, chunksize=16):
+    """
+    Renders every (kind, obj) that isn't cached yet.
+    Contexts are built here (one DB pass); only the drawing runs in the pool,
+    since pdf_templates never touches the database.
+    Returns {"rendered": n, "cached": n}.
+    """
+    pending = []
+    cached = 0
+    for kind, obj in jobs:
+        ctx = CONTEXTS[kind](obj)
+        path = _cache_path(kind, obj.pk, content_hash(kind, ctx))
+        if path.exists():
+            cached += 1
+        else:
+            pending.append((kind, ctx, path))
+
+    workers = workers or getattr(settings, 'DOCUMENT_RENDER_WORKERS', os.cpu_count() or 1)
+    kinds = [kind for kind, _, _ in pending]
+    contexts = [ctx for _, ctx, _ in pending]
+
+    if workers > 1 and len(pending) > 1:
+        # Don't let forked workers inherit open DB sockets
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(pdf_templates.render, kinds, contexts, chunksize=chunksize)
+            for (_, _, path), data in zip(pending, results):
+                _store(path, data)
+    else:
+        for kind, ctx, path in pending:
+            _store(path, pdf_templates.render(kind, ctx))
+
+    return {"rendered": len(pending), "cached": cached}
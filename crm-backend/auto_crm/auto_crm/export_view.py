@@ -0,0 +1,60 @@
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from analytics.exports import FORMATS, LEDGERS, export_chunks, export_filename, export_window
+from auto_crm.replica import replica_alias
+from auto_crm.roles import is_manager
+
+
+def _streaming_content(chunks, request):
+    # Under ASGI Django collects a plain iterator into one list before sending
+    # it, so there the chunks are handed over one at a time instead - on the
+    # request's own thread, where the database cursor lives
+    if not isinstance(request, ASGIRequest):
+        return chunks
+
+    async def one_at_a_time():
+        next_chunk = sync_to_async(next, thread_sensitive=True)
+        try:
+            while (chunk := await next_chunk(chunks, None)) is not None:
+                yield chunk
+        finally:
+            await sync_to_async(chunks.close, thread_sensitive=True)()
+
+    return one_at_a_time()
+
+
+class LedgerExportView(APIView):
+    """
+    GET /api/exports/<inventory|sales|leads|service>.<csv|jsonl>
+    ?start=&end= (YYYY-MM-DD, inclusive) &gzip=1 - managers only.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, ledger, file_format):
+        if not is_manager(request.user):
+            return Response({"error": "Access Denied"}, status=status.HTTP_403_FORBIDDEN)
+        if ledger not in LEDGERS or file_format not in FORMATS:
+            return Response(
+                {"error": f"Exports: {', '.join(LEDGERS)} as {' or '.join(FORMATS)}."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            start, end = export_window(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        compress = request.query_params.get('gzip') in ('1', 'true')
+        # The rows are read after this view returns, so the alias is picked now
+        chunks = export_chunks(ledger, file_format, start, end, compress, using=replica_alias())
+        response = StreamingHttpResponse(
+            _streaming_content(chunks, request._request),
+            content_type='application/gzip' if compress else FORMATS[file_format],
+        )
+        filename = export_filename(ledger, file_format, start, end, compress)
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
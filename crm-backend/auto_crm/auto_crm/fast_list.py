@@ -0,0 +1,241 @@
+# auto_crm/fast_list.py
+"""
+Read-only fast path for list endpoints: rows straight from `.values_list()`.
+
+On a long list a ModelSerializer spends most of its time in per-field
+Python work: a model instance per row, then get_attribute() and
+to_representation() for every field. ValuesListMixin.list() instead fetches
+exactly the columns the serializer reads in one query (joins for the
+relations it follows) and builds the same dicts from the tuples:
+
+- columns whose database value already is the representation (text, ints,
+  booleans, choices, foreign key ids, read-only model fields) are copied;
+- datetimes, decimals and file URLs are formatted like their serializer
+  fields do, with the time zone / decimal context looked up once per list
+  rather than per value; anything else goes through the field's own
+  to_representation(), so every format stays the same;
+- nested serializers of a foreign key and dotted sources
+  ('vehicle.owner.name') read the joined columns. A null relation gives None
+  for a nested serializer; a dotted field falls back to its default, None or
+  is left out - as the serializer would do.
+
+Serializers with anything else (method fields, many=True, a custom
+to_representation, sources that aren't columns) are planned as unsupported
+and the list is serialized as before. Only list() is affected.
+"""
+import decimal
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import ISO_8601, serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+SKIP = object()
+
+# Serializer field -> model fields whose database values it outputs unchanged
+PASSTHROUGH = (
+    (serializers.ChoiceField, (models.CharField, models.TextField, models.IntegerField)),
+    (serializers.CharField, (models.CharField, models.TextField)),
+    (serializers.IntegerField, (models.IntegerField, models.AutoField)),
+    (serializers.BooleanField, (models.BooleanField,)),
+)
+
+
+class Unsupported(Exception):
+    pass
+
+
+# --- 1. PLAN (which columns, how to turn them into the representation) ---
+
+def _follow(model, attrs):
+    """The model field at the end of `attrs`, through forward FK / one-to-one hops."""
+    field = None
+    for depth, attr in enumerate(attrs):
+        try:
+            field = model._meta.get_field(attr)
+        except FieldDoesNotExist:
+            raise Unsupported(attr)
+        if not field.concrete or field.many_to_many:
+            raise Unsupported(attr)
+        if depth < len(attrs) - 1:
+            if not field.is_relation:
+                raise Unsupported(attr)
+            model = field.related_model
+    return field
+
+
+def _file_url(field, model_field):
+    # FileField.to_representation() wants the FieldFile, .values() gives its name
+    use_url = getattr(field, 'use_url', api_settings.UPLOADED_FILES_USE_URL)
+    request = field.context.get('request')
+    storage = model_field.storage
+
+    def convert(name):
+        if not name:
+            return None
+        if not use_url:
+            return name
+        url = storage.url(name)
+        return request.build_absolute_uri(url) if request is not None else url
+    return convert
+
+
+def _iso_datetime(field):
+    # DateTimeField.to_representation() with the time zone looked up once, not per value
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+    if output_format is None or output_format.lower() != ISO_8601 or field_timezone is None:
+        return field.to_representation
+
+    def convert(value):
+        if value.utcoffset() is None:
+            return field.to_representation(value)
+        try:
+            value = value.astimezone(field_timezone).isoformat()
+        except OverflowError:
+            return field.to_representation(value)
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _decimal_string(field):
+    # DecimalField.to_representation() with the quantize context built once, not per value
+    coerce_to_string = getattr(field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if (not coerce_to_string or field.localize or getattr(field, 'normalize_output', False)
+            or field.decimal_places is None):
+        return field.to_representation
+
+    context = decimal.getcontext().copy()
+    if field.max_digits is not None:
+        context.prec = field.max_digits
+    exponent = decimal.Decimal('.1') ** field.decimal_places
+
+    def convert(value):
+        if not isinstance(value, decimal.Decimal):
+            return field.to_representation(value)
+        return f'{value.quantize(exponent, rounding=field.rounding, context=context):f}'
+    return convert
+
+
+def _convert(field, model_field):
+    """None to copy the value, else a function of the (non-null) value."""
+    if isinstance(field, serializers.FileField):
+        return _file_url(field, model_field)
+    if isinstance(field, serializers.DateTimeField):
+        return _iso_datetime(field)
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_string(field)
+    if isinstance(field, serializers.ReadOnlyField):
+        return None
+    for field_class, model_classes in PASSTHROUGH:
+        if isinstance(field, field_class):
+            return None if isinstance(model_field, model_classes) else field.to_representation
+    return field.to_representation
+
+
+def _missing(field):
+    """What the serializer outputs when a relation on `field`'s source is null."""
+    if field.default is not empty:
+        if field.default is not None:
+            raise Unsupported(field.field_name)
+        return None
+    if field.allow_null:
+        return None
+    if not field.required:
+        return SKIP
+    raise Unsupported(field.field_name)
+
+
+class Plan:
+    """Columns for .values_list() and the steps that turn a row into the serializer's dict."""
+
+    def __init__(self, serializer):
+        if not isinstance(serializer, serializers.ModelSerializer):
+            raise Unsupported(type(serializer).__name__)
+        self.columns = []
+        self.steps = self._steps(serializer, serializer.Meta.model, [])
+
+    def _column(self, path):
+        lookup = '__'.join(path)
+        if lookup not in self.columns:
+            self.columns.append(lookup)
+        return self.columns.index(lookup)
+
+    def _steps(self, serializer, model, prefix):
+        if type(serializer).to_representation is not serializers.Serializer.to_representation:
+            raise Unsupported(type(serializer).__name__)
+
+        steps = []
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if field.source == '*' or isinstance(field, (serializers.ListSerializer, serializers.ManyRelatedField)):
+                raise Unsupported(field.field_name)
+
+            attrs = field.source_attrs
+            model_field = _follow(model, attrs)
+            # Null check for the relations passed on the way (deepest one covers the rest)
+            guard = self._column(prefix + attrs[:-1]) if len(attrs) > 1 else None
+            missing = _missing(field) if guard is not None else None
+            index = self._column(prefix + attrs)
+
+            if isinstance(field, serializers.Serializer):
+                if not model_field.is_relation:
+                    raise Unsupported(field.field_name)
+                nested = self._steps(field, model_field.related_model, prefix + attrs)
+                steps.append((field.field_name, index, guard, missing, None, nested))
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                if field.pk_field is not None or not model_field.is_relation:
+                    raise Unsupported(field.field_name)
+                steps.append((field.field_name, index, guard, missing, None, None))
+            elif isinstance(field, serializers.RelatedField) or model_field.is_relation:
+                raise Unsupported(field.field_name)
+            else:
+                steps.append((field.field_name, index, guard, missing, _convert(field, model_field), None))
+        return steps
+
+    def represent(self, row, steps=None):
+        ret = {}
+        for name, index, guard, missing, convert, nested in self.steps if steps is None else steps:
+            if guard is not None and row[guard] is None:
+                if missing is not SKIP:
+                    ret[name] = missing
+                continue
+            value = row[index]
+            if value is None:
+                ret[name] = None
+            elif nested is not None:
+                ret[name] = self.represent(row, nested)
+            else:
+                ret[name] = value if convert is None else convert(value)
+        return ret
+
+    def represent_all(self, rows):
+        return [self.represent(row) for row in rows]
+
+
+def plan_for(serializer):
+    """A Plan for this serializer, or None when it has to serialize itself."""
+    try:
+        return Plan(serializer)
+    except Unsupported:
+        return None
+
+
+# --- 2. VIEWSETS ---
+
+class ValuesListMixin:
+    """For ModelViewSets: list() from .values_list() rows when the serializer allows."""
+
+    def list(self, request, *args, **kwargs):
+        plan = plan_for(self.get_serializer())
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = self.filter_queryset(self.get_queryset()).prefetch_related(None).values_list(*plan.columns)
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.represent_all(page))
+        return Response(plan.represent_all(rows))
@@ -1,104 +1,96 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 from inventory.models import Vehicle
-from service.models import ServiceRecord
-from django.db.models import Sum, F
-from django.db.models.functions import TruncMonth
-from django.utils import timezone
-from datetime import timedelta
+from analytics.rollup import report_window, revenue_series, revenue_totals
+from auto_crm.dashboard_view import inventory_value
+from auto_crm.replica import use_replica
+from auto_crm.response_cache import cache_response
+from django.utils.decorators import method_decorator
 
-class FinancialSummaryView(APIView):
-    permission_classes = [IsAuthenticated]
+# --- DATASETS (shared with /api/bootstrap/) ---
 
-    def get(self, request):
-        # --- A. KPI CARDS ---
-        inventory_value = Vehicle.objects.filter(status__in=['AVAILABLE', 'RESERVED']).aggregate(total=Sum('cost_price'))['total'] or 0
-        total_sales = Vehicle.objects.filter(status='SOLD').aggregate(total=Sum('selling_price'))['total'] or 0
-        
-        # Calculate Service Revenue (Parts + Labor)
-        total_service = ServiceRecord.objects.filter(status='COMPLETED').aggregate(
-            total=Sum(F('parts_cost') + F('labor_cost'))
-        )['total'] or 0
-        
-        sold_cars = Vehicle.objects.filter(status='SOLD')
-        sales_profit = 0
-        for car in sold_cars:
-            if car.selling_price and car.cost_price:
-                sales_profit += (car.selling_price - car.cost_price)
+def recent_sales():
+    sales = []
+    for car in Vehicle.objects.filter(status='SOLD').order_by('-sold_date')[:5]:
+        profit = (car.selling_price or 0) - (car.cost_price or 0)
+        margin = 0
+        if car.selling_price and car.selling_price > 0:
+            margin = (profit / car.selling_price) * 100
+            
+        sales.append({
+            "vehicle": f"{car.year} {car.make} {car.model}",
+            "sold_for": car.selling_price,
+            "cost": car.cost_price,
+            "profit": profit,
+            "margin": round(margin, 1)
+        })
+    return sales
 
-        # --- B. MONTHLY DATA (MERGED) ---
-        six_months_ago = timezone.now() - timedelta(days=180)
-        
-        # 1. Get Monthly Sales
-        sales_data = (
-            Vehicle.objects.filter(status='SOLD', created_at__gte=six_months_ago)
-            .annotate(month=TruncMonth('created_at'))
-            .values('month')
-            .annotate(revenue=Sum('selling_price'), cost=Sum('cost_price'))
-            .order_by('month')
-        )
+def financial_summary(inventory_value, totals, series, recent_sales, window):
+    """
+    The /api/financials/ payload from its parts: live stock value,
+    revenue_totals() for the KPI window, revenue_series() for the chart.
+    """
+    start, end, granularity = window
 
-        # 2. Get Monthly Service
-        service_data = (
-            ServiceRecord.objects.filter(status='COMPLETED', date__gte=six_months_ago)
-            .annotate(month=TruncMonth('date'))
-            .values('month')
-            .annotate(revenue=Sum(F('parts_cost') + F('labor_cost')))
-            .order_by('month')
-        )
+    # --- B. CHART (one bar group per period) ---
+    # Service has no cost of goods here, so all of its revenue counts as profit
+    chart_data = [
+        {
+            "period": row['period'],
+            "name": row['name'],
+            "Revenue": row['sales_revenue'] + row['service_revenue'],
+            "Cost": row['sales_cost'],
+            "Profit": row['sales_profit'] + row['service_revenue'],
+        }
+        for row in series
+    ]
 
-        # 3. Merge Them
-        merged_data = {}
+    return {
+        "kpi": {
+            "inventory_value": inventory_value,
+            "total_revenue": totals['sales_revenue'] + totals['service_revenue'],
+            "sales_profit": totals['sales_profit'],
+            "service_revenue": totals['service_revenue'],
+            "sales_count": totals['sales_count'],
+            "service_count": totals['service_count'],
+        },
+        "range": {"start": start, "end": end, "granularity": granularity},
+        "chart_data": chart_data,
+        "recent_sales": recent_sales
+    }
 
-        # Process Sales
-        for entry in sales_data:
-            month_key = entry['month'].strftime("%b") # e.g., "Dec"
-            if month_key not in merged_data:
-                merged_data[month_key] = {"name": month_key, "Revenue": 0, "Cost": 0, "Profit": 0}
-            
-            merged_data[month_key]["Revenue"] += (entry['revenue'] or 0)
-            merged_data[month_key]["Cost"] += (entry['cost'] or 0)
-            merged_data[month_key]["Profit"] += (entry['revenue'] or 0) - (entry['cost'] or 0)
+# --- ENDPOINT ---
 
-        # Process Service (Add to existing months or create new)
-        for entry in service_data:
-            month_key = entry['month'].strftime("%b")
-            if month_key not in merged_data:
-                merged_data[month_key] = {"name": month_key, "Revenue": 0, "Cost": 0, "Profit": 0}
-            
-            svc_rev = (entry['revenue'] or 0)
-            # Service Profit is roughly Revenue - Parts (We treat Labor as profit for this simple view, or strict Revenue)
-            # For this chart, let's add it purely to Revenue and Profit to match KPI
-            merged_data[month_key]["Revenue"] += svc_rev
-            merged_data[month_key]["Profit"] += svc_rev 
+@method_decorator(use_replica, name='get')
+@method_decorator(cache_response('financials'), name='get')
+class FinancialSummaryView(APIView):
+    """
+    GET /api/financials/?start=YYYY-MM-DD&end=YYYY-MM-DD&granularity=day|week|month|year
+
+    Sales and service figures come from the DailyRevenue rollup. The KPIs are
+    all-time unless start/end are given; the chart defaults to the last six
+    months by month.
+    """
+    permission_classes = [IsAuthenticated]
 
-        # Convert back to list and sort (roughly)
-        chart_data = list(merged_data.values())
+    def get(self, request):
+        try:
+            start, end, granularity = report_window(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # --- C. RECENT TRANSACTIONS ---
-        recent_sales = []
-        for car in sold_cars.order_by('-updated_at')[:5]:
-            profit = (car.selling_price or 0) - (car.cost_price or 0)
-            margin = 0
-            if car.selling_price and car.selling_price > 0:
-                margin = (profit / car.selling_price) * 100
-                
-            recent_sales.append({
-                "vehicle": f"{car.year} {car.make} {car.model}",
-                "sold_for": car.selling_price,
-                "cost": car.cost_price,
-                "profit": profit,
-                "margin": round(margin, 1)
-            })
+        # --- A. KPI CARDS ---
+        # Stock on hand is a snapshot, not a daily flow - read it live
+        explicit = request.query_params.get('start') or request.query_params.get('end')
+        totals = revenue_totals(start, end) if explicit else revenue_totals()
 
-        return Response({
-            "kpi": {
-                "inventory_value": inventory_value,
-                "total_revenue": total_sales + total_service,
-                "sales_profit": sales_profit,
-                "service_revenue": total_service
-            },
-            "chart_data": chart_data,
-            "recent_sales": recent_sales
-        })
\ No newline at end of file
+        return Response(financial_summary(
+            inventory_value(),
+            totals,
+            revenue_series(start, end, granularity),
+            recent_sales(),
+            (start, end, granularity),
+        ))
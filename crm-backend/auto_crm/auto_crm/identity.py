@@ -0,0 +1,52 @@
+# auto_crm/identity.py
+import re
+
+from django.conf import settings
+
+NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(raw_phone):
+    """
+    Turns any phone string into an E.164-style key, e.g.
+    "(555) 123-4567" -> "+15551234567". Returns '' if it can't be a phone.
+    """
+    if not raw_phone:
+        return ''
+
+    raw_phone = str(raw_phone).strip()
+    digits = NON_DIGITS.sub('', raw_phone)
+
+    # International format typed by the customer ("+44 ...", "0044 ...")
+    if raw_phone.startswith('+'):
+        pass
+    elif digits.startswith('00'):
+        digits = digits[2:]
+    else:
+        # Local number -> prefix the dealership's country code
+        country_code = getattr(settings, 'PHONE_DEFAULT_COUNTRY_CODE', '1')
+        local_length = getattr(settings, 'PHONE_LOCAL_LENGTH', 10)
+        if len(digits) == local_length + 1 and digits.startswith('0'):
+            digits = digits[1:]  # Trunk prefix, e.g. 0 7911 123456
+        if len(digits) == local_length:
+            digits = country_code + digits
+
+    # E.164 allows at most 15 digits; anything under 7 is not a real number
+    if not 7 <= len(digits) <= 15:
+        return ''
+
+    return f"+{digits}"
+
+
+def normalize_email(raw_email):
+    """Lower-cases and trims an email so it can be compared/deduped."""
+    if not raw_email:
+        return ''
+    return str(raw_email).strip().lower()
+
+
+def normalize_plate(raw_plate):
+    """Same cleaning the plate scanner applies: upper-case letters and digits only."""
+    if not raw_plate:
+        return ''
+    return ''.join(c for c in str(raw_plate) if c.isalnum()).upper()
@@ -0,0 +1,208 @@
+# auto_crm/live.py
+"""
+Live dashboard push: an in-process pub/sub hub feeding the Server-Sent
+Events stream in auto_crm/live_view.py.
+
+publish() is called from ordinary sync code (signal handlers, after commit)
+and fans the event out to every dashboard connected to this process. A
+connection is one asyncio.Queue plus a suspended coroutine on the ASGI
+server's event loop - no thread, a few KB - so one worker holds thousands of
+idle dashboards. (Under WSGI every stream would pin a worker; the Procfile
+runs the ASGI app.)
+
+Events are written by more than one process - every web worker, and
+flush_lead_buffer, which commits the web leads - so by default publish()
+appends the event to LIVE_BROKER_FILE and every web process tails it (a
+local stand-in for a Redis-style broker). Setting LIVE_BROKER_FILE empty
+keeps events inside the process, which only suits a single process doing
+all the writes.
+
+Events: lead, leads (bulk ingest), sale, service, kpi, and resync (the
+client fell too far behind and should reload).
+"""
+import asyncio
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+
+# --- 1. HUB (this process's subscribers) ---
+
+class Hub:
+    def __init__(self, history=256):
+        # Event ids are only meaningful inside one process lifetime
+        self.epoch = os.urandom(4).hex()
+        self._subscribers = {}  # queue -> the event loop it belongs to
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._history = deque(maxlen=history)
+
+    def __len__(self):
+        return len(self._subscribers)
+
+    def subscribe(self):
+        queue = asyncio.Queue(settings.LIVE_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    def dispatch(self, kind, data):
+        """Delivers (id, kind, data) to every local subscriber. Safe from any thread."""
+        with self._lock:
+            event = (next(self._ids), kind, data)
+            self._history.append(event)
+            targets = list(self._subscribers.items())
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(_offer, queue, event)
+            except RuntimeError:
+                # Loop already closed (server shutting down)
+                self.unsubscribe(queue)
+        return event
+
+    def since(self, last_id):
+        """Events after `last_id` still in the history, or None if some were lost."""
+        with self._lock:
+            events = list(self._history)
+        if events and last_id < events[0][0] - 1:
+            return None
+        return [event for event in events if event[0] > last_id]
+
+
+def _offer(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A dashboard that can't keep up: drop its backlog, tell it to reload
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait((event[0], 'resync', {}))
+
+
+hub = Hub()
+
+
+# --- 2. FILE BROKER (several processes) ---
+
+_tail_started = threading.Lock()
+_tailing = False
+
+
+def _append(kind, data):
+    path = settings.LIVE_BROKER_FILE
+    line = json.dumps([kind, data], cls=JSONEncoder) + '\n'
+    try:
+        if os.path.getsize(path) > settings.LIVE_BROKER_MAX_BYTES:
+            os.truncate(path, 0)  # tailers notice the file shrank and start over
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # One O_APPEND write per event, so concurrent publishers never interleave lines
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+def _tail(path):
+    position = os.path.getsize(path) if os.path.exists(path) else 0
+    while True:
+        time.sleep(settings.LIVE_BROKER_POLL_SECONDS)
+        try:
+            size = os.path.getsize(path)
+        except FileNotFoundError:
+            continue
+        if size < position:
+            position = 0
+        if size == position:
+            continue
+        with open(path, 'rb') as f:
+            f.seek(position)
+            chunk = f.read(size - position)
+        # Only whole lines; a half-written one is picked up next time
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        position += len(complete)
+        for line in complete.splitlines():
+            try:
+                kind, data = json.loads(line)
+            except ValueError:
+                continue
+            hub.dispatch(kind, data)
+
+
+def ensure_tailing():
+    """Starts this process's broker reader (once) when a broker file is configured."""
+    global _tailing
+    if not settings.LIVE_BROKER_FILE or _tailing:
+        return
+    with _tail_started:
+        if not _tailing:
+            threading.Thread(target=_tail, args=(settings.LIVE_BROKER_FILE,), daemon=True, name='live-broker').start()
+            _tailing = True
+
+
+# --- 3. PUBLISHING ---
+
+def publish(kind, data):
+    if settings.LIVE_BROKER_FILE:
+        _append(kind, data)
+    else:
+        hub.dispatch(kind, data)
+
+
+def publish_on_commit(kind, data):
+    """publish() once the current transaction commits (right away outside one)."""
+    transaction.on_commit(lambda: publish(kind, data))
+
+
+def current_kpis():
+    from auto_crm.dashboard_view import dashboard_stats
+    today = timezone.localdate()
+    return dashboard_stats(today.replace(day=1), today)
+
+
+_kpi_timer = None
+_kpi_lock = threading.Lock()
+
+
+def _publish_kpis():
+    global _kpi_timer
+    with _kpi_lock:
+        _kpi_timer = None
+    try:
+        publish('kpi', current_kpis())
+    finally:
+        # Timer threads don't go through the request cycle that closes them
+        connections.close_all()
+
+
+def schedule_kpis():
+    """
+    Re-sends the KPI cards shortly after a write. Bursts of writes share one
+    recomputation (LIVE_KPI_DEBOUNCE_SECONDS), and nothing is computed when
+    no dashboard can be listening.
+    """
+    global _kpi_timer
+    if not settings.LIVE_BROKER_FILE and not len(hub):
+        return
+    with _kpi_lock:
+        if _kpi_timer is None:
+            _kpi_timer = threading.Timer(settings.LIVE_KPI_DEBOUNCE_SECONDS, _publish_kpis)
+            _kpi_timer.daemon = True
+            _kpi_timer.start()
+
+
+def schedule_kpis_on_commit():
+    transaction.on_commit(schedule_kpis)
@@ -0,0 +1,172 @@
+# auto_crm/live_view.py
+"""
+GET /api/dashboard/live/ - Server-Sent Events stream for the dashboard.
+
+A bare ASGI app, mounted in front of Django by auto_crm/asgi.py. Django's
+own ASGI handler keeps a thread per in-flight request for its sync parts, so
+a stream served through it would hold a thread for as long as the dashboard
+stays open. Here an open stream is just two coroutines and the queue from
+auto_crm/live.py; database work (token lookup, KPI snapshot) runs briefly on
+the shared thread pool. Run the ASGI server (see Procfile) - locally:
+`uvicorn auto_crm.asgi:application --reload`.
+
+Browsers' EventSource can't send headers, so the token may also come as
+?token=. The stream opens with the current KPI cards, then carries every
+published event. A comment line every LIVE_HEARTBEAT_SECONDS keeps proxies
+from closing idle connections. A reconnecting client sends Last-Event-ID
+and is replayed what it missed, or gets `resync` when that's no longer in
+memory.
+"""
+import asyncio
+import json
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.utils.encoders import JSONEncoder
+
+from auto_crm.authentication import user_for_token
+from auto_crm.live import current_kpis, ensure_tailing, hub
+
+LIVE_PATH = '/api/dashboard/live/'
+
+
+# --- 1. EVENTS ---
+
+def _format(kind, data, event_id=None):
+    lines = [f'id: {hub.epoch}:{event_id}'] if event_id is not None else []
+    lines.append(f'event: {kind}')
+    lines.append('data: ' + json.dumps(data, cls=JSONEncoder))
+    return '\n'.join(lines) + '\n\n'
+
+
+def _last_id(header):
+    """Our event number from a Last-Event-ID header; None if absent, -1 if from another process."""
+    if not header:
+        return None
+    epoch, _, number = header.partition(':')
+    if epoch != hub.epoch or not number.isdigit():
+        return -1
+    return int(number)
+
+
+async def _stream(last_id):
+    queue = hub.subscribe()
+    try:
+        yield f'retry: {settings.LIVE_RETRY_MS}\n\n'
+
+        sent = 0
+        if last_id is None:
+            yield _format('kpi', await _in_thread(current_kpis))
+        else:
+            missed = hub.since(last_id) if last_id >= 0 else None
+            if missed is None:
+                yield _format('resync', {})
+            for event_id, kind, data in missed or []:
+                yield _format(kind, data, event_id)
+                sent = event_id
+
+        while True:
+            try:
+                event_id, kind, data = await asyncio.wait_for(queue.get(), settings.LIVE_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ': ping\n\n'
+                continue
+            if event_id > sent:  # not already replayed above
+                yield _format(kind, data, event_id)
+    finally:
+        hub.unsubscribe(queue)
+
+
+# --- 2. DATABASE (shared thread pool, connection closed like after a request) ---
+
+async def _in_thread(func, *args):
+    def call():
+        try:
+            return func(*args)
+        finally:
+            close_old_connections()
+    return await sync_to_async(call, thread_sensitive=False)()
+
+
+def _user_for_token(key):
+    try:
+        return user_for_token(key)[0]
+    except AuthenticationFailed:
+        return None
+
+
+# --- 3. ASGI APP ---
+
+def _cors_headers(headers):
+    origin = headers.get('origin')
+    if origin and (getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False) or origin in settings.CORS_ALLOWED_ORIGINS):
+        return [(b'access-control-allow-origin', origin.encode()), (b'vary', b'Origin')]
+    return []
+
+
+async def _send_json(send, status, payload, extra_headers=()):
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json'), *extra_headers],
+    })
+    await send({'type': 'http.response.body', 'body': json.dumps(payload).encode()})
+
+
+async def _until_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def live_dashboard(scope, receive, send):
+    headers = {name.decode('latin-1').lower(): value.decode('latin-1') for name, value in scope['headers']}
+    cors = _cors_headers(headers)
+
+    if scope['method'] == 'OPTIONS':
+        # Preflight for clients that send the token as an Authorization header
+        await send({'type': 'http.response.start', 'status': 204, 'headers': cors + [
+            (b'access-control-allow-methods', b'GET'),
+            (b'access-control-allow-headers', b'authorization, last-event-id'),
+        ]})
+        await send({'type': 'http.response.body', 'body': b''})
+        return
+    if scope['method'] != 'GET':
+        await _send_json(send, 405, {"detail": f"Method \"{scope['method']}\" not allowed."}, cors)
+        return
+
+    authorization = headers.get('authorization', '')
+    if authorization.startswith('Token '):
+        key = authorization[6:].strip()
+    else:
+        key = parse_qs(scope.get('query_string', b'').decode()).get('token', [''])[0]
+    user = await _in_thread(_user_for_token, key) if key else None
+    if user is None:
+        await _send_json(send, 401, {"detail": "Authentication credentials were not provided."}, cors)
+        return
+    if len(hub) >= settings.LIVE_MAX_CONNECTIONS:
+        await _send_json(send, 503, {"error": "Too many live connections - try again shortly."}, cors)
+        return
+
+    ensure_tailing()
+    await send({'type': 'http.response.start', 'status': 200, 'headers': cors + [
+        (b'content-type', b'text/event-stream; charset=utf-8'),
+        (b'cache-control', b'no-cache'),
+        (b'x-accel-buffering', b'no'),  # proxies (nginx) must not buffer the stream
+    ]})
+
+    async def pump():
+        async for chunk in _stream(_last_id(headers.get('last-event-id'))):
+            await send({'type': 'http.response.body', 'body': chunk.encode(), 'more_body': True})
+
+    # Runs until the client goes away (or the send fails); cancelling the
+    # pump unsubscribes its queue
+    tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(_until_disconnect(receive))]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
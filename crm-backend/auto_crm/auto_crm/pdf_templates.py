@@ -0,0 +1,320 @@
+# auto_crm/pdf_templates.py
+"""
+PDF layouts for the documents the frontend prints (PrintableInvoice,
+PrintableJobCard, BillOfSale).
+
+Everything here works on plain dicts built by auto_crm/documents.py and never
+touches the ORM, so month-end batches can run these functions in worker
+processes without a database connection.
+"""
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+# Bump when a layout changes so every cached PDF is re-rendered
+TEMPLATE_VERSION = 1
+
+DEALERSHIP = "ApexDrive"
+ADDRESS = "123 Dealership Way, Auto City, CA 90210"
+HOTLINE = "(555) 019-2834"
+
+PAGE_WIDTH, PAGE_HEIGHT = letter
+MARGIN = 54
+BLUE = colors.HexColor('#2563eb')
+SLATE = colors.HexColor('#64748b')
+LIGHT = colors.HexColor('#f1f5f9')
+
+
+def money(value):
+    return f"${float(value or 0):,.2f}"
+
+
+# --- 1. SHARED PIECES ---
+
+def _new_canvas(title):
+    buffer = BytesIO()
+    # invariant=True drops the timestamp/random ID, so the same inputs give
+    # byte-identical files (safe to cache and compare)
+    pdf = canvas.Canvas(buffer, pagesize=letter, invariant=True)
+    pdf.setTitle(title)
+    pdf.setAuthor(DEALERSHIP)
+    return pdf, buffer
+
+
+def _finish(pdf, buffer):
+    pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _header(pdf, title, number, date, subtitle="Automotive Service Center", rule=colors.black):
+    top = PAGE_HEIGHT - MARGIN
+    pdf.setFillColor(colors.black)
+    pdf.setFont('Helvetica-Bold', 26)
+    pdf.drawString(MARGIN, top - 20, DEALERSHIP.upper())
+    pdf.setFont('Helvetica', 9)
+    pdf.setFillColor(SLATE)
+    pdf.drawString(MARGIN, top - 36, subtitle)
+    pdf.drawString(MARGIN, top - 48, ADDRESS)
+
+    right = PAGE_WIDTH - MARGIN
+    pdf.setFillColor(rule)
+    pdf.setFont('Helvetica-Bold', 20)
+    pdf.drawRightString(right, top - 20, title)
+    pdf.setFillColor(colors.black)
+    pdf.setFont('Courier-Bold', 12)
+    pdf.drawRightString(right, top - 38, number)
+    pdf.setFont('Helvetica', 9)
+    pdf.drawRightString(right, top - 52, f"Date: {date}")
+
+    pdf.setStrokeColor(rule)
+    pdf.setLineWidth(3)
+    pdf.line(MARGIN, top - 64, right, top - 64)
+    pdf.setLineWidth(1)
+    return top - 90
+
+
+def _label(pdf, x, y, text):
+    pdf.setFont('Helvetica-Bold', 8)
+    pdf.setFillColor(SLATE)
+    pdf.drawString(x, y, text.upper())
+    pdf.setFillColor(colors.black)
+
+
+def _row(pdf, y, left, right, bold=False, size=10):
+    pdf.setFont('Helvetica-Bold' if bold else 'Helvetica', size)
+    pdf.drawString(MARGIN + 8, y, left)
+    pdf.drawRightString(PAGE_WIDTH - MARGIN - 8, y, right)
+
+
+def _wrap(pdf, text, width, font='Helvetica', size=10):
+    """Greedy word wrap for free-text fields like the job description."""
+    lines = []
+    for paragraph in str(text or '').splitlines() or ['']:
+        line = ''
+        for word in paragraph.split():
+            candidate = f"{line} {word}".strip()
+            if pdf.stringWidth(candidate, font, size) <= width:
+                line = candidate
+            else:
+                if line:
+                    lines.append(line)
+                line = word
+        lines.append(line)
+    return lines
+
+
+def _signatures(pdf, y, left, right):
+    for x, caption in ((MARGIN, left), (PAGE_WIDTH / 2 + 20, right)):
+        pdf.line(x, y, x + 200, y)
+        pdf.setFont('Helvetica', 8)
+        pdf.drawString(x, y - 12, caption.upper())
+
+
+# --- 2. SERVICE INVOICE ---
+
+def render_invoice(ctx):
+    pdf, buffer = _new_canvas(f"Invoice {ctx['number']}")
+    y = _header(pdf, "INVOICE", f"#{ctx['number']}", ctx['date'], rule=BLUE)
+
+    # Bill to
+    pdf.setFillColor(LIGHT)
+    pdf.rect(MARGIN, y - 70, PAGE_WIDTH - 2 * MARGIN, 80, stroke=0, fill=1)
+    pdf.setFillColor(colors.black)
+    _label(pdf, MARGIN + 12, y - 8, "Bill To")
+    pdf.setFont('Helvetica-Bold', 14)
+    pdf.drawString(MARGIN + 12, y - 26, ctx['customer_name'] or "Valued Customer")
+    pdf.setFont('Helvetica', 9)
+    pdf.drawString(MARGIN + 12, y - 40, ctx['customer_phone'])
+    pdf.drawString(MARGIN + 12, y - 54, f"{ctx['license_plate']}  {ctx['vehicle']}")
+    _label(pdf, PAGE_WIDTH - MARGIN - 100, y - 8, "Service ID")
+    pdf.setFont('Courier-Bold', 12)
+    pdf.drawString(PAGE_WIDTH - MARGIN - 100, y - 26, f"#{ctx['id']}")
+    y -= 100
+
+    # Line items
+    _label(pdf, MARGIN + 8, y, "Description")
+    pdf.setFont('Helvetica-Bold', 8)
+    pdf.setFillColor(SLATE)
+    pdf.drawRightString(PAGE_WIDTH - MARGIN - 8, y, "AMOUNT")
+    pdf.setFillColor(colors.black)
+    pdf.line(MARGIN, y - 6, PAGE_WIDTH - MARGIN, y - 6)
+    y -= 24
+
+    _row(pdf, y, "Primary Service Task", "Included", bold=True)
+    for line in _wrap(pdf, ctx['description'], PAGE_WIDTH - 2 * MARGIN - 120, size=9)[:6]:
+        y -= 13
+        pdf.setFont('Helvetica', 9)
+        pdf.drawString(MARGIN + 8, y, line)
+    y -= 24
+    _row(pdf, y, "Parts & Materials", money(ctx['parts_cost']))
+    y -= 22
+    _row(pdf, y, "Labor Charges", money(ctx['labor_cost']))
+    if float(ctx['discount']):
+        y -= 22
+        _row(pdf, y, "Discount", f"-{money(ctx['discount'])}")
+
+    # Totals
+    y -= 40
+    box_x = PAGE_WIDTH / 2
+    pdf.setFillColor(colors.HexColor('#eff6ff'))
+    pdf.rect(box_x, y - 76, PAGE_WIDTH - MARGIN - box_x, 92, stroke=0, fill=1)
+    pdf.setFillColor(colors.black)
+    for offset, caption, value in ((0, "Subtotal", ctx['subtotal']), (20, "Tax", ctx['tax'])):
+        pdf.setFont('Helvetica', 10)
+        pdf.drawString(box_x + 14, y - offset, caption)
+        pdf.drawRightString(PAGE_WIDTH - MARGIN - 14, y - offset, money(value))
+    pdf.setFillColor(colors.HexColor('#1e40af'))
+    pdf.setFont('Helvetica-Bold', 15)
+    pdf.drawString(box_x + 14, y - 56, "Total Due")
+    pdf.drawRightString(PAGE_WIDTH - MARGIN - 14, y - 56, money(ctx['total_cost']))
+    pdf.setFillColor(colors.black)
+
+    # Footer
+    pdf.setFont('Helvetica-Bold', 10)
+    pdf.drawCentredString(PAGE_WIDTH / 2, MARGIN + 30, "Thank you for your business!")
+    pdf.setFont('Helvetica', 8)
+    pdf.drawCentredString(PAGE_WIDTH / 2, MARGIN + 16, "Payment is due upon receipt. Please make checks payable to ApexDrive.")
+    return _finish(pdf, buffer)
+
+
+# --- 3. JOB CARD (SERVICE TICKET) ---
+
+def render_job_card(ctx):
+    pdf, buffer = _new_canvas(f"Service Ticket {ctx['number']}")
+    y = _header(pdf, "SERVICE TICKET", f"#{ctx['number']}", ctx['date'], subtitle=f"Hotline: {HOTLINE}")
+
+    pdf.rect(MARGIN, y - 50, PAGE_WIDTH - 2 * MARGIN, 58)
+    _label(pdf, MARGIN + 10, y - 10, "License Plate")
+    _label(pdf, MARGIN + 180, y - 10, "Make / Model")
+    _label(pdf, MARGIN + 380, y - 10, "Customer")
+    pdf.setFont('Courier-Bold', 16)
+    pdf.drawString(MARGIN + 10, y - 32, ctx['license_plate'])
+    pdf.setFont('Helvetica-Bold', 11)
+    pdf.drawString(MARGIN + 180, y - 32, ctx['vehicle'])
+    pdf.drawString(MARGIN + 380, y - 32, ctx['customer_name'])
+    y -= 84
+
+    pdf.setFont('Helvetica-Bold', 11)
+    pdf.drawString(MARGIN, y, "REQUESTED SERVICES")
+    pdf.setLineWidth(2)
+    pdf.line(MARGIN, y - 5, PAGE_WIDTH - MARGIN, y - 5)
+    pdf.setLineWidth(1)
+    y -= 24
+
+    lines = _wrap(pdf, f"1. {ctx['description']}", PAGE_WIDTH - 2 * MARGIN - 40, size=11)
+    pdf.rect(PAGE_WIDTH - MARGIN - 14, y - 3, 12, 12)
+    for line in lines[:8]:
+        pdf.setFont('Helvetica', 11)
+        pdf.drawString(MARGIN, y, line)
+        y -= 15
+
+    pdf.setDash(3, 3)
+    pdf.setStrokeColor(SLATE)
+    for caption in ("Mechanic Notes:", "Parts Used:", "Labor Hours:"):
+        y -= 36
+        pdf.setFont('Helvetica-Oblique', 9)
+        pdf.setFillColor(SLATE)
+        pdf.drawString(MARGIN, y + 6, caption)
+        pdf.line(MARGIN, y, PAGE_WIDTH - MARGIN, y)
+    pdf.setDash()
+    pdf.setStrokeColor(colors.black)
+    pdf.setFillColor(colors.black)
+
+    _signatures(pdf, MARGIN + 90, "Service Advisor Signature", "Customer Signature")
+    pdf.setFont('Helvetica', 8)
+    pdf.drawCentredString(PAGE_WIDTH / 2, MARGIN + 30,
+                          "Thank you for choosing ApexDrive. Please retain this document for warranty purposes.")
+    return _finish(pdf, buffer)
+
+
+# --- 4. BILL OF SALE ---
+
+def render_bill_of_sale(ctx):
+    pdf, buffer = _new_canvas(f"Bill of Sale {ctx['number']}")
+    y = _header(pdf, "BILL OF SALE", f"#{ctx['number']}", ctx['date'], subtitle=f"ApexDrive Motors - {HOTLINE}")
+
+    box_width = (PAGE_WIDTH - 2 * MARGIN - 20) / 2
+    boxes = (
+        ("Buyer Information", [
+            ("Name", ctx['buyer_name']),
+            ("Phone", ctx['buyer_phone']),
+            ("Email", ctx['buyer_email'] or "N/A"),
+        ]),
+        ("Vehicle Description", [
+            ("Year/Make/Model", ctx['vehicle']),
+            ("VIN", ctx['vin'] or "N/A"),
+            ("Stock #", ctx['stock_number']),
+            ("Color", ctx['color'] or "N/A"),
+        ]),
+    )
+    for index, (title, fields) in enumerate(boxes):
+        x = MARGIN + index * (box_width + 20)
+        pdf.rect(x, y - 90, box_width, 98)
+        pdf.setFillColor(LIGHT)
+        pdf.rect(x, y - 10, box_width, 18, stroke=1, fill=1)
+        pdf.setFillColor(colors.black)
+        pdf.setFont('Helvetica-Bold', 9)
+        pdf.drawString(x + 6, y - 4, title.upper())
+        line_y = y - 28
+        for caption, value in fields:
+            pdf.setFont('Helvetica-Bold', 9)
+            pdf.drawString(x + 6, line_y, f"{caption}:")
+            pdf.setFont('Helvetica', 9)
+            pdf.drawString(x + 100, line_y, str(value)[:40])
+            line_y -= 15
+    y -= 124
+
+    pdf.setFillColor(colors.HexColor('#1f2937'))
+    pdf.rect(MARGIN, y - 4, PAGE_WIDTH - 2 * MARGIN, 20, stroke=0, fill=1)
+    pdf.setFillColor(colors.white)
+    pdf.setFont('Helvetica-Bold', 9)
+    pdf.drawString(MARGIN + 8, y + 2, "FINANCIAL BREAKDOWN")
+    pdf.setFillColor(colors.black)
+    y -= 22
+
+    rows = [
+        ("1. Vehicle Selling Price", money(ctx['price'])),
+        ("2. Down Payment", f"({money(ctx['down_payment'])})"),
+        ("3. Amount Financed (1 - 2)", money(ctx['amount_financed'])),
+        ("4. Term (Months)", str(ctx['term_months'] or "-")),
+    ]
+    for caption, value in rows:
+        _row(pdf, y, caption, value, bold=caption.startswith("3."))
+        pdf.line(MARGIN, y - 7, PAGE_WIDTH - MARGIN, y - 7)
+        y -= 22
+    pdf.rect(MARGIN, y - 8, PAGE_WIDTH - 2 * MARGIN, 24, stroke=0, fill=1)
+    pdf.setFillColor(colors.white)
+    _row(pdf, y, "ESTIMATED MONTHLY PAYMENT", money(ctx['monthly_payment']), bold=True, size=12)
+    pdf.setFillColor(colors.black)
+    y -= 44
+
+    disclaimer = (
+        "By signing below, the Buyer acknowledges receipt of the vehicle described above and agrees that the "
+        "information provided is accurate. This document serves as a preliminary bill of sale and is subject to "
+        "final bank approval. The vehicle is sold \"AS-IS\" unless a separate warranty document is attached. "
+        "ApexDrive Motors is not responsible for any wear and tear occurring after the vehicle leaves the premises."
+    )
+    pdf.setFillColor(SLATE)
+    for line in _wrap(pdf, disclaimer, PAGE_WIDTH - 2 * MARGIN, font='Helvetica-Oblique', size=8):
+        pdf.setFont('Helvetica-Oblique', 8)
+        pdf.drawString(MARGIN, y, line)
+        y -= 11
+    pdf.setFillColor(colors.black)
+
+    _signatures(pdf, MARGIN + 60, "Buyer Signature", "Dealer Representative")
+    return _finish(pdf, buffer)
+
+
+RENDERERS = {
+    'invoice': render_invoice,
+    'job_card': render_job_card,
+    'bill_of_sale': render_bill_of_sale,
+}
+
+
+def render(kind, ctx):
+    """Entry point used by both the request path and the batch worker pool."""
+    return RENDERERS[kind](ctx)
@@ -0,0 +1,71 @@
+# auto_crm/renderers.py
+"""
+JSON rendering through orjson (REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']).
+
+FastJSONRenderer writes the same bytes as DRF's JSONRenderer, several times
+faster on large lists:
+
+- compact separators and UTF-8 output, as with DRF's UNICODE_JSON / COMPACT_JSON;
+- datetimes, dates, times, Decimals, UUIDs... are handed to DRF's own
+  encoder (OPT_PASSTHROUGH_*), so they come out exactly as before;
+- \\u2028 / \\u2029 are escaped like DRF does;
+- orjson spells some floats differently (1e16 vs 1e+16, 0.00001 vs 1e-05):
+  when the output may hold such a number, the response is rendered by DRF
+  instead. So are indented (browsable / ?indent) responses and anything
+  orjson refuses (huge ints, invalid unicode, ...).
+
+One difference is left: NaN / Infinity become null here where DRF's strict
+renderer fails the request.
+
+orjson is optional: without it this is DRF's renderer.
+"""
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson  # optional speed-up (requirements.txt); DRF's json.dumps without it
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+# 'e' starting a positive (16-308) or negative exponent, when a digit precedes it
+EXPONENT = re.compile(rb'e[-123]')
+
+
+def float_spelling_differs(ret):
+    """
+    True if orjson may have written a float json.dumps spells differently:
+    0.00001 for 1e-05, 1e16 / 1.5e-7 for 1e+16 / 1.5e-07 (exponents of
+    16-308 or negative). Text that merely looks like one only costs a DRF render.
+    """
+    if b'0.0000' in ret:
+        return True
+    return any(ret[match.start() - 1:match.start()].isdigit() for match in EXPONENT.finditer(ret))
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or not self.orjson_compatible(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=OPTIONS)
+        except (orjson.JSONEncodeError, TypeError, ValueError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        if float_spelling_differs(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same as DRF: keep the output a strict JavaScript subset
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+    def orjson_compatible(self, accepted_media_type, renderer_context):
+        # orjson only writes compact, non-ASCII-escaped JSON
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        return indent is None and self.compact and not self.ensure_ascii
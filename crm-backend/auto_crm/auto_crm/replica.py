@@ -0,0 +1,215 @@
+# auto_crm/replica.py
+"""
+Read-replica routing for the analytical endpoints (DATABASE_ROUTERS).
+
+With DATABASE_REPLICA_URL set there is a second alias, 'replica'. Reads
+made inside replica_reads() / @use_replica - the dashboard reports, the
+financials, Customer 360, bootstrap datasets - and the exports (which pick
+replica_alias() up front) go there, so long aggregates stop competing with
+the sales floor's and the service bay's writes. Everything else, and every
+write, stays on 'default'. Without a replica this does nothing.
+
+Reads fall back to 'default' when the replica could hand back stale or no data:
+
+- read-your-writes: a request that wrote (any routed model) reads the
+  primary for the rest of the request, and its client - the Authorization
+  header or session cookie - is pinned to the primary for REPLICA_PIN_SECONDS
+  (ReplicaMiddleware). The pin lives in the `responses` cache, so every
+  worker has to see it there: files by default, or the database table;
+  settings.py refuses per-process `locmem` with more than one web worker;
+- lag: the replica is behind by how long ago the oldest activity-log entry
+  it hasn't got yet was written on the primary (activity/log.py records
+  every lead, vehicle, job and appointment change). Checked at most every
+  REPLICA_LAG_CHECK_SECONDS per process; over REPLICA_MAX_LAG_SECONDS, or
+  unreachable, and it is skipped until the next check;
+- inside a transaction on 'default', reads stay with it.
+
+Users, groups, tokens and sessions are always read from the primary - a
+fresh login must work before it has replicated.
+
+Locally: point DATABASE_REPLICA_URL at a second SQLite file and fill it with
+`python manage.py copy_replica` (--loop to keep it a few seconds behind), or
+at a second local Postgres database loaded with pg_dump | psql. Replication
+itself (streaming / logical) is set up outside Django; migrations only run
+on 'default'.
+"""
+import hashlib
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.utils import timezone
+
+REPLICA = 'replica'
+
+# Never from the replica: who is logged in, and the database cache table
+PRIMARY_ONLY_APPS = {'auth', 'authtoken', 'sessions', 'contenttypes', 'admin', 'django_cache'}
+
+logger = logging.getLogger(__name__)
+
+_request = ContextVar('replica_request', default=None)
+_reads = ContextVar('replica_reads', default=False)
+
+# Last lag check in this process
+_health = {'checked': float('-inf'), 'usable': False, 'lag': None}
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+# --- 1. LAG ---
+
+def replica_lag():
+    """
+    Seconds the replica is behind the primary, 0.0 when it has every
+    activity-log entry. Raises DatabaseError when it can't be read.
+    """
+    from activity.models import ActivityEvent  # routers load with the settings, before the apps
+
+    newest = ActivityEvent.objects.using(REPLICA).order_by('-id').values_list('id', flat=True).first() or 0
+    oldest_missing = (
+        ActivityEvent.objects.using(DEFAULT_DB_ALIAS)
+        .filter(id__gt=newest).order_by('id').values_list('at', flat=True).first()
+    )
+    if oldest_missing is None:
+        return 0.0
+    return max((timezone.now() - oldest_missing).total_seconds(), 0.0)
+
+
+def replica_healthy():
+    """Whether the replica was close enough at the last check (re-checked when that's too old)."""
+    now = time.monotonic()
+    if now - _health['checked'] < settings.REPLICA_LAG_CHECK_SECONDS:
+        return _health['usable']
+
+    # Claimed first, so concurrent requests keep the old answer instead of all checking
+    _health['checked'] = now
+    try:
+        lag = replica_lag()
+    except DatabaseError:
+        logger.warning("Read replica unreachable - reading from the primary", exc_info=True)
+        _health.update(usable=False, lag=None)
+        return False
+
+    usable = lag <= settings.REPLICA_MAX_LAG_SECONDS
+    if not usable and _health['usable']:
+        logger.warning("Read replica %.1fs behind - reading from the primary", lag)
+    _health.update(usable=usable, lag=lag)
+    return usable
+
+
+def replica_status():
+    """{configured, usable, lag} as of the last check."""
+    return {'configured': replica_configured(), 'usable': _health['usable'], 'lag': _health['lag']}
+
+
+# --- 2. READ-YOUR-WRITES ---
+
+class RequestState:
+    """What ReplicaMiddleware knows about the request being handled."""
+
+    def __init__(self, client):
+        self.client = client
+        self.wrote = False
+        self._pinned = None
+
+    def pin_key(self):
+        return f'replica:pinned:{self.client}'
+
+    @property
+    def pinned(self):
+        # Looked up on the first routed read only - most requests never make one
+        if self._pinned is None:
+            self._pinned = bool(self.client) and caches['responses'].get(self.pin_key()) is not None
+        return self._pinned
+
+
+def _client(request):
+    credentials = request.META.get('HTTP_AUTHORIZATION') or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    return hashlib.sha1(credentials.encode()).hexdigest() if credentials else None
+
+
+class ReplicaMiddleware:
+    """Pins clients whose request wrote something to the primary for REPLICA_PIN_SECONDS."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        state = RequestState(_client(request))
+        token = _request.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request.reset(token)
+
+        if state.wrote and state.client:
+            caches['responses'].set(state.pin_key(), 1, settings.REPLICA_PIN_SECONDS)
+        return response
+
+
+# --- 3. CHOOSING THE ALIAS ---
+
+def replica_alias():
+    """The alias an analytical read should use right now: 'replica' or 'default'."""
+    if not replica_configured():
+        return DEFAULT_DB_ALIAS
+    state = _request.get()
+    if state is not None and (state.wrote or state.pinned):
+        return DEFAULT_DB_ALIAS
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    return REPLICA if replica_healthy() else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def replica_reads():
+    """Routes the reads made inside to the replica (when replica_alias() allows)."""
+    token = _reads.set(True)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+
+def use_replica(view):
+    """
+    View decorator: replica_reads() around the whole view. For APIView
+    methods use django.utils.decorators.method_decorator.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        with replica_reads():
+            return view(*args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not _reads.get() or model._meta.app_label in PRIMARY_ONLY_APPS:
+            return None
+        return replica_alias()
+
+    def db_for_write(self, model, **hints):
+        # Explicitly the primary: an instance read from the replica is saved there too otherwise
+        state = _request.get()
+        if state is not None and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same rows on both
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return False if db == REPLICA else None
@@ -0,0 +1,204 @@
+# auto_crm/response_cache.py
+"""
+Response cache for the dashboard / report GET endpoints.
+
+Responses are stored per (endpoint, caller's role, query string) in the
+`responses` cache from settings.CACHES - files (default), a database table
+or local memory, picked with RESPONSE_CACHE_BACKEND. The background workers
+write too, so the cache has to be shared by every process: local memory is
+only right for a single one. Every key also carries the
+current *generation*: a write to a Vehicle, Lead or ServiceRecord just sets
+a new generation (see analytics/signals.py), which retires every cached
+report at once without having to know their keys; the old entries age out.
+
+On a miss only one request recomputes a given report. It takes a short lock
+with cache.add(); concurrent requests for the same key wait for its result
+instead of all running the same aggregates at once (cache stampede).
+
+Cached views also answer If-None-Match: the ETag is derived from the
+generation, so a client polling an unchanged report gets 304 without the
+report being looked up or recomputed.
+
+Hits / misses are counted per endpoint in the same cache (cache_stats(),
+GET /api/dashboard/cache/). The file backend has no atomic incr(), so its
+counts are approximate under concurrent requests.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from auto_crm.conditional import add_validator, make_etag, not_modified
+from auto_crm.roles import roles_for
+
+GENERATION_KEY = 'responses:generation'
+NAMESPACES = set()
+
+
+def _cache():
+    return caches['responses']
+
+
+# --- 1. GENERATIONS (invalidation) ---
+
+def generation():
+    cache = _cache()
+    value = cache.get(GENERATION_KEY)
+    if value is None:
+        # First use (or evicted): any fresh value works, it only has to be new
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        value = cache.get(GENERATION_KEY)
+    return value
+
+
+def invalidate():
+    """Retires every cached response."""
+    _cache().set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_on_commit():
+    """invalidate() once the current transaction commits (right away outside one)."""
+    transaction.on_commit(invalidate)
+
+
+# --- 2. METRICS ---
+
+def _count(namespace, outcome):
+    cache = _cache()
+    key = f'responses:stats:{namespace}:{outcome}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr()
+            cache.set(key, 1, timeout=None)
+
+
+def cache_stats():
+    """{namespace: {hits, misses, hit_rate}} since the counters were last reset."""
+    cache = _cache()
+    stats = {}
+    for namespace in sorted(NAMESPACES):
+        hits = cache.get(f'responses:stats:{namespace}:hits', 0)
+        misses = cache.get(f'responses:stats:{namespace}:misses', 0)
+        stats[namespace] = {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 3) if hits + misses else None,
+        }
+    return stats
+
+
+def reset_stats():
+    _cache().delete_many([
+        f'responses:stats:{namespace}:{outcome}'
+        for namespace in NAMESPACES
+        for outcome in ('hits', 'misses')
+    ])
+
+
+# --- 3. LOOKUP (with stampede protection) ---
+
+def response_key(namespace, request):
+    query = sorted((key, value) for key in request.query_params for value in request.query_params.getlist(key))
+    digest = hashlib.sha1(repr(query).encode()).hexdigest()
+    return f'responses:{namespace}:{roles_for(request.user).role}:{generation()}:{digest}'
+
+
+def _get_or_compute(namespace, key, compute, timeout=None):
+    """
+    `compute()` returns (result, data to cache or None). Returns
+    (cached data, True) on a hit, else (result, False).
+    """
+    cache = _cache()
+    data = cache.get(key)
+    if data is not None:
+        _count(namespace, 'hits')
+        return data, True
+
+    lock_timeout = settings.RESPONSE_CACHE_LOCK_SECONDS
+    locked = cache.add(f'{key}:lock', 1, timeout=lock_timeout)
+    if not locked:
+        # Someone else is computing this report - wait for it rather
+        # than run the same queries. If they finish without caching
+        # (error response) or take too long, compute it ourselves.
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            data = cache.get(key)
+            if data is not None:
+                _count(namespace, 'hits')
+                return data, True
+            if cache.get(f'{key}:lock') is None:
+                break
+
+    try:
+        result, data = compute()
+        if data is not None:
+            cache.set(key, data, timeout or settings.RESPONSE_CACHE_SECONDS)
+    finally:
+        if locked:
+            cache.delete(f'{key}:lock')
+
+    _count(namespace, 'misses')
+    return result, False
+
+
+def cached_data(namespace, request, compute, timeout=None):
+    """
+    compute()'s result, cached like cache_response() caches a whole view -
+    for views that mix cacheable datasets with per-user data. Returns
+    (data, hit).
+    """
+    NAMESPACES.add(namespace)
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return compute(), False
+
+    def compute_and_keep():
+        data = compute()
+        return data, data
+    return _get_or_compute(namespace, response_key(namespace, request), compute_and_keep, timeout)
+
+
+# --- 4. VIEW DECORATOR ---
+
+def cache_response(namespace, timeout=None):
+    """
+    Caches a DRF GET view's successful `response.data` under `namespace`.
+    For function views put it under @api_view; for APIView methods use
+    django.utils.decorators.method_decorator.
+    """
+    NAMESPACES.add(namespace)
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view(request, *args, **kwargs)
+
+            # A client that already has this generation's report gets 304 (auto_crm/conditional.py)
+            etag = make_etag(request, namespace, generation())
+            response = not_modified(request, etag)
+            if response is not None:
+                return response
+
+            if settings.RESPONSE_CACHE_ENABLED:
+                def compute():
+                    response = view(request, *args, **kwargs)
+                    return response, (response.data if response.status_code == 200 else None)
+
+                result, hit = _get_or_compute(namespace, response_key(namespace, request), compute, timeout)
+                response = Response(result) if hit else result
+                response['X-Cache'] = 'HIT' if hit else 'MISS'
+            else:
+                response = view(request, *args, **kwargs)
+
+            if response.status_code == 200:
+                add_validator(response, etag)
+            return response
+        return wrapper
+    return decorator
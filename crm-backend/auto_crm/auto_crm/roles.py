@@ -0,0 +1,167 @@
+# auto_crm/roles.py
+"""
+A user's role, group names and permissions, resolved once.
+
+roles_for(user) loads the groups and permissions in two queries, keeps the
+result on the user object for the rest of the request and in the shared
+`responses` cache for ROLE_CACHE_SECONDS, so most requests make no role
+query at all.
+
+Membership and user changes drop the affected users' entries straight away,
+and again once the transaction commits (m2m_changed / post_save /
+post_delete below); a change to what a group may do retires every entry
+through a new generation, like response_cache.py. Entries and generation
+live in the cache every worker reads, so a demoted manager loses the
+manager's rights in all of them at once.
+"""
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+User = get_user_model()
+
+GENERATION_KEY = 'roles:generation'
+
+
+@dataclass(frozen=True)
+class Roles:
+    is_superuser: bool = False
+    groups: frozenset = frozenset()
+    permissions: frozenset = frozenset()  # 'app_label.codename'
+
+    @property
+    def is_manager(self):
+        # Superuser OR in Manager group
+        return self.is_superuser or 'Manager' in self.groups
+
+    @property
+    def is_sales(self):
+        return 'Sales' in self.groups
+
+    @property
+    def role(self):
+        if self.is_manager:
+            return 'manager'
+        if self.is_sales:
+            return 'sales'
+        return 'staff'
+
+    @property
+    def label(self):
+        """As shown in user management."""
+        return {'manager': 'Manager', 'sales': 'Sales', 'staff': 'Staff/Service'}[self.role]
+
+    def has_perm(self, perm):
+        return self.is_superuser or perm in self.permissions
+
+
+def _cache():
+    return caches['responses']
+
+
+# --- 1. RESOLVING ---
+
+def _key(user_id):
+    cache = _cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, time.time_ns(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return f'roles:{generation}:{user_id}'
+
+
+def _load(user):
+    groups = frozenset(user.groups.values_list('name', flat=True))
+    permissions = frozenset(
+        f'{app_label}.{codename}'
+        for app_label, codename in Permission.objects.filter(
+            Q(group__user=user) | Q(user=user)
+        ).values_list('content_type__app_label', 'codename').distinct()
+    )
+    return Roles(user.is_superuser, groups, permissions)
+
+
+def roles_for(user):
+    """The user's Roles - at most once per request, usually from the cache."""
+    if not user.is_authenticated or not user.is_active:
+        return Roles()
+    roles = getattr(user, '_roles', None)
+    if roles is None:
+        key = _key(user.pk)
+        roles = _cache().get(key)
+        if roles is None:
+            roles = _load(user)
+            _cache().set(key, roles, settings.ROLE_CACHE_SECONDS)
+        user._roles = roles
+    return roles
+
+
+def roles_from_groups(user):
+    """Role from already prefetched groups - for lists of users (no permissions)."""
+    return Roles(user.is_superuser, frozenset(group.name for group in user.groups.all()))
+
+
+def is_manager(user):
+    return roles_for(user).is_manager
+
+
+# --- 2. INVALIDATION ---
+
+def _delete(user_ids):
+    _cache().delete_many([_key(user_id) for user_id in user_ids])
+
+
+def forget(user_ids):
+    # Now for this request, and after commit for whatever another worker
+    # loaded from the old rows in between
+    user_ids = list(user_ids)
+    _delete(user_ids)
+    transaction.on_commit(lambda: _delete(user_ids))
+
+
+def _new_generation():
+    _cache().set(GENERATION_KEY, time.time_ns(), timeout=None)
+
+
+def forget_all():
+    _new_generation()
+    transaction.on_commit(_new_generation)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def membership_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear', 'post_clear'):
+        return
+    if not reverse:
+        # user.groups.add(...) / user.user_permissions.clear()
+        if action != 'pre_clear':
+            instance.__dict__.pop('_roles', None)
+            forget([instance.pk])
+    elif action == 'pre_clear':
+        # group.user_set.clear(): the members are only known beforehand
+        forget(instance.user_set.values_list('pk', flat=True))
+    elif action != 'post_clear':
+        forget(pk_set)
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Group)
+def group_changed(sender, **kwargs):
+    forget_all()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    instance.__dict__.pop('_roles', None)
+    forget([instance.pk])
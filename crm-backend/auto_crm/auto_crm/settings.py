@@ -6,6 +6,9 @@ Production-ready for Railway.
 import os
 from pathlib import Path
 import dj_database_url  # <-- Added for Railway Database
+from django.core.exceptions import ImproperlyConfigured
+
+from auto_crm.db_profiles import configure as database_profile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -46,6 +49,11 @@ INSTALLED_APPS = [
     'inventory',
     'sales',
     'service',
+    'customers',
+    'analytics',
+    'notifications',
+    'activity',
+    'sync',
 ]
 
 MIDDLEWARE = [
@@ -56,6 +64,8 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'activity.log.ActorMiddleware',  # who did it, for the activity log
+    'auto_crm.replica.ReplicaMiddleware',  # read-your-writes with a read replica
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -86,13 +96,66 @@ WSGI_APPLICATION = 'auto_crm.wsgi.application'
 # If DATABASE_URL env var exists (Railway), use it.
 # Otherwise, default to local SQLite.
 
+# 'tuned': the SQLite / Postgres profile from auto_crm/db_profiles.py; 'plain': no tuning
+DB_PROFILE = os.environ.get('DB_PROFILE', 'tuned')
+
+# SQLite: seconds a writer waits for the write lock before "database is locked"
+SQLITE_BUSY_TIMEOUT = float(os.environ.get('SQLITE_BUSY_TIMEOUT', 20))
+SQLITE_MMAP_MB = int(os.environ.get('SQLITE_MMAP_MB', 128))
+SQLITE_CACHE_MB = int(os.environ.get('SQLITE_CACHE_MB', 32))
+
+# Postgres: >0 pools up to this many connections per process (psycopg 3), 0 keeps persistent ones
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 0))
+DB_STATEMENT_TIMEOUT_MS = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', 30000))
+DB_LOCK_TIMEOUT_MS = int(os.environ.get('DB_LOCK_TIMEOUT_MS', 10000))
+DB_IDLE_IN_TRANSACTION_TIMEOUT_MS = int(os.environ.get('DB_IDLE_IN_TRANSACTION_TIMEOUT_MS', 60000))
+# True behind PgBouncer in transaction mode (QuerySet.iterator() then reads in chunks client-side)
+DB_DISABLE_SERVER_SIDE_CURSORS = os.environ.get('DB_DISABLE_SERVER_SIDE_CURSORS', 'False') == 'True'
+
+DB_TUNING = dict(
+    sqlite_busy_timeout=SQLITE_BUSY_TIMEOUT,
+    sqlite_mmap_mb=SQLITE_MMAP_MB,
+    sqlite_cache_mb=SQLITE_CACHE_MB,
+    pool_size=DB_POOL_SIZE,
+    statement_timeout_ms=DB_STATEMENT_TIMEOUT_MS,
+    lock_timeout_ms=DB_LOCK_TIMEOUT_MS,
+    idle_timeout_ms=DB_IDLE_IN_TRANSACTION_TIMEOUT_MS,
+    server_side_cursors=not DB_DISABLE_SERVER_SIDE_CURSORS,
+)
+
 DATABASES = {
-    'default': dj_database_url.config(
-        default='sqlite:///db.sqlite3',
-        conn_max_age=600
+    'default': database_profile(
+        dj_database_url.config(
+            default='sqlite:///db.sqlite3',
+            conn_max_age=600
+        ),
+        DB_PROFILE,
+        **DB_TUNING,
     )
 }
 
+# Read replica for the reports, Customer 360 and exports (auto_crm/replica.py).
+# Locally: a second SQLite file kept up to date by `manage.py copy_replica`
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = {
+        **database_profile(dj_database_url.parse(DATABASE_REPLICA_URL, conn_max_age=600), DB_PROFILE, **DB_TUNING),
+        # Tests read the test database through it
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['auto_crm.replica.ReplicaRouter']
+
+# Further behind than this (oldest activity-log entry it is missing), reads go to the primary
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', 10))
+# How often each process measures the lag
+REPLICA_LAG_CHECK_SECONDS = float(os.environ.get('REPLICA_LAG_CHECK_SECONDS', 5))
+# A client that wrote reads from the primary this long (read-your-writes).
+# The default outlasts the worst lag the replica is used with
+REPLICA_PIN_SECONDS = float(os.environ.get(
+    'REPLICA_PIN_SECONDS', REPLICA_MAX_LAG_SECONDS + REPLICA_LAG_CHECK_SECONDS,
+))
+
 
 # ==========================================
 # PASSWORD VALIDATION
@@ -117,6 +180,9 @@ CORS_ALLOWED_ORIGINS = os.environ.get(
     'http://localhost:5173'
 ).split(',')
 
+# Let the frontend read the delta-sync cursor of list responses (sync/delta.py)
+CORS_EXPOSE_HEADERS = ['X-Sync-Cursor']
+
 CSRF_TRUSTED_ORIGINS = os.environ.get(
     'CSRF_TRUSTED_ORIGINS', 
     'http://localhost:5173'
@@ -161,10 +227,231 @@ MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 # ==========================================
 
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        # DRF's JSON output, written by orjson when it is installed
+        'auto_crm.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        # DRF's TokenAuthentication, minus the per-request token lookup
+        'auto_crm.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny', 
     ],
-}
\ No newline at end of file
+}
+
+# ==========================================
+# WEB LEAD INGESTION
+# ==========================================
+
+# Leads posted to /api/sales/ingest/ are spooled here until
+# `python manage.py flush_lead_buffer` moves them into the database. The
+# Procfile's `worker` process reads what `web` writes, so both need the same
+# directory: the same machine, or a volume mounted into both (LIVE_BROKER_FILE too).
+LEAD_INGEST_BUFFER_DIR = os.environ.get('LEAD_INGEST_BUFFER_DIR', os.path.join(BASE_DIR, 'var', 'lead_buffer'))
+
+# Optional shared secret for form/ad-platform webhooks (X-Ingest-Token header)
+LEAD_INGEST_TOKEN = os.environ.get('LEAD_INGEST_TOKEN', '')
+
+# fsync every append (survives power loss, costs throughput)
+LEAD_INGEST_FSYNC = os.environ.get('LEAD_INGEST_FSYNC', 'False') == 'True'
+
+# Same phone/email inside this window counts as a duplicate lead
+LEAD_DEDUPE_WINDOW_MINUTES = int(os.environ.get('LEAD_DEDUPE_WINDOW_MINUTES', 24 * 60))
+
+# Local numbers are stored as +<code><number> (see auto_crm/identity.py)
+PHONE_DEFAULT_COUNTRY_CODE = os.environ.get('PHONE_DEFAULT_COUNTRY_CODE', '1')
+PHONE_LOCAL_LENGTH = int(os.environ.get('PHONE_LOCAL_LENGTH', 10))
+
+
+# ==========================================
+# SERVICE SCHEDULING
+# ==========================================
+
+# How many appointments may run at the same time (service bays)
+SERVICE_BAY_CAPACITY = int(os.environ.get('SERVICE_BAY_CAPACITY', 1))
+
+# Longest allowed appointment. Also bounds the calendar index range scans.
+SERVICE_MAX_APPOINTMENT_HOURS = int(os.environ.get('SERVICE_MAX_APPOINTMENT_HOURS', 72))
+
+
+# ==========================================
+# DOCUMENT RENDERING (PDF)
+# ==========================================
+
+# Rendered invoices / job cards / bills of sale, keyed by content hash
+DOCUMENT_CACHE_DIR = os.environ.get('DOCUMENT_CACHE_DIR', os.path.join(BASE_DIR, 'var', 'documents'))
+
+# Worker processes for `python manage.py render_documents`
+DOCUMENT_RENDER_WORKERS = int(os.environ.get('DOCUMENT_RENDER_WORKERS', os.cpu_count() or 1))
+
+
+# ==========================================
+# AUTHENTICATION & ROLES
+# ==========================================
+
+# How long a user's groups / permissions are reused across requests (kept in
+# the shared `responses` cache, so changes apply at once in every worker)
+ROLE_CACHE_SECONDS = int(os.environ.get('ROLE_CACHE_SECONDS', 60))
+
+# Tokens remembered per worker process, and for how long (logout, deactivation
+# and deletion apply at once everywhere: each hit checks the token's stamp in
+# the shared `responses` cache)
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get('AUTH_TOKEN_CACHE_SIZE', 10000))
+AUTH_TOKEN_CACHE_SECONDS = int(os.environ.get('AUTH_TOKEN_CACHE_SECONDS', 60))
+
+# Tokens older than this are refused and replaced at the next login (0 = never expire)
+AUTH_TOKEN_EXPIRY_SECONDS = int(os.environ.get('AUTH_TOKEN_EXPIRY_SECONDS', 0))
+
+
+# ==========================================
+# RESPONSE CACHE (dashboard / reports)
+# ==========================================
+
+# Where /api/dashboard/stats/, /api/analytics/ and /api/financials/ are cached:
+#   file - shared by all processes on this machine (default); db - a table in
+#   the default database, shared across machines (created by `createcachetable`);
+#   locmem - per process, only correct when a single process does all the
+#   writes: the generation a write bumps (and the ETags built on it) would
+#   otherwise only change in that process - `flush_lead_buffer --loop` and
+#   the other Procfile workers write from processes of their own
+RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'file')
+
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('RESPONSE_CACHE_DIR', os.path.join(BASE_DIR, 'var', 'response_cache')),
+    },
+    'db': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'response_cache',
+    },
+}
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': RESPONSE_CACHE_BACKENDS[RESPONSE_CACHE_BACKEND],
+}
+
+# Web worker processes (gunicorn reads the same variable)
+WEB_CONCURRENCY = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# The read replica's read-your-writes pins live in this cache too: a pin one
+# worker sets must be seen by the worker that serves the client's next request
+if DATABASE_REPLICA_URL and RESPONSE_CACHE_BACKEND == 'locmem' and WEB_CONCURRENCY > 1:
+    raise ImproperlyConfigured(
+        "DATABASE_REPLICA_URL with several web workers needs a shared RESPONSE_CACHE_BACKEND (file or db)"
+    )
+
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE_ENABLED', 'True') == 'True'
+
+# Safety net only - writes invalidate cached responses straight away
+RESPONSE_CACHE_SECONDS = int(os.environ.get('RESPONSE_CACHE_SECONDS', 300))
+
+# How long other requests wait for the one recomputing a missing response
+RESPONSE_CACHE_LOCK_SECONDS = int(os.environ.get('RESPONSE_CACHE_LOCK_SECONDS', 10))
+
+# Threads /api/bootstrap/ runs its independent dashboard queries on (1 = one after another).
+# Overlapping only pays off with a spare core or a database server doing the work.
+BOOTSTRAP_WORKERS = int(os.environ.get('BOOTSTRAP_WORKERS', min(4, os.cpu_count() or 1)))
+
+
+# ==========================================
+# LIVE DASHBOARD (Server-Sent Events)
+# ==========================================
+
+# Open streams per worker process before new ones get a 503
+LIVE_MAX_CONNECTIONS = int(os.environ.get('LIVE_MAX_CONNECTIONS', 10000))
+
+# Keep-alive comment on idle streams (below typical proxy idle timeouts)
+LIVE_HEARTBEAT_SECONDS = int(os.environ.get('LIVE_HEARTBEAT_SECONDS', 20))
+
+# Browser reconnect delay sent to EventSource
+LIVE_RETRY_MS = int(os.environ.get('LIVE_RETRY_MS', 3000))
+
+# Undelivered events held per client before it's told to resync
+LIVE_QUEUE_SIZE = int(os.environ.get('LIVE_QUEUE_SIZE', 100))
+
+# KPI cards are recomputed at most this often while writes keep coming
+LIVE_KPI_DEBOUNCE_SECONDS = float(os.environ.get('LIVE_KPI_DEBOUNCE_SECONDS', 1.0))
+
+# Events are shared between processes through this file: the web workers, and
+# the Procfile workers (flush_lead_buffer commits the web leads) that publish
+# from outside them. Empty = in-process only, for a single process that does
+# all the writing itself
+LIVE_BROKER_FILE = os.environ.get('LIVE_BROKER_FILE', os.path.join(BASE_DIR, 'var', 'live_events.jsonl'))
+LIVE_BROKER_MAX_BYTES = int(os.environ.get('LIVE_BROKER_MAX_BYTES', 10 * 1024 * 1024))
+LIVE_BROKER_POLL_SECONDS = float(os.environ.get('LIVE_BROKER_POLL_SECONDS', 0.25))
+
+
+# ==========================================
+# LEDGER EXPORTS (CSV / JSON Lines)
+# ==========================================
+
+# Rows fetched from the database and written per batch by /api/exports/ and export_ledger
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', 2000))
+
+
+# ==========================================
+# SMS NOTIFICATIONS (outbox + dispatcher)
+# ==========================================
+
+# Who actually sends: notifications.providers.ConsoleProvider prints, FakeProvider keeps them in memory
+SMS_PROVIDER = os.environ.get('SMS_PROVIDER', 'notifications.providers.ConsoleProvider')
+
+# Messages claimed per round by `python manage.py dispatch_sms`, and the send rate (per dispatcher)
+SMS_BATCH_SIZE = int(os.environ.get('SMS_BATCH_SIZE', 50))
+SMS_RATE_PER_SECOND = float(os.environ.get('SMS_RATE_PER_SECOND', 10))
+
+# Retries: base * 2^(attempt-1) seconds, capped, then FAILED after SMS_MAX_ATTEMPTS
+SMS_MAX_ATTEMPTS = int(os.environ.get('SMS_MAX_ATTEMPTS', 6))
+SMS_RETRY_BASE_SECONDS = int(os.environ.get('SMS_RETRY_BASE_SECONDS', 30))
+SMS_RETRY_MAX_SECONDS = int(os.environ.get('SMS_RETRY_MAX_SECONDS', 3600))
+
+# A claimed message is retried by another dispatcher if not recorded within this long
+SMS_SEND_LEASE_SECONDS = int(os.environ.get('SMS_SEND_LEASE_SECONDS', 300))
+
+# Free-service reminders (`python manage.py send_maintenance_reminders`): milestones after the
+# sale, estimated from time since the sale at MAINTENANCE_KM_PER_DAY (no odometer readings later)
+MAINTENANCE_MILESTONES_KM = [5000, 10000, 15000]
+MAINTENANCE_KM_PER_DAY = float(os.environ.get('MAINTENANCE_KM_PER_DAY', 40))
+# Remind cars whose milestone fell due in the last this many days...
+MAINTENANCE_WINDOW_DAYS = int(os.environ.get('MAINTENANCE_WINDOW_DAYS', 60))
+# ...unless they were serviced after (due day - this many days)
+MAINTENANCE_GRACE_DAYS = int(os.environ.get('MAINTENANCE_GRACE_DAYS', 30))
+MAINTENANCE_CHUNK_SIZE = int(os.environ.get('MAINTENANCE_CHUNK_SIZE', 5000))
+MAINTENANCE_BUDGET_SECONDS = float(os.environ.get('MAINTENANCE_BUDGET_SECONDS', 300))
+
+# ==========================================
+# ACTIVITY LOG
+# ==========================================
+
+# `python manage.py prune_activity` deletes routine events (edits, status steps,
+# reschedules) after ACTIVITY_COMPACT_AFTER_DAYS and everything after ACTIVITY_RETENTION_DAYS
+ACTIVITY_COMPACT_AFTER_DAYS = int(os.environ.get('ACTIVITY_COMPACT_AFTER_DAYS', 30))
+ACTIVITY_RETENTION_DAYS = int(os.environ.get('ACTIVITY_RETENTION_DAYS', 365))
+# Ids per DELETE statement
+ACTIVITY_PRUNE_BATCH = int(os.environ.get('ACTIVITY_PRUNE_BATCH', 5000))
+
+# ==========================================
+# DELTA SYNC (?since= on list endpoints)
+# ==========================================
+
+# Deletes are remembered (tombstones) this long; older cursors must reload the full list
+SYNC_TOMBSTONE_DAYS = int(os.environ.get('SYNC_TOMBSTONE_DAYS', 30))
+# Each delta also re-sends rows saved this long before the cursor (slow transactions)
+SYNC_OVERLAP_SECONDS = int(os.environ.get('SYNC_OVERLAP_SECONDS', 10))
+
+# ==========================================
+# CONDITIONAL GET (ETag / 304, auto_crm/conditional.py)
+# ==========================================
+
+# Mixed into every ETag: change it (e.g. to the release id) when a deploy changes response shapes
+ETAG_SALT = os.environ.get('ETAG_SALT', '')
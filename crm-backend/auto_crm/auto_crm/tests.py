@@ -0,0 +1,166 @@
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache, caches
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework import exceptions
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from auto_crm import live, roles
+from auto_crm.authentication import token_cache, user_for_token
+
+User = get_user_model()
+
+
+class RoleQueryCountTests(TestCase):
+    """What resolving the caller's role costs per request (auto_crm/roles.py)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.manager_group = Group.objects.create(name='Manager')
+        cls.sales_group = Group.objects.create(name='Sales')
+        cls.manager = User.objects.create_user('manager', password='x')
+        cls.manager.groups.add(cls.manager_group)
+        cls.clerk = User.objects.create_user('clerk', password='x')
+
+    def setUp(self):
+        cache.clear()
+        caches['responses'].clear()
+        token_cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Token ' + Token.objects.get_or_create(user=user)[0].key)
+        return client
+
+    def test_me_cold_then_cached(self):
+        client = self.client_for(self.manager)
+        # Token + user, then groups and permissions
+        with self.assertNumQueries(3):
+            response = client.get('/api/me/')
+        self.assertTrue(response.json()['is_manager'])
+        # Token and roles both cached
+        with self.assertNumQueries(0):
+            client.get('/api/me/')
+
+    def test_users_list_queries_do_not_grow_with_users(self):
+        client = self.client_for(self.manager)
+        client.get('/api/me/')  # warm the token and role caches
+
+        # The users, then all their groups in one query
+        with self.assertNumQueries(2):
+            response = client.get('/api/users/')
+        self.assertEqual(len(response.json()), 2)
+
+        for n in range(20):
+            user = User.objects.create_user(f'user{n}', password='x')
+            user.groups.add(self.sales_group if n % 2 else self.manager_group)
+        with self.assertNumQueries(2):
+            response = client.get('/api/users/')
+        self.assertEqual(len(response.json()), 22)
+
+    def test_group_membership_change_drops_the_cached_role(self):
+        client = self.client_for(self.clerk)
+        self.assertFalse(client.get('/api/me/').json()['is_manager'])
+        with self.assertNumQueries(0):
+            client.get('/api/me/')
+
+        self.clerk.groups.add(self.manager_group)
+
+        # Only the role is reloaded; the token stays cached
+        with self.assertNumQueries(2):
+            response = client.get('/api/me/')
+        self.assertTrue(response.json()['is_manager'])
+
+        self.clerk.groups.remove(self.manager_group)
+        self.assertFalse(client.get('/api/me/').json()['is_manager'])
+
+    def test_demotion_reaches_every_worker(self):
+        client = self.client_for(self.manager)
+        self.assertTrue(client.get('/api/me/').json()['is_manager'])
+        # Kept where every worker reads it, not in this process's memory
+        key = roles._key(self.manager.pk)
+        self.assertTrue(caches['responses'].get(key).is_manager)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manager.groups.remove(self.manager_group)
+
+        self.assertIsNone(caches['responses'].get(key))
+        self.assertFalse(client.get('/api/me/').json()['is_manager'])
+
+
+
+class TokenRevocationTests(TestCase):
+    """Logout and deactivation reach the token cache of every worker, not just this one."""
+
+    def setUp(self):
+        caches['responses'].clear()
+        token_cache.clear()
+        self.user = User.objects.create_user('clerk', password='x')
+        self.key = Token.objects.create(user=self.user).key
+        self.api = APIClient()
+        self.api.credentials(HTTP_AUTHORIZATION='Token ' + self.key)
+
+    def change_elsewhere(self, change):
+        """Runs `change` while another worker keeps the token entry it loaded before."""
+        user_for_token(self.key)
+        user, token, _, stamp = token_cache._entries[self.key]
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        token_cache.put(self.key, user, token, stamp)
+
+    def test_logout_applies_in_other_workers(self):
+        self.change_elsewhere(lambda: self.assertEqual(self.api.post('/api/logout/').status_code, 204))
+
+        self.assertEqual(self.api.get('/api/me/').status_code, 401)
+        # The live stream authenticates the same way
+        with self.assertRaises(exceptions.AuthenticationFailed):
+            user_for_token(self.key)
+
+    def test_deactivation_applies_in_other_workers(self):
+        def deactivate():
+            self.user.is_active = False
+            self.user.save()
+        self.change_elsewhere(deactivate)
+
+        self.assertEqual(self.api.get('/api/me/').status_code, 401)
+
+    def test_unchanged_token_stays_cached(self):
+        user_for_token(self.key)
+        with self.assertNumQueries(0):
+            self.assertEqual(user_for_token(self.key)[0].pk, self.user.pk)
+
+
+class LiveBrokerTests(SimpleTestCase):
+
+    def test_events_go_through_the_broker_by_default(self):
+        self.assertTrue(settings.LIVE_BROKER_FILE)
+
+    def test_event_published_by_another_process_reaches_a_dashboard(self):
+        broker = os.path.join(tempfile.mkdtemp(), 'live_events.jsonl')
+
+        async def listen():
+            queue = live.hub.subscribe()
+            try:
+                live.ensure_tailing()
+                # What flush_lead_buffer does once a batch of web leads commits
+                await asyncio.to_thread(subprocess.run, [
+                    sys.executable, 'manage.py', 'shell', '-c',
+                    "from auto_crm.live import publish; publish('leads', {'count': 3})",
+                ], cwd=settings.BASE_DIR, env={**os.environ, 'LIVE_BROKER_FILE': broker}, check=True,
+                    capture_output=True)
+                return await asyncio.wait_for(queue.get(), timeout=5)
+            finally:
+                live.hub.unsubscribe(queue)
+
+        live._tailing = False
+        with override_settings(LIVE_BROKER_FILE=broker, LIVE_BROKER_POLL_SECONDS=0.05):
+            _, kind, data = asyncio.run(listen())
+        self.assertEqual((kind, data), ('leads', {'count': 3}))
@@ -5,36 +5,28 @@ from rest_framework import status
 from django.contrib.auth import get_user_model
 from django.shortcuts import get_object_or_404
 from django.contrib.auth.models import Group
+from auto_crm.roles import is_manager, roles_from_groups
 
 User = get_user_model()
 
 class UserManagementView(APIView):
     permission_classes = [IsAuthenticated]
 
-    def is_manager(self, user):
-        # Check if Superuser OR belongs to 'Manager' group
-        return user.is_superuser or user.groups.filter(name='Manager').exists()
-
     def get(self, request):
         # 1. SECURITY CHECK
-        if not self.is_manager(request.user):
+        if not is_manager(request.user):
             return Response({"error": "Access Denied"}, status=403)
 
-        users = User.objects.all().order_by('-date_joined')
+        # All users' groups in one extra query
+        users = User.objects.prefetch_related('groups').order_by('-date_joined')
         data = []
         for u in users:
-            # Determine Role Label based on Group
-            role = "Staff/Service"
-            if u.is_superuser or u.groups.filter(name='Manager').exists():
-                role = "Manager"
-            elif u.groups.filter(name='Sales').exists():
-                role = "Sales"
-
             data.append({
                 "id": u.id,
                 "username": u.username,
                 "email": u.email,
-                "role": role,
+                # Role Label based on Group
+                "role": roles_from_groups(u).label,
                 "date_joined": u.date_joined
             })
 
@@ -42,7 +34,7 @@ class UserManagementView(APIView):
 
     def post(self, request):
         # 1. SECURITY CHECK
-        if not self.is_manager(request.user):
+        if not is_manager(request.user):
             return Response({"error": "Access Denied"}, status=403)
 
         data = request.data
@@ -83,10 +75,7 @@ class UserDetailView(APIView):
 
     def delete(self, request, pk):
         # 1. SECURITY CHECK
-        # Re-use the logic: is_superuser or in Manager group
-        is_manager = request.user.is_superuser or request.user.groups.filter(name='Manager').exists()
-        
-        if not is_manager:
+        if not is_manager(request.user):
             return Response({"error": "Access Denied"}, status=403)
 
         user = get_object_or_404(User, pk=pk)
@@ -0,0 +1,9 @@
+from django.contrib import admin
+from .models import CustomerProfile
+
+@admin.register(CustomerProfile)
+class CustomerProfileAdmin(admin.ModelAdmin):
+    # Derived table - rebuilt from leads/service records, so read-only here
+    list_display = ('name', 'identity_key', 'lifetime_value', 'service_count', 'last_activity')
+    search_fields = ('name', 'identity_key')
+    readonly_fields = [field.name for field in CustomerProfile._meta.fields]
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class CustomersConfig(AppConfig):
+    name = 'customers'
+
+    def ready(self):
+        # Keeps CustomerProfile in sync with Lead / ServiceRecord / Vehicle changes
+        from . import signals  # noqa: F401
@@ -0,0 +1,47 @@
+# customers/links.py
+"""
+Keeps CustomerLink (Lead <-> service Customer) in step with phone_key.
+
+Both sides store the same normalized phone, so "which service customer is
+this lead?" is one indexed join. The link table records the answer (plus any
+manual merges) so the API can follow it in either direction without
+re-normalizing anything.
+"""
+from django.db.models import F
+
+from service.models import Customer
+from sales.models import Lead
+from .models import CustomerLink
+
+
+def link_leads(leads):
+    """Adds PHONE links for these (saved) leads; drops the ones whose number changed."""
+    leads = [lead for lead in leads if lead.pk]
+    if not leads:
+        return
+
+    CustomerLink.objects.filter(lead__in=leads, method='PHONE').exclude(identity_key=F('lead__phone_key')).delete()
+
+    keys = {lead.phone_key for lead in leads if lead.phone_key}
+    customers_by_key = {}
+    for customer_id, key in Customer.objects.filter(phone_key__in=keys).values_list('id', 'phone_key'):
+        customers_by_key.setdefault(key, []).append(customer_id)
+
+    CustomerLink.objects.bulk_create([
+        CustomerLink(lead_id=lead.pk, customer_id=customer_id, identity_key=lead.phone_key, method='PHONE')
+        for lead in leads
+        for customer_id in customers_by_key.get(lead.phone_key, ())
+    ], batch_size=1000, ignore_conflicts=True)
+
+
+def link_customer(customer):
+    """Same as link_leads(), from the service side (new or renumbered Customer)."""
+    CustomerLink.objects.filter(customer=customer, method='PHONE').exclude(identity_key=customer.phone_key).delete()
+    if not customer.phone_key:
+        return
+
+    lead_ids = Lead.objects.filter(phone_key=customer.phone_key).values_list('id', flat=True)
+    CustomerLink.objects.bulk_create([
+        CustomerLink(lead_id=lead_id, customer=customer, identity_key=customer.phone_key, method='PHONE')
+        for lead_id in lead_ids.iterator(chunk_size=2000)
+    ], batch_size=1000, ignore_conflicts=True)
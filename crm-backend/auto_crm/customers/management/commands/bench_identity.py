@@ -0,0 +1,63 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+
+from auto_crm.benchmarks import timed
+from auto_crm.identity import normalize_phone
+from customers.models import CustomerLink
+from sales.models import Lead
+from service.models import Customer
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks matching sales leads to service customers on the existing data: the old "
+        "Python walk over raw phones against the phone_key join and the CustomerLink lookups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sample', type=int, default=200, help="Customers / leads looked up one by one")
+        parser.add_argument('--skip-walk', action='store_true', help="Skip the (slow) Python walk")
+
+    def handle(self, *args, **options):
+        customers = list(Customer.objects.exclude(phone_key='').values_list('id', 'phone_key'))
+        lead_ids = list(Lead.objects.values_list('id', flat=True)[:options['sample'] * 100])
+        if not customers or not lead_ids:
+            raise CommandError("Needs service customers and leads to match.")
+        self.stdout.write(
+            f"{Lead.objects.count()} leads, {len(customers)} customers, {CustomerLink.objects.count()} links"
+        )
+
+        rng = random.Random(34)
+        sample = rng.sample(customers, min(options['sample'], len(customers)))
+        leads = rng.sample(lead_ids, min(options['sample'], len(lead_ids)))
+
+        if not options['skip_walk']:
+            def walk():
+                # Before phone_key: normalize every lead's phone, then every customer's
+                by_phone = {}
+                for lead_id, phone in Lead.objects.values_list('id', 'phone').iterator(chunk_size=5000):
+                    by_phone.setdefault(normalize_phone(phone), []).append(lead_id)
+                return sum(len(by_phone.get(normalize_phone(p), ())) for p in Customer.objects.values_list('phone', flat=True))
+            ms, matches = timed(walk, 1)
+            self.stdout.write(f"{'Python walk, all customers':<36} {ms:9.1f} ms  ({matches} matches)")
+
+        def join():
+            return Lead.objects.filter(phone_key__in=Customer.objects.exclude(phone_key='').values('phone_key')).count()
+        ms, matches = timed(join, 3)
+        self.stdout.write(f"{'phone_key join, all customers':<36} {ms:9.1f} ms  ({matches} matches)")
+
+        rows = [
+            ('customer -> leads via link', len(sample), lambda: [
+                Lead.objects.filter(service_links__customer_id=pk).count() for pk, _ in sample]),
+            ('customer -> leads via phone_key', len(sample), lambda: [
+                Lead.objects.filter(phone_key=key).count() for _, key in sample]),
+            ('lead -> customers via link', len(leads), lambda: [
+                list(Customer.objects.filter(lead_links__lead_id=pk).values_list('id')) for pk in leads]),
+        ]
+        for label, count, lookups in rows:
+            ms, _ = timed(lookups, 3)
+            self.stdout.write(f"{label:<36} {ms / count:9.2f} ms/lookup")
+
+        self.stdout.write("Query plan of customer -> leads via link:")
+        self.stdout.write(Lead.objects.filter(service_links__customer_id=sample[0][0]).explain())
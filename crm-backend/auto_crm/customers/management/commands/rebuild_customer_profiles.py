@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from customers.models import CustomerProfile
+from customers.profiles import rebuild_profiles
+
+
+class Command(BaseCommand):
+    help = "Rebuilds the Customer 360 profile table from leads and service records, in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=2000, help="Identity keys per chunk")
+        parser.add_argument('--if-empty', action='store_true', help="Only run when no profiles exist yet (deploy hook)")
+
+    def handle(self, *args, **options):
+        if options['if_empty'] and CustomerProfile.objects.exists():
+            self.stdout.write("Customer profiles already built - skipping.")
+            return
+
+        started = time.perf_counter()
+        written = 0
+        for written in rebuild_profiles(chunk_size=options['chunk_size']):
+            self.stdout.write(f"  {written} profiles ({time.perf_counter() - started:.1f}s)")
+
+        self.stdout.write(f"Rebuilt {written} customer profiles in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-19 11:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('identity_key', models.CharField(max_length=16, unique=True)),
+                ('name', models.CharField(max_length=101)),
+                ('phone', models.CharField(max_length=20)),
+                ('email', models.EmailField(blank=True, max_length=254, null=True)),
+                ('lead_count', models.PositiveIntegerField(default=0)),
+                ('purchase_count', models.PositiveIntegerField(default=0)),
+                ('service_count', models.PositiveIntegerField(default=0)),
+                ('sales_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('service_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('lifetime_value', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('first_seen', models.DateTimeField(null=True)),
+                ('last_activity', models.DateTimeField(null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-last_activity', 'id'], name='profile_recent_idx'), models.Index(fields=['-lifetime_value', 'id'], name='profile_value_idx'), models.Index(fields=['name', 'id'], name='profile_name_idx')],
+            },
+        ),
+    ]
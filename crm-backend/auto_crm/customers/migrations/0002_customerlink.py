@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 11:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# One set-based INSERT ... SELECT over the two phone_key indexes instead of
+# walking a million leads in Python.
+BACKFILL_LINKS = """
+    INSERT INTO customers_customerlink (lead_id, customer_id, identity_key, method, created_at)
+    SELECT l.id, c.id, l.phone_key, 'PHONE', CURRENT_TIMESTAMP
+    FROM sales_lead l
+    JOIN service_customer c ON c.phone_key = l.phone_key
+    WHERE l.phone_key <> ''
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0001_initial'),
+        ('sales', '0004_lead_phone_key'),
+        ('service', '0008_customer_phone_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CustomerLink',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('identity_key', models.CharField(blank=True, db_index=True, max_length=16)),
+                ('method', models.CharField(choices=[('PHONE', 'Same phone number'), ('MANUAL', 'Linked by staff')], default='PHONE', max_length=10)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('customer', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='lead_links', to='service.customer')),
+                ('lead', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='service_links', to='sales.lead')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['customer', 'lead'], name='link_customer_lead_idx')],
+                'constraints': [models.UniqueConstraint(fields=('lead', 'customer'), name='unique_lead_customer_link')],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_LINKS, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,67 @@
+from django.db import models
+
+
+class CustomerProfile(models.Model):
+    """
+    One row per person across sales and service (the Customer 360 list).
+    Derived data: maintained by customers/profiles.py and rebuilt with
+    `python manage.py rebuild_customer_profiles`. Never edit by hand.
+    """
+    # Normalized phone (+15551234567), same key as Lead.phone_key / service.Customer.phone_key
+    identity_key = models.CharField(max_length=16, unique=True)
+    name = models.CharField(max_length=101)
+    phone = models.CharField(max_length=20)
+    email = models.EmailField(blank=True, null=True)
+
+    lead_count = models.PositiveIntegerField(default=0)
+    purchase_count = models.PositiveIntegerField(default=0)
+    service_count = models.PositiveIntegerField(default=0)
+
+    sales_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    service_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    lifetime_value = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+
+    first_seen = models.DateTimeField(null=True)
+    last_activity = models.DateTimeField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-last_activity', 'id'], name='profile_recent_idx'),
+            models.Index(fields=['-lifetime_value', 'id'], name='profile_value_idx'),
+            models.Index(fields=['name', 'id'], name='profile_name_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.identity_key})"
+
+
+class CustomerLink(models.Model):
+    """
+    Lead (sales) <-> service Customer. PHONE links are kept in sync
+    automatically from the shared phone_key; MANUAL links are added by staff
+    for the same person under different numbers and are never removed
+    automatically.
+    """
+    METHOD_CHOICES = [
+        ('PHONE', 'Same phone number'),
+        ('MANUAL', 'Linked by staff'),
+    ]
+
+    # Indexed by the two composite keys below (both directions are covering)
+    lead = models.ForeignKey('sales.Lead', on_delete=models.CASCADE, related_name='service_links', db_index=False)
+    customer = models.ForeignKey('service.Customer', on_delete=models.CASCADE, related_name='lead_links', db_index=False)
+    identity_key = models.CharField(max_length=16, blank=True, db_index=True)
+    method = models.CharField(max_length=10, choices=METHOD_CHOICES, default='PHONE')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['lead', 'customer'], name='unique_lead_customer_link'),
+        ]
+        indexes = [
+            models.Index(fields=['customer', 'lead'], name='link_customer_lead_idx'),
+        ]
+
+    def __str__(self):
+        return f"Lead {self.lead_id} <-> Customer {self.customer_id} ({self.method})"
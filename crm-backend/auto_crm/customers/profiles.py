@@ -0,0 +1,193 @@
+# customers/profiles.py
+"""
+Builds CustomerProfile rows from the source tables.
+
+A profile is keyed by the normalized phone (`phone_key`) that Lead and
+service.Customer both store and index. Every number on a profile comes from
+grouped aggregates over those indexes, so refreshing one customer costs a
+handful of indexed queries no matter how big the tables are, and the full
+rebuild walks the key space in ranges instead of loading everything.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q, Sum
+
+from sales.models import Lead
+from service.models import Customer, ServiceRecord
+from .models import CustomerProfile
+
+UPDATE_FIELDS = [
+    'name', 'phone', 'email', 'lead_count', 'purchase_count', 'service_count',
+    'sales_value', 'service_value', 'lifetime_value', 'first_seen', 'last_activity', 'updated_at',
+]
+
+
+# --- 1. AGGREGATE ---
+
+def _key_filter(prefix, keys=None, after=None, upto=None):
+    """Same phone_key condition for each source table (Lead, Customer, ServiceRecord)."""
+    lookup = {}
+    if keys is not None:
+        lookup[f'{prefix}phone_key__in'] = keys
+    if after is not None:
+        lookup[f'{prefix}phone_key__gt'] = after
+    if upto is not None:
+        lookup[f'{prefix}phone_key__lte'] = upto
+    return Q(**lookup) & ~Q(**{f'{prefix}phone_key': ''})
+
+
+def build_profiles(**key_range):
+    """
+    Returns {phone_key: CustomerProfile (unsaved)} for every key matched by
+    `keys=[...]` or `after=... / upto=...`.
+    """
+    lead_stats = (
+        Lead.objects.filter(_key_filter('', **key_range))
+        .values('phone_key')
+        .annotate(
+            lead_count=Count('id'),
+            purchase_count=Count('id', filter=Q(status='SOLD', vehicle__isnull=False)),
+            sales_value=Sum('vehicle__selling_price', filter=Q(status='SOLD')),
+            first_seen=Min('created_at'),
+            last_seen=Max('created_at'),
+            latest_id=Max('id'),
+        )
+    )
+    owner_stats = (
+        Customer.objects.filter(_key_filter('', **key_range))
+        .values('phone_key')
+        .annotate(first_seen=Min('created_at'), latest_id=Max('id'))
+    )
+    service_stats = (
+        ServiceRecord.objects.filter(_key_filter('vehicle__owner__', **key_range))
+        .values(key=F('vehicle__owner__phone_key'))
+        .annotate(
+            service_count=Count('id'),
+            service_value=Sum('total_cost', filter=Q(status='COMPLETED')),
+            first_seen=Min('date'),
+            last_seen=Max('date'),
+        )
+    )
+
+    leads = {row['phone_key']: row for row in lead_stats}
+    owners = {row['phone_key']: row for row in owner_stats}
+    services = {row['key']: row for row in service_stats}
+
+    # Display name/phone: the most recent lead, else the service customer
+    lead_names = {
+        key: (f"{first} {last}".strip(), phone, email)
+        for key, first, last, phone, email in Lead.objects.filter(
+            pk__in=[row['latest_id'] for row in leads.values()]
+        ).values_list('phone_key', 'first_name', 'last_name', 'phone', 'email')
+    }
+    owner_names = {
+        key: (name, phone, email)
+        for key, name, phone, email in Customer.objects.filter(
+            pk__in=[row['latest_id'] for row in owners.values()]
+        ).values_list('phone_key', 'name', 'phone', 'email')
+    }
+
+    profiles = {}
+    for key in leads.keys() | owners.keys():
+        lead = leads.get(key, {})
+        service = services.get(key, {})
+        name, phone, email = lead_names.get(key) or owner_names[key]
+        if not email and key in owner_names:
+            email = owner_names[key][2]
+
+        sales_value = lead.get('sales_value') or Decimal('0')
+        service_value = service.get('service_value') or Decimal('0')
+        first_seen = [d for d in (lead.get('first_seen'), owners.get(key, {}).get('first_seen'), service.get('first_seen')) if d]
+        last_seen = [d for d in (lead.get('last_seen'), service.get('last_seen')) if d]
+
+        profiles[key] = CustomerProfile(
+            identity_key=key,
+            name=name[:101],
+            phone=phone,
+            email=email,
+            lead_count=lead.get('lead_count', 0),
+            purchase_count=lead.get('purchase_count', 0),
+            service_count=service.get('service_count', 0),
+            sales_value=sales_value,
+            service_value=service_value,
+            lifetime_value=sales_value + service_value,
+            first_seen=min(first_seen) if first_seen else None,
+            last_activity=max(last_seen) if last_seen else (min(first_seen) if first_seen else None),
+        )
+    return profiles
+
+
+def save_profiles(profiles, batch_size=1000):
+    CustomerProfile.objects.bulk_create(
+        profiles, batch_size=batch_size,
+        update_conflicts=True, unique_fields=['identity_key'], update_fields=UPDATE_FIELDS,
+    )
+
+
+# --- 2. INCREMENTAL REFRESH ---
+
+def refresh_profiles(keys):
+    """Recomputes the profiles for these phone keys (deletes the ones with no data left)."""
+    keys = sorted({key for key in keys if key})
+    if not keys:
+        return
+
+    for start in range(0, len(keys), 500):
+        chunk = keys[start:start + 500]
+        profiles = build_profiles(keys=chunk)
+        with transaction.atomic():
+            save_profiles(list(profiles.values()))
+            CustomerProfile.objects.filter(identity_key__in=chunk).exclude(identity_key__in=profiles).delete()
+
+
+def schedule_refresh(keys):
+    """Refreshes these profiles once the current transaction commits (right away outside one)."""
+    keys = {key for key in keys if key}
+    if keys:
+        transaction.on_commit(lambda: refresh_profiles(keys))
+
+
+# --- 3. FULL REBUILD ---
+
+def _next_keys(model, after, limit):
+    queryset = model.objects.exclude(phone_key='')
+    if after is not None:
+        queryset = queryset.filter(phone_key__gt=after)
+    return list(queryset.order_by('phone_key').values_list('phone_key', flat=True).distinct()[:limit])
+
+
+def rebuild_profiles(chunk_size=2000):
+    """
+    Recomputes every profile, `chunk_size` identity keys at a time, walking
+    the phone_key indexes in order. Yields the running number of profiles
+    written after each chunk so callers can report progress.
+    """
+    after = None
+    written = 0
+    while True:
+        lead_keys = _next_keys(Lead, after, chunk_size)
+        owner_keys = _next_keys(Customer, after, chunk_size)
+
+        # Upper bound of this chunk: the smaller of the two "full page" ends,
+        # so neither table has keys inside the range we haven't looked at
+        ends = [keys[-1] for keys in (lead_keys, owner_keys) if len(keys) == chunk_size]
+        upto = min(ends) if ends else None
+
+        profiles = build_profiles(after=after, upto=upto) if lead_keys or owner_keys else {}
+        with transaction.atomic():
+            save_profiles(list(profiles.values()))
+            # Profiles in this range whose leads/customers are gone
+            stale = CustomerProfile.objects.exclude(identity_key__in=list(profiles))
+            if after is not None:
+                stale = stale.filter(identity_key__gt=after)
+            if upto is not None:
+                stale = stale.filter(identity_key__lte=upto)
+            stale.delete()
+
+        written += len(profiles)
+        yield written
+
+        if upto is None:
+            break
+        after = upto
@@ -0,0 +1,46 @@
+from rest_framework import serializers
+from .models import CustomerProfile, CustomerLink
+
+# 1. DIRECTORY ROW (Customer 360 list)
+class CustomerProfileSerializer(serializers.ModelSerializer):
+    # Numbers, like the old in-memory 360 view returned
+    lifetime_value = serializers.FloatField(read_only=True)
+    sales_value = serializers.FloatField(read_only=True)
+    service_value = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = CustomerProfile
+        fields = [
+            'id', 'identity_key', 'name', 'phone', 'email',
+            'lead_count', 'purchase_count', 'service_count',
+            'sales_value', 'service_value', 'lifetime_value',
+            'first_seen', 'last_activity',
+        ]
+
+# 2. TIMELINE EVENT (one Lead or ServiceRecord on the customer's journey)
+class TimelineEventSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    date = serializers.DateTimeField()
+    status = serializers.CharField()
+    description = serializers.CharField()
+    amount = serializers.FloatField()
+
+# 3. LEAD <-> SERVICE CUSTOMER LINK
+class CustomerLinkSerializer(serializers.ModelSerializer):
+    lead_name = serializers.SerializerMethodField()
+    customer_name = serializers.CharField(source='customer.name', read_only=True)
+
+    class Meta:
+        model = CustomerLink
+        fields = ['id', 'lead', 'customer', 'lead_name', 'customer_name', 'identity_key', 'method', 'created_at']
+        read_only_fields = ['identity_key', 'method']
+
+    def get_lead_name(self, obj):
+        return f"{obj.lead.first_name} {obj.lead.last_name}".strip()
+
+    def create(self, validated_data):
+        # Anything created through the API is a staff merge
+        validated_data['method'] = 'MANUAL'
+        validated_data['identity_key'] = validated_data['lead'].phone_key
+        return super().create(validated_data)
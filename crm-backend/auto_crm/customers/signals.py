@@ -0,0 +1,75 @@
+# customers/signals.py
+"""
+Incremental CustomerProfile maintenance.
+
+For every write to a source row we collect the identity keys it affects
+before the change (pre_save / pre_delete) and after it (post_save), then
+refresh just those profiles when the transaction commits. Looking at both
+sides covers a lead changing phone number, a car moving to a new owner, or a
+sold vehicle being re-priced.
+
+Lead / service.Customer saves also refresh their CustomerLink rows.
+
+bulk_create / queryset.update() skip these signals - callers that use them
+(e.g. sales/ingest.py) call profiles.schedule_refresh() themselves.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import Customer, ServiceRecord, ServiceVehicle
+from .links import link_customer, link_leads
+from .profiles import schedule_refresh
+
+
+def _keys(queryset, field='phone_key'):
+    return set(queryset.values_list(field, flat=True))
+
+
+# Model -> phone keys whose profile depends on the row with this pk
+AFFECTED_KEYS = {
+    Lead: lambda pk: _keys(Lead.objects.filter(pk=pk)),
+    Vehicle: lambda pk: _keys(Lead.objects.filter(vehicle_id=pk, status='SOLD')),
+    Customer: lambda pk: _keys(Customer.objects.filter(pk=pk)),
+    ServiceVehicle: lambda pk: _keys(Customer.objects.filter(vehicles=pk)),
+    ServiceRecord: lambda pk: _keys(Customer.objects.filter(vehicles__history=pk)),
+}
+
+
+def remember_keys(sender, instance, raw=False, **kwargs):
+    # pre_save / pre_delete: what the row pointed at before this write
+    if not raw and instance.pk and not instance._state.adding:
+        instance._profile_keys = AFFECTED_KEYS[sender](instance.pk)
+
+
+def refresh_after_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        before = getattr(instance, '_profile_keys', set())
+        schedule_refresh(before | AFFECTED_KEYS[sender](instance.pk))
+
+
+def refresh_after_delete(sender, instance, **kwargs):
+    schedule_refresh(getattr(instance, '_profile_keys', set()))
+
+
+for model in AFFECTED_KEYS:
+    pre_save.connect(remember_keys, sender=model, dispatch_uid=f'profile-pre-save-{model.__name__}')
+    post_save.connect(refresh_after_save, sender=model, dispatch_uid=f'profile-post-save-{model.__name__}')
+    pre_delete.connect(remember_keys, sender=model, dispatch_uid=f'profile-pre-delete-{model.__name__}')
+    post_delete.connect(refresh_after_delete, sender=model, dispatch_uid=f'profile-post-delete-{model.__name__}')
+
+
+# --- LEAD <-> SERVICE CUSTOMER LINKS ---
+
+def relink_lead(sender, instance, raw=False, **kwargs):
+    if not raw:
+        link_leads([instance])
+
+
+def relink_customer(sender, instance, raw=False, **kwargs):
+    if not raw:
+        link_customer(instance)
+
+
+post_save.connect(relink_lead, sender=Lead, dispatch_uid='link-lead')
+post_save.connect(relink_customer, sender=Customer, dispatch_uid='link-service-customer')
@@ -0,0 +1,116 @@
+# customers/timeline.py
+"""
+One customer's journey (sales leads + service jobs), newest first.
+
+The two tables are merged in the database with UNION ALL over just
+(kind, date, id), ordered and limited there, and paged with a keyset cursor
+on (date, kind, id) instead of OFFSET. Each page is therefore the same three
+small queries - the union page, then the leads and the jobs on that page -
+whether the customer has ten events or ten thousand.
+"""
+import base64
+import json
+
+from django.db import connection
+from django.db.models import CharField, F, Q, Value
+from django.utils.dateparse import parse_datetime
+
+from sales.models import Lead
+from service.models import ServiceRecord
+
+SALE, SERVICE = 'SALE', 'SERVICE'
+
+
+# --- 1. CURSOR ---
+
+def encode_cursor(event):
+    raw = json.dumps([event['date'].isoformat(), event['type'], event['id']])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(token):
+    """Returns (date, kind, id) or raises ValueError."""
+    try:
+        date, kind, pk = json.loads(base64.urlsafe_b64decode(token.encode()))
+        date = parse_datetime(date)
+    except (TypeError, ValueError, json.JSONDecodeError):
+        raise ValueError("Invalid cursor")
+    if date is None or kind not in (SALE, SERVICE):
+        raise ValueError("Invalid cursor")
+    return date, kind, int(pk)
+
+
+def _before(date_field, kind, cursor):
+    """Rows of `kind` that sort after the cursor in (date, kind, id) DESC order."""
+    if cursor is None:
+        return Q()
+    date, cursor_kind, pk = cursor
+    older = Q(**{f'{date_field}__lt': date})
+    if kind < cursor_kind:
+        return older | Q(**{date_field: date})
+    if kind == cursor_kind:
+        return older | Q(**{date_field: date, 'pk__lt': pk})
+    return older
+
+
+# --- 2. EVENTS ---
+
+def sale_event(lead):
+    event = {
+        'type': SALE,
+        'id': lead.pk,
+        'date': lead.created_at,
+        'status': lead.status,
+        'description': f"Interest in {lead.vehicle}" if lead.vehicle else "General Inquiry",
+        'amount': 0,
+    }
+    if lead.status == 'SOLD' and lead.vehicle:
+        event['amount'] = float(lead.vehicle.selling_price)
+        event['description'] = f"Purchased {lead.vehicle.year} {lead.vehicle.model}"
+    return event
+
+
+def service_event(record):
+    return {
+        'type': SERVICE,
+        'id': record.pk,
+        'date': record.date,
+        'status': record.status,
+        'description': f"Service: {record.description}",
+        'amount': float(record.total_cost or 0),
+    }
+
+
+# --- 3. PAGE ---
+
+def timeline_page(identity_key, cursor=None, limit=25):
+    """Returns (events, next_cursor) for one customer."""
+    sales = (
+        Lead.objects.filter(Q(phone_key=identity_key) & _before('created_at', SALE, cursor))
+        .annotate(kind=Value(SALE, output_field=CharField()), event_date=F('created_at'), event_id=F('id'))
+        .values_list('kind', 'event_date', 'event_id')
+    )
+    services = (
+        ServiceRecord.objects.filter(Q(vehicle__owner__phone_key=identity_key) & _before('date', SERVICE, cursor))
+        .annotate(kind=Value(SERVICE, output_field=CharField()), event_date=F('date'), event_id=F('id'))
+        .values_list('kind', 'event_date', 'event_id')
+    )
+
+    ordering = ('-event_date', '-kind', '-event_id')
+    if connection.features.supports_slicing_ordering_in_compound:
+        # Postgres: each side stops after `limit + 1` index entries too
+        sales = sales.order_by(*ordering)[:limit + 1]
+        services = services.order_by(*ordering)[:limit + 1]
+
+    keys = list(sales.union(services, all=True).order_by(*ordering)[:limit + 1])
+    has_more = len(keys) > limit
+    keys = keys[:limit]
+
+    leads = Lead.objects.select_related('vehicle').in_bulk([pk for kind, _, pk in keys if kind == SALE])
+    records = ServiceRecord.objects.in_bulk([pk for kind, _, pk in keys if kind == SERVICE])
+
+    events = [
+        sale_event(leads[pk]) if kind == SALE else service_event(records[pk])
+        for kind, _, pk in keys
+    ]
+    return events, (encode_cursor(events[-1]) if has_more and events else None)
@@ -0,0 +1,11 @@
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import CustomerProfileViewSet, CustomerLinkViewSet
+
+router = DefaultRouter()
+router.register(r'360', CustomerProfileViewSet, basename='customer-360')
+router.register(r'links', CustomerLinkViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+]
@@ -0,0 +1,95 @@
+from urllib.parse import urlencode
+
+from django.utils.decorators import method_decorator
+from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+
+from auto_crm.identity import NON_DIGITS, normalize_phone
+from auto_crm.replica import use_replica
+from .models import CustomerProfile, CustomerLink
+from .serializers import CustomerProfileSerializer, CustomerLinkSerializer, TimelineEventSerializer
+from .timeline import decode_cursor, timeline_page
+
+ORDERINGS = {
+    'recent': ('-last_activity', '-id'),
+    'value': ('-lifetime_value', '-id'),
+    'name': ('name', 'id'),
+}
+
+
+class ProfilePagination(PageNumberPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+# Read-only history: served from the read replica when there is one
+@method_decorator(use_replica, name='dispatch')
+class CustomerProfileViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    GET /api/customers/360/               -> paginated directory (?search=, ?ordering=recent|value|name)
+    GET /api/customers/360/<id>/          -> summary header only (counts, lifetime value, last activity)
+    GET /api/customers/360/<id>/timeline/ -> sales + service events, newest first (?cursor=, ?limit=)
+    """
+    queryset = CustomerProfile.objects.all()
+    serializer_class = CustomerProfileSerializer
+    pagination_class = ProfilePagination
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+
+        search = params.get('search', '').strip()
+        if search:
+            phone_key = normalize_phone(search)
+            digits = NON_DIGITS.sub('', search)
+            if phone_key:
+                # A full phone number is one lookup on the unique identity_key index
+                queryset = queryset.filter(identity_key=phone_key)
+            elif digits and not any(c.isalpha() for c in search):
+                # Part of a number ("123-45")
+                queryset = queryset.filter(identity_key__contains=digits)
+            else:
+                queryset = queryset.filter(name__icontains=search)
+
+        return queryset.order_by(*ORDERINGS.get(params.get('ordering'), ORDERINGS['recent']))
+
+    @action(detail=True, methods=['get'])
+    def timeline(self, request, pk=None):
+        profile = self.get_object()
+        try:
+            cursor = decode_cursor(request.query_params['cursor']) if request.query_params.get('cursor') else None
+            limit = min(max(int(request.query_params.get('limit', 25)), 1), 100)
+        except ValueError as error:
+            return Response({"error": str(error)}, status=400)
+
+        events, next_cursor = timeline_page(profile.identity_key, cursor, limit)
+        next_url = None
+        if next_cursor:
+            next_url = request.build_absolute_uri('?' + urlencode({'limit': limit, 'cursor': next_cursor}))
+        return Response({
+            "next": next_url,
+            "next_cursor": next_cursor,
+            "results": TimelineEventSerializer(events, many=True).data,
+        })
+
+
+class CustomerLinkViewSet(viewsets.ModelViewSet):
+    """
+    GET /api/customers/links/?lead=<id> | ?customer=<id>   -> links for one side (indexed)
+    POST {"lead": id, "customer": id}                       -> manual merge
+    """
+    queryset = CustomerLink.objects.select_related('lead', 'customer')
+    serializer_class = CustomerLinkSerializer
+    http_method_names = ['get', 'post', 'delete', 'head', 'options']
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        if params.get('lead'):
+            queryset = queryset.filter(lead_id=params['lead'])
+        if params.get('customer'):
+            queryset = queryset.filter(customer_id=params['customer'])
+        return queryset.order_by('id')
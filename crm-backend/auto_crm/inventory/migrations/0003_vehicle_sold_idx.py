@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 11:15
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_sold_date(apps, schema_editor):
+    # Cars sold through a lead never got a sold_date; their last edit is the best we know
+    Vehicle = apps.get_model('inventory', 'Vehicle')
+    Vehicle.objects.filter(status='SOLD', sold_date__isnull=True).update(sold_date=F('updated_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_vehicle_created_at_vehicle_sold_date_and_more'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_sold_date, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='vehicle',
+            index=models.Index(fields=['status', 'sold_date'], name='vehicle_sold_idx'),
+        ),
+    ]
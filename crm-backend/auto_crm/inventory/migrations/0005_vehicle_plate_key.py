@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 12:39
+
+from django.db import migrations, models
+
+from auto_crm.identity import normalize_plate
+
+
+def backfill_plate_key(apps, schema_editor):
+    Vehicle = apps.get_model('inventory', 'Vehicle')
+    batch = []
+    for vehicle in Vehicle.objects.only('id', 'license_plate').iterator(chunk_size=2000):
+        vehicle.plate_key = normalize_plate(vehicle.license_plate)
+        batch.append(vehicle)
+        if len(batch) == 2000:
+            Vehicle.objects.bulk_update(batch, ['plate_key'])
+            batch = []
+    Vehicle.objects.bulk_update(batch, ['plate_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_vehicle_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vehicle',
+            name='plate_key',
+            field=models.CharField(blank=True, editable=False, max_length=20),
+        ),
+        migrations.RunPython(backfill_plate_key, migrations.RunPython.noop),
+    ]
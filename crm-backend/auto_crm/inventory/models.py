@@ -1,4 +1,7 @@
 from django.db import models
+from django.utils import timezone
+
+from auto_crm.identity import normalize_plate
 
 class Vehicle(models.Model):
     STATUS_CHOICES = (
@@ -22,6 +25,8 @@ class Vehicle(models.Model):
     color = models.CharField(max_length=30)
     mileage = models.IntegerField(help_text="Current mileage in km")
     license_plate = models.CharField(max_length=20, blank=True, null=True) # For AI Recognition
+    # Normalized plate (ABC123) - how the service side stores it, for matching the two
+    plate_key = models.CharField(max_length=20, blank=True, editable=False)
     
     # Financials
     cost_price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
@@ -40,5 +45,24 @@ class Vehicle(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='AVAILABLE')
     photo = models.ImageField(upload_to='vehicles/', blank=True)
 
+    class Meta:
+        indexes = [
+            # Daily revenue rollup: sales per day, and the most recent sales
+            models.Index(fields=['status', 'sold_date'], name='vehicle_sold_idx'),
+            # Delta sync: rows changed since a cursor (sync/delta.py)
+            models.Index(fields=['updated_at'], name='vehicle_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.plate_key = normalize_plate(self.license_plate)
+        # Every path that sells a car (inventory edit, lead marked SOLD) stamps
+        # the sale date once, so revenue is always reported on the day it happened;
+        # an undone sale clears it so a later re-sale gets its own date
+        if self.status == 'SOLD' and self.sold_date is None:
+            self.sold_date = timezone.now()
+        elif self.status != 'SOLD':
+            self.sold_date = None
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.year} {self.make} {self.model} ({self.stock_number})"
\ No newline at end of file
@@ -1,20 +1,25 @@
 from rest_framework import viewsets, views, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
 from .models import Vehicle
 from .serializers import VehicleSerializer
 from .vin_decoder import decode_vin # Import your function from Step 3
-from django.utils import timezone
+from auto_crm.documents import pdf_response
+from auto_crm.conditional import ConditionalGetMixin
+from auto_crm.fast_list import ValuesListMixin
+from sync.delta import DeltaSyncMixin
 
-class VehicleViewSet(viewsets.ModelViewSet):
+class VehicleViewSet(DeltaSyncMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Vehicle.objects.all()
     serializer_class = VehicleSerializer
 
-    def perform_update(self, serializer):
-        # Check if status is changing to 'SOLD'
-        if self.request.data.get('status') == 'SOLD':
-            serializer.save(sold_date=timezone.now())
-        else:
-            serializer.save()
+    @action(detail=True, methods=['get'], url_path='bill-of-sale')
+    def bill_of_sale(self, request, pk=None):
+        vehicle = self.get_object()
+        lead = vehicle.leads.filter(status='SOLD').order_by('-created_at').first()
+        if vehicle.status != 'SOLD' or lead is None:
+            return Response({"error": "No sale recorded for this vehicle."}, status=status.HTTP_404_NOT_FOUND)
+        return pdf_response('bill_of_sale', lead, f"bill-of-sale-{lead.pk:06d}.pdf")
 
 class VINDecodeView(views.APIView):
     """
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import OutboundSMS
+
+@admin.register(OutboundSMS)
+class OutboundSMSAdmin(admin.ModelAdmin):
+    list_display = ('to', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('to', 'dedupe_key')
+    date_hierarchy = 'created_at'
+    readonly_fields = ('dedupe_key', 'attempts', 'last_error', 'provider_id', 'created_at', 'sent_at')
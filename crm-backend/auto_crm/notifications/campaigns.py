@@ -0,0 +1,134 @@
+# notifications/campaigns.py
+"""
+Maintenance reminders for the free 5k / 10k / 15k services promised in the
+"car sold" SMS (`python manage.py send_maintenance_reminders`).
+
+Nothing records the odometer after a sale, so distance is estimated from the
+time since sold_date at MAINTENANCE_KM_PER_DAY: a milestone is due
+km / KM_PER_DAY days after the sale. For each milestone the candidates are
+the sold cars whose due day fell in the last MAINTENANCE_WINDOW_DAYS - one
+range scan of the (status, sold_date) index - minus, per car and in the same
+query:
+
+- cars already reminded for that milestone (an indexed lookup of the
+  message's dedupe key in the outbox), so a run that stopped early carries
+  on where it left off and re-runs queue nothing twice;
+- cars that came in for service since shortly before the due day
+  (MAINTENANCE_GRACE_DAYS), matched to the service side by normalized
+  license plate (plate_key: "abc-123" in inventory is ABC123 at check-in).
+  Cars sold without a plate can't be matched there, so they skip this check
+  and are reminded.
+
+Candidates are read in keyset-paginated chunks in (sold_date, id) order and
+queued with one bulk insert per chunk, until MAINTENANCE_BUDGET_SECONDS is
+used up.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import CharField, Exists, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Cast, Concat
+from django.utils import timezone
+
+from analytics.rollup import day_start
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import ServiceRecord
+from .models import OutboundSMS
+from .outbox import enqueue_many, outbound_sms
+
+
+def dedupe_key(vehicle_id, km):
+    return f'maintenance:{vehicle_id}:{km}'
+
+
+def reminder_text(first_name, vehicle, km):
+    return (
+        f"Hi {first_name}! 🔧 Your {vehicle} is due for its free {km // 1000}k service at ApexDrive. \n"
+        f"Reply or call us to book a time that suits you."
+    )
+
+
+def due_days(km):
+    return round(km / settings.MAINTENANCE_KM_PER_DAY)
+
+
+# --- 1. CANDIDATES ---
+
+def candidates(km, today=None):
+    """Sold cars due for the `km` service and not yet reminded or serviced, with the buyer's phone."""
+    today = today or timezone.localdate()
+    days = due_days(km)
+    latest = today - timedelta(days=days)
+    earliest = latest - timedelta(days=settings.MAINTENANCE_WINDOW_DAYS)
+
+    buyer = Lead.objects.filter(vehicle=OuterRef('pk'), status='SOLD').exclude(phone='').order_by('-pk')
+    reminded = OutboundSMS.objects.filter(
+        dedupe_key=Concat(Value('maintenance:'), Cast(OuterRef('pk'), CharField()), Value(f':{km}')),
+    )
+    serviced = ServiceRecord.objects.filter(
+        vehicle__plate_key=OuterRef('plate_key'),
+        date__gte=OuterRef('sold_date') + timedelta(days=days - settings.MAINTENANCE_GRACE_DAYS),
+    )
+    return (
+        Vehicle.objects.filter(
+            status='SOLD',
+            sold_date__gte=day_start(earliest),
+            sold_date__lt=day_start(latest + timedelta(days=1)),
+        )
+        # Only a plate can tie the car to a service visit
+        .filter(~Exists(reminded), Q(plate_key='') | ~Exists(serviced))
+        .annotate(
+            phone=Subquery(buyer.values('phone')[:1]),
+            first_name=Subquery(buyer.values('first_name')[:1]),
+        )
+        .filter(phone__isnull=False)
+        .order_by('sold_date', 'pk')
+    )
+
+
+# --- 2. RUN ---
+
+def run_campaign(chunk_size=None, budget_seconds=None, dry_run=False, today=None):
+    """
+    Queues every due reminder (within the time budget). Returns
+    {'queued': n, 'chunks': n, 'complete': bool, 'per_milestone': {km: n}}.
+    """
+    chunk_size = chunk_size or settings.MAINTENANCE_CHUNK_SIZE
+    deadline = time.monotonic() + (budget_seconds or settings.MAINTENANCE_BUDGET_SECONDS)
+    stats = {'queued': 0, 'chunks': 0, 'complete': True, 'per_milestone': {}}
+
+    for km in settings.MAINTENANCE_MILESTONES_KM:
+        stats['per_milestone'][km] = 0
+        queryset = candidates(km, today)
+        after = None
+        while True:
+            if time.monotonic() > deadline:
+                stats['complete'] = False
+                return stats
+
+            page = queryset
+            if after is not None:
+                page = page.filter(Q(sold_date__gt=after[0]) | Q(sold_date=after[0], pk__gt=after[1]))
+            rows = list(page.values_list('sold_date', 'pk', 'phone', 'first_name', 'year', 'make', 'model')[:chunk_size])
+            if not rows:
+                break
+
+            messages = [
+                outbound_sms(
+                    phone,
+                    reminder_text(first_name, f"{year or ''} {make} {model}".strip() or 'car', km),
+                    kind='maintenance',
+                    dedupe_key=dedupe_key(pk, km),
+                )
+                for _, pk, phone, first_name, year, make, model in rows
+            ]
+            if not dry_run:
+                enqueue_many(messages)
+            stats['queued'] += len(messages)
+            stats['per_milestone'][km] += len(messages)
+            stats['chunks'] += 1
+            after = rows[-1][:2]
+
+    return stats
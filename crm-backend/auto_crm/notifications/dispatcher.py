@@ -0,0 +1,122 @@
+# notifications/dispatcher.py
+"""
+Sends the SMS outbox (`python manage.py dispatch_sms --loop`).
+
+Each round claims up to SMS_BATCH_SIZE due messages, sends them through the
+provider in its batch size, paced by a token bucket (SMS_RATE_PER_SECOND),
+and records the outcome:
+
+- sent: SENT, with the provider's message id;
+- SMSError: retried after SMS_RETRY_BASE_SECONDS * 2^(attempt-1) (capped at
+  SMS_RETRY_MAX_SECONDS, with jitter), FAILED after SMS_MAX_ATTEMPTS;
+- PermanentSMSError: FAILED straight away.
+
+Claiming pushes next_attempt_at SMS_SEND_LEASE_SECONDS ahead, so messages
+held by a dispatcher that died are picked up again after the lease. Rows are
+claimed with SELECT ... FOR UPDATE SKIP LOCKED where the database has it, so
+several dispatchers never take the same message. A message may still go out
+twice if a dispatcher dies between sending and recording; the provider gets
+an idempotency key (`sms-<id>`) to drop the repeat.
+"""
+import random
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import OutboundSMS
+from .providers import PermanentSMSError, get_provider
+
+
+class TokenBucket:
+    """Allows `rate` sends per second on average, bursts up to `rate`."""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self, count=1):
+        # A batch larger than the bucket goes into debt and waits it off,
+        # rather than waiting for `count` tokens the bucket can never hold
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate) - count
+            self._updated = now
+            if self._tokens < 0:
+                time.sleep(-self._tokens / self.rate)
+
+
+# --- 1. CLAIMING ---
+
+def claim(batch_size):
+    """Takes up to `batch_size` due messages for this dispatcher (oldest due first)."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutboundSMS.objects.select_for_update(skip_locked=True)
+            .filter(status='PENDING', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('id', flat=True)[:batch_size]
+        )
+        OutboundSMS.objects.filter(id__in=ids).update(
+            next_attempt_at=now + timedelta(seconds=settings.SMS_SEND_LEASE_SECONDS),
+            attempts=F('attempts') + 1,
+        )
+    return list(OutboundSMS.objects.filter(id__in=ids).order_by('id'))
+
+
+def retry_delay(attempts):
+    delay = min(settings.SMS_RETRY_BASE_SECONDS * 2 ** (attempts - 1), settings.SMS_RETRY_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+# --- 2. SENDING ---
+
+def _record(message, result, now):
+    if not isinstance(result, Exception):
+        message.status = 'SENT'
+        message.sent_at = now
+        message.provider_id = str(result)
+        message.last_error = ''
+        return 'sent'
+
+    message.last_error = str(result) or type(result).__name__
+    if isinstance(result, PermanentSMSError) or message.attempts >= settings.SMS_MAX_ATTEMPTS:
+        message.status = 'FAILED'
+        return 'failed'
+    message.next_attempt_at = now + retry_delay(message.attempts)
+    return 'retried'
+
+
+def dispatch_batch(provider=None, bucket=None, batch_size=None):
+    """
+    Claims and sends one batch. Returns {'sent': n, 'retried': n, 'failed': n};
+    all zero when nothing is due.
+    """
+    provider = provider or get_provider()
+    bucket = bucket or TokenBucket(settings.SMS_RATE_PER_SECOND)
+    counts = {'sent': 0, 'retried': 0, 'failed': 0}
+
+    messages = claim(batch_size or settings.SMS_BATCH_SIZE)
+    for i in range(0, len(messages), provider.max_batch):
+        group = messages[i:i + provider.max_batch]
+        bucket.take(len(group))
+        try:
+            results = provider.send_batch(group)
+        except Exception as e:
+            # The whole call failed (connection refused, bad credentials...)
+            results = [e] * len(group)
+
+        now = timezone.now()
+        for message, result in zip(group, results):
+            counts[_record(message, result, now)] += 1
+        OutboundSMS.objects.bulk_update(
+            group, ['status', 'sent_at', 'provider_id', 'last_error', 'next_attempt_at'],
+        )
+    return counts
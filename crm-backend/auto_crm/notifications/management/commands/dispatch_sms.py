@@ -0,0 +1,31 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from notifications.dispatcher import TokenBucket, dispatch_batch
+from notifications.providers import get_provider
+
+
+class Command(BaseCommand):
+    help = "Sends queued SMS from the outbox (batched, rate limited, retried with backoff)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep sending until stopped (worker mode)")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds to wait when nothing is due in --loop mode")
+        parser.add_argument('--batch-size', type=int, default=None, help="Messages claimed per round (default: SMS_BATCH_SIZE)")
+
+    def handle(self, *args, **options):
+        provider = get_provider()
+        # One bucket for the whole run, so the rate holds across batches
+        bucket = TokenBucket(settings.SMS_RATE_PER_SECOND)
+
+        while True:
+            counts = dispatch_batch(provider, bucket, options['batch_size'])
+            if any(counts.values()):
+                self.stdout.write(f"Sent {counts['sent']} SMS ({counts['retried']} to retry, {counts['failed']} failed)")
+                continue  # more may be due right away
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
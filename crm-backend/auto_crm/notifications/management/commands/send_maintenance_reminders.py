@@ -0,0 +1,31 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.campaigns import run_campaign
+
+
+class Command(BaseCommand):
+    help = "Queues free-service reminders (5k/10k/15k) for sold cars that are due, within a time budget."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Run again every --interval seconds (worker mode)")
+        parser.add_argument('--interval', type=float, default=3600.0, help="Seconds between runs in --loop mode")
+        parser.add_argument('--chunk-size', type=int, default=None, help="Cars per chunk (default: MAINTENANCE_CHUNK_SIZE)")
+        parser.add_argument('--budget', type=float, default=None, help="Seconds per run (default: MAINTENANCE_BUDGET_SECONDS)")
+        parser.add_argument('--dry-run', action='store_true', help="Count who is due without queueing anything")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            stats = run_campaign(options['chunk_size'], options['budget'], options['dry_run'])
+            milestones = ', '.join(f"{km // 1000}k: {count}" for km, count in stats['per_milestone'].items())
+            self.stdout.write(
+                f"{'Would queue' if options['dry_run'] else 'Queued'} {stats['queued']} reminders "
+                f"({milestones}) in {stats['chunks']} chunks, {time.perf_counter() - started:.1f}s"
+                + ("" if stats['complete'] else " - time budget used up, the next run continues")
+            )
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
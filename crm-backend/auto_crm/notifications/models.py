@@ -0,0 +1,41 @@
+from django.db import models
+
+
+class OutboundSMS(models.Model):
+    """
+    The SMS outbox. Rows are written in the same transaction as the change
+    that triggers them (notifications/outbox.py) and sent later by
+    `python manage.py dispatch_sms` (notifications/dispatcher.py), so a
+    request never waits on - or fails because of - the SMS provider.
+    """
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    to = models.CharField(max_length=20)
+    body = models.TextField()
+    # e.g. 'lead-sold', 'service-completed'
+    kind = models.CharField(max_length=50, blank=True)
+    # Same key = same message: enqueueing it again is a no-op
+    dedupe_key = models.CharField(max_length=100, unique=True, null=True, blank=True)
+
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    # Due time while PENDING; pushed forward while a dispatcher holds it and on retry
+    next_attempt_at = models.DateTimeField()
+    last_error = models.TextField(blank=True)
+    provider_id = models.CharField(max_length=100, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # The dispatcher's "what is due" scan
+            models.Index(fields=['status', 'next_attempt_at'], name='sms_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind or 'sms'} to {self.to} ({self.status})"
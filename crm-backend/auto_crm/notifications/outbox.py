@@ -0,0 +1,36 @@
+# notifications/outbox.py
+"""
+Queueing SMS: enqueue_sms() adds a row to the OutboundSMS outbox instead of
+calling the provider. Call it inside the transaction that makes the change
+the message is about - the message then exists exactly when that change
+commits - and `python manage.py dispatch_sms` sends it shortly after.
+"""
+from django.utils import timezone
+
+from .models import OutboundSMS
+
+
+def outbound_sms(to, body, kind='', dedupe_key=None, send_at=None):
+    """An unsaved outbox row (for enqueue_many())."""
+    return OutboundSMS(
+        to=to,
+        body=body,
+        kind=kind,
+        dedupe_key=dedupe_key,
+        next_attempt_at=send_at or timezone.now(),
+    )
+
+
+def enqueue_many(messages, batch_size=1000):
+    """
+    Inserts outbox rows in bulk. Rows whose dedupe_key is already in the
+    outbox (queued, sent or failed) are skipped, so enqueueing is idempotent.
+    """
+    OutboundSMS.objects.bulk_create(messages, batch_size=batch_size, ignore_conflicts=True)
+
+
+def enqueue_sms(to, body, kind='', dedupe_key=None, send_at=None):
+    """Queues one SMS; no-op without a phone number or when `dedupe_key` was queued before."""
+    if not to:
+        return
+    enqueue_many([outbound_sms(to, body, kind, dedupe_key, send_at)])
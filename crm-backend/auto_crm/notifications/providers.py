@@ -0,0 +1,92 @@
+# notifications/providers.py
+"""
+SMS providers. settings.SMS_PROVIDER names the one the dispatcher uses:
+
+- ConsoleProvider (default): prints the message to the server console.
+- FakeProvider: keeps messages in memory and can be told to fail - for
+  tests and local runs of the dispatcher.
+
+A real gateway (Twilio, SNS, ...) subclasses SMSProvider and implements
+send(), or send_batch() when its API takes several messages per call.
+"""
+import itertools
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class SMSError(Exception):
+    """Sending failed but may work later (timeout, 5xx, throttled) - retried with backoff."""
+
+
+class PermanentSMSError(SMSError):
+    """Will never work (invalid number, opted out) - the message is marked FAILED."""
+
+
+class SMSProvider:
+    # Messages per provider call
+    max_batch = 1
+
+    def send(self, to, body, idempotency_key):
+        """Sends one message; returns the provider's message id or raises SMSError."""
+        raise NotImplementedError
+
+    def send_batch(self, messages):
+        """
+        `messages`: OutboundSMS rows. Returns one result per message, in
+        order: the provider's message id, or the SMSError it failed with.
+        """
+        results = []
+        for message in messages:
+            try:
+                results.append(self.send(message.to, message.body, f'sms-{message.pk}'))
+            except SMSError as e:
+                results.append(e)
+        return results
+
+
+class ConsoleProvider(SMSProvider):
+    """No real texts: prints what would have been sent."""
+
+    def send(self, to, body, idempotency_key):
+        print("\n" + "="*40)
+        print(f"📱 [SMS SENT] to {to}")
+        print(f"💬 MESSAGE: {body}")
+        print("="*40 + "\n")
+        return idempotency_key
+
+
+class FakeProvider(SMSProvider):
+    """
+    In-memory provider. Every instance shares `sent` (delivered messages,
+    deduplicated by idempotency key like a real gateway) so tests can look
+    at what went out; `failures` maps a phone number to the SMSError to
+    raise for it.
+    """
+    max_batch = 20
+    sent = []
+    failures = {}
+    _ids = itertools.count(1)
+    _lock = threading.Lock()
+
+    @classmethod
+    def reset(cls):
+        with cls._lock:
+            cls.sent.clear()
+            cls.failures.clear()
+
+    def send(self, to, body, idempotency_key):
+        with self._lock:
+            if to in self.failures:
+                raise self.failures[to]
+            for delivered in self.sent:
+                if delivered['idempotency_key'] == idempotency_key:
+                    return delivered['id']
+            delivered = {'id': f'fake-{next(self._ids)}', 'to': to, 'body': body, 'idempotency_key': idempotency_key}
+            self.sent.append(delivered)
+            return delivered['id']
+
+
+def get_provider():
+    return import_string(settings.SMS_PROVIDER)()
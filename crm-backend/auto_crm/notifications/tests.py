@@ -0,0 +1,86 @@
+import signal
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import Customer, ServiceRecord, ServiceVehicle
+
+from .campaigns import candidates, due_days
+from .dispatcher import TokenBucket, dispatch_batch
+from .models import OutboundSMS
+from .outbox import enqueue_sms
+from .providers import FakeProvider
+
+
+class TokenBucketTests(TestCase):
+
+    def test_take_more_than_the_rate_waits_off_the_debt(self):
+        bucket = TokenBucket(10)
+        started = time.monotonic()
+        bucket.take(20)  # 10 in the bucket, 10 more at 10/s
+        self.assertAlmostEqual(time.monotonic() - started, 1.0, delta=0.3)
+
+
+@override_settings(SMS_PROVIDER='notifications.providers.FakeProvider')
+class DispatchBatchTests(TestCase):
+
+    def setUp(self):
+        FakeProvider.reset()
+
+    def test_fake_provider_batch_above_default_rate(self):
+        # FakeProvider sends 20 per call, above the default 10 per second
+        self.assertGreater(FakeProvider.max_batch, settings.SMS_RATE_PER_SECOND)
+        for i in range(25):
+            enqueue_sms(f'555-01{i:02}', 'Your car is ready', kind='test')
+
+        def hung(signum, frame):
+            raise AssertionError("dispatch_batch did not return")
+        previous = signal.signal(signal.SIGALRM, hung)
+        signal.alarm(10)
+        try:
+            result = dispatch_batch()
+        finally:
+            signal.alarm(0)
+            signal.signal(signal.SIGALRM, previous)
+
+        self.assertEqual(result, {'sent': 25, 'retried': 0, 'failed': 0})
+        self.assertEqual(len(FakeProvider.sent), 25)
+        self.assertEqual(OutboundSMS.objects.filter(status='SENT').count(), 25)
+
+
+class MaintenanceCandidateTests(TestCase):
+
+    def sold_car(self, n, plate):
+        sold = timezone.now() - timedelta(days=due_days(5000))
+        car = Vehicle.objects.create(
+            vin=f'VIN{n:014}', stock_number=f'S{n}', color='Blue', mileage=10,
+            license_plate=plate, status='SOLD', sold_date=sold,
+        )
+        Lead.objects.create(first_name='Ann', last_name='Lee', phone=f'555-02{n:02}', vehicle=car, status='SOLD')
+        # The buyer's lead going SOLD may touch the car - keep the sale date under test
+        Vehicle.objects.filter(pk=car.pk).update(sold_date=sold)
+        return car
+
+    def test_serviced_car_matched_on_normalized_plate(self):
+        serviced = self.sold_car(1, 'abc-123')
+        due = self.sold_car(2, 'xyz 789')
+
+        # Check-in stores the plate normalized
+        owner = Customer.objects.create(name='Ann Lee', phone='555-0201')
+        ServiceRecord.objects.create(
+            vehicle=ServiceVehicle.objects.create(owner=owner, license_plate='ABC123', make='Kia', model='Rio'),
+            description='5k service',
+        )
+
+        self.assertEqual(list(candidates(5000).values_list('pk', flat=True)), [due.pk])
+
+    def test_car_sold_without_a_plate_is_still_reminded(self):
+        plateless = self.sold_car(3, None)
+        blank = self.sold_car(4, '')
+
+        self.assertEqual(list(candidates(5000).values_list('pk', flat=True)), [plateless.pk, blank.pk])
@@ -0,0 +1,255 @@
+# sales/ingest.py
+"""
+Lead ingestion buffer.
+
+Web forms and ad platforms (Website / Facebook / Google) post leads in bursts.
+Instead of running a full serializer + save() per lead, the ingest endpoint
+appends the cleaned payloads to an append-only spool file on local disk and
+returns straight away. `flush_buffer()` (run by `manage.py flush_lead_buffer`)
+later moves those rows into the Lead table with bulk_create.
+"""
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from activity.log import event, record_many
+from activity.signals import lead_created
+from auto_crm.identity import normalize_phone, normalize_email
+from auto_crm.live import publish_on_commit, schedule_kpis_on_commit
+from auto_crm.response_cache import invalidate_on_commit
+from customers.links import link_leads
+from customers.profiles import schedule_refresh
+from .models import Lead
+
+try:
+    import fcntl  # Unix only (Railway / Docker). Windows dev falls back to a thread lock.
+except ImportError:
+    fcntl = None
+
+SOURCES = {value for value, _ in Lead._meta.get_field('source').choices}
+MAX_BATCH = 1000
+# Keys per IN (...) when looking up earlier leads - well under SQLite's variable limit
+LOOKUP_CHUNK = 500
+
+_local_lock = threading.Lock()
+
+
+# --- 1. CHEAP VALIDATION ---
+
+def clean_lead(payload, default_source='Website'):
+    """
+    Validates one raw payload and returns (row, error).
+    Only plain dict lookups here - this runs on the request thread.
+    """
+    if not isinstance(payload, dict):
+        return None, "Lead must be an object"
+
+    first_name = str(payload.get('first_name') or '').strip()
+    last_name = str(payload.get('last_name') or '').strip()
+
+    # Many form builders only send a single "name" field
+    if not first_name and payload.get('name'):
+        first_name, _, last_name = str(payload['name']).strip().partition(' ')
+
+    phone = str(payload.get('phone') or '').strip()
+    email = normalize_email(payload.get('email'))
+
+    if not first_name:
+        return None, "first_name (or name) is required"
+    if not phone and not email:
+        return None, "phone or email is required"
+    if phone and not normalize_phone(phone):
+        return None, "phone is not a valid number"
+    if email and '@' not in email:
+        return None, "email is not valid"
+
+    source = payload.get('source') or default_source
+    if source not in SOURCES:
+        source = default_source
+
+    return {
+        'first_name': first_name[:50],
+        'last_name': last_name.strip()[:50],
+        'phone': phone[:20],
+        'email': email[:254] or None,
+        'source': source,
+        'received_at': time.time(),
+    }, None
+
+
+# --- 2. DURABLE APPEND ---
+
+def buffer_dir():
+    path = Path(getattr(settings, 'LEAD_INGEST_BUFFER_DIR', Path(settings.BASE_DIR) / 'var' / 'lead_buffer'))
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+class _BufferLock:
+    """
+    Shared lock for appenders, exclusive lock for the flusher (so a segment is
+    never rotated while a request is half-way through writing to it).
+    """
+    def __init__(self, exclusive=False):
+        self.exclusive = exclusive
+        self.fd = None
+
+    def __enter__(self):
+        _local_lock.acquire()
+        if fcntl:
+            self.fd = os.open(buffer_dir() / '.lock', os.O_CREAT | os.O_RDWR, 0o644)
+            fcntl.flock(self.fd, fcntl.LOCK_EX if self.exclusive else fcntl.LOCK_SH)
+        return self
+
+    def __exit__(self, *exc):
+        if self.fd is not None:
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+            os.close(self.fd)
+        _local_lock.release()
+
+
+def append_leads(rows):
+    """Appends cleaned rows to the active segment with a single write() call."""
+    if not rows:
+        return 0
+
+    data = ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows).encode('utf-8')
+
+    with _BufferLock():
+        fd = os.open(buffer_dir() / 'active.jsonl', os.O_CREAT | os.O_WRONLY | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, data)
+            if getattr(settings, 'LEAD_INGEST_FSYNC', False):
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    return len(rows)
+
+
+# --- 3. FLUSH TO DATABASE ---
+
+def _rotate_active_segment():
+    """Renames active.jsonl to a sealed segment so appends start a new file."""
+    directory = buffer_dir()
+    active = directory / 'active.jsonl'
+
+    with _BufferLock(exclusive=True):
+        if active.exists() and active.stat().st_size > 0:
+            active.rename(directory / f"segment-{time.time_ns()}.jsonl")
+
+    return sorted(directory.glob('segment-*.jsonl'))
+
+
+def _read_segment(path):
+    rows = []
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            try:
+                rows.append(json.loads(line))
+            except ValueError:
+                continue  # Torn last line after a crash - skip it
+    return rows
+
+
+def _identity_keys(phone, email):
+    keys = []
+    phone_key = normalize_phone(phone)
+    if phone_key:
+        keys.append(phone_key)
+    if email:
+        keys.append(normalize_email(email))
+    return keys
+
+
+def _recent_identity_keys(rows, window):
+    """
+    The phone/email keys of `rows` that a lead created inside the dedupe window
+    already has. Only this segment's keys are looked up, so a flush costs the
+    same whatever the traffic of the last day was.
+    """
+    phones, emails = set(), set()
+    for row in rows:
+        phone_key = normalize_phone(row.get('phone'))
+        if phone_key:
+            phones.add(phone_key)
+        if row.get('email'):
+            emails.add(normalize_email(row['email']))
+
+    recent = Lead.objects.filter(created_at__gte=timezone.now() - window)
+    seen = set()
+    phones, emails = sorted(phones), sorted(emails)
+    for start in range(0, len(phones), LOOKUP_CHUNK):
+        # phone_key is already normalized in the table (lead_identity_timeline_idx)
+        seen.update(recent.filter(phone_key__in=phones[start:start + LOOKUP_CHUNK]).values_list('phone_key', flat=True))
+    for start in range(0, len(emails), LOOKUP_CHUNK):
+        # Leads entered through the API keep the email as typed (lead_email_idx)
+        seen.update(
+            recent.annotate(email_key=Lower('email'))
+            .filter(email_key__in=emails[start:start + LOOKUP_CHUNK]).values_list('email_key', flat=True)
+        )
+    return seen
+
+
+def flush_buffer(batch_size=500):
+    """
+    Moves every sealed segment into the Lead table.
+    Returns (created, duplicates). A segment file is only deleted after its rows
+    are committed, so a crash just means the segment is re-read (and deduped)
+    on the next run.
+    """
+    segments = _rotate_active_segment()
+    if not segments:
+        return 0, 0
+
+    window = timedelta(minutes=getattr(settings, 'LEAD_DEDUPE_WINDOW_MINUTES', 24 * 60))
+    cutoff = time.time() - window.total_seconds()
+
+    seen = set()
+    created = duplicates = 0
+    for segment in segments:
+        rows = _read_segment(segment)
+        seen.update(_recent_identity_keys(rows, window))
+        new_leads = []
+        for row in rows:
+            keys = _identity_keys(row.get('phone'), row.get('email'))
+
+            # Same person submitted twice inside the window (or already in the DB)
+            if row.get('received_at', 0) >= cutoff and any(key in seen for key in keys):
+                duplicates += 1
+                continue
+            seen.update(keys)
+
+            new_leads.append(Lead(
+                first_name=row['first_name'],
+                last_name=row.get('last_name', ''),
+                phone=row.get('phone', ''),
+                phone_key=normalize_phone(row.get('phone')),
+                email=row.get('email'),
+                source=row.get('source', 'Website'),
+            ))
+
+        with transaction.atomic():
+            Lead.objects.bulk_create(new_leads, batch_size=batch_size)
+            # bulk_create skips post_save, so link + queue the Customer 360 refresh,
+            # log the new leads, retire the cached dashboard responses and tell
+            # live dashboards here
+            link_leads(new_leads)
+            record_many(event(lead, *lead_created(lead), {'source': lead.source}) for lead in new_leads)
+            schedule_refresh(lead.phone_key for lead in new_leads)
+            invalidate_on_commit()
+            if new_leads:
+                publish_on_commit('leads', {'count': len(new_leads)})
+                schedule_kpis_on_commit()
+        created += len(new_leads)
+        segment.unlink()
+
+    return created, duplicates
@@ -0,0 +1,71 @@
+import json
+import shutil
+import tempfile
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from sales.ingest import MAX_BATCH, flush_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-tests lead ingestion: posts leads to /api/sales/ingest/ in-process, then "
+        "flushes them into the Lead table. Uses a scratch buffer and rolls the flush back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--leads', type=int, default=20000, help="Leads to post in total")
+        parser.add_argument('--batch', type=int, default=100, help=f"Leads per request (1 to {MAX_BATCH})")
+        parser.add_argument('--flush-batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch = max(1, min(options['batch'], MAX_BATCH))
+        requests = -(-options['leads'] // batch)
+        client = Client()
+        headers = {}
+        if getattr(settings, 'LEAD_INGEST_TOKEN', ''):
+            headers['HTTP_X_INGEST_TOKEN'] = settings.LEAD_INGEST_TOKEN
+
+        # Unique phones and emails, so the flush measures inserts and not the dedupe
+        def body(n):
+            leads = [
+                {'name': f'Bench Lead{i}', 'phone': f'+1555{i:07d}', 'email': f'bench{i}@example.com'}
+                for i in range(n * batch, (n + 1) * batch)
+            ]
+            return json.dumps(leads if batch > 1 else leads[0])
+
+        scratch = tempfile.mkdtemp(prefix='bench_ingest_')
+        try:
+            with override_settings(LEAD_INGEST_BUFFER_DIR=scratch):
+                url = reverse('ingest-leads')
+                started = time.perf_counter()
+                for n in range(requests):
+                    response = client.post(url, body(n), content_type='application/json', **headers)
+                    if response.status_code != 202:
+                        self.stderr.write(f"Ingest returned {response.status_code}: {response.content[:200]!r}")
+                        return
+                ingest_seconds = time.perf_counter() - started
+                posted = requests * batch
+
+                # Nothing is kept: the flush runs inside a transaction that is rolled back
+                with transaction.atomic():
+                    started = time.perf_counter()
+                    created, duplicates = flush_buffer(batch_size=options['flush_batch_size'])
+                    flush_seconds = time.perf_counter() - started
+                    transaction.set_rollback(True)
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+        self.stdout.write(
+            f"Ingest: {posted} leads in {requests} requests of {batch} in {ingest_seconds:.2f}s - "
+            f"{posted / ingest_seconds:,.0f} leads/s, {requests / ingest_seconds:,.0f} requests/s"
+        )
+        self.stdout.write(
+            f"Flush: {created} leads ({duplicates} duplicates skipped) in {flush_seconds:.2f}s - "
+            f"{created / flush_seconds:,.0f} leads/s (rolled back)"
+        )
@@ -0,0 +1,24 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sales.ingest import flush_buffer
+
+
+class Command(BaseCommand):
+    help = "Moves buffered web leads (from /api/sales/ingest/) into the Lead table."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Keep flushing until stopped (worker mode)")
+        parser.add_argument('--interval', type=float, default=2.0, help="Seconds between flushes in --loop mode")
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        while True:
+            created, duplicates = flush_buffer(batch_size=options['batch_size'])
+            if created or duplicates or not options['loop']:
+                self.stdout.write(f"Flushed {created} leads ({duplicates} duplicates skipped)")
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 11:05
+
+from django.db import migrations, models
+
+from auto_crm.identity import normalize_phone
+
+
+def backfill_phone_key(apps, schema_editor):
+    Lead = apps.get_model('sales', 'Lead')
+    batch = []
+    for lead in Lead.objects.only('id', 'phone').iterator(chunk_size=2000):
+        lead.phone_key = normalize_phone(lead.phone)
+        batch.append(lead)
+        if len(batch) == 2000:
+            Lead.objects.bulk_update(batch, ['phone_key'])
+            batch = []
+    Lead.objects.bulk_update(batch, ['phone_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0003_lead_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='lead',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16),
+        ),
+        migrations.RunPython(backfill_phone_key, migrations.RunPython.noop),
+    ]
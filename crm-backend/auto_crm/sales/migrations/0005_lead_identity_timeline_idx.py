@@ -0,0 +1,24 @@
+# Generated by Django 6.0 on 2026-10-19 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_vehicle_created_at_vehicle_sold_date_and_more'),
+        ('sales', '0004_lead_phone_key'),
+    ]
+
+    operations = [
+        # Composite index first, then drop the single-column one it replaces
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['phone_key', '-created_at', '-id'], name='lead_identity_timeline_idx'),
+        ),
+        migrations.AlterField(
+            model_name='lead',
+            name='phone_key',
+            field=models.CharField(blank=True, editable=False, max_length=16),
+        ),
+    ]
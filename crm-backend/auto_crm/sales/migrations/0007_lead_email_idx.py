@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-19 12:53
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0005_vehicle_plate_key'),
+        ('sales', '0006_lead_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(django.db.models.functions.text.Lower('email'), models.OrderBy(models.F('created_at'), descending=True), name='lead_email_idx'),
+        ),
+    ]
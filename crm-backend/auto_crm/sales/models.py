@@ -1,5 +1,8 @@
 from django.db import models
+from django.db.models import F
+from django.db.models.functions import Lower
 from inventory.models import Vehicle
+from auto_crm.identity import normalize_phone
 
 class Lead(models.Model):
     STATUS_CHOICES = [
@@ -14,6 +17,8 @@ class Lead(models.Model):
     first_name = models.CharField(max_length=50)
     last_name = models.CharField(max_length=50)
     phone = models.CharField(max_length=20)
+    # Normalized phone (+15551234567) - the customer identity shared with service
+    phone_key = models.CharField(max_length=16, blank=True, editable=False)
     email = models.EmailField(blank=True, null=True)
 
     source = models.CharField(max_length=50, default='Walk-in', choices=[
@@ -33,12 +38,25 @@ class Lead(models.Model):
     term_months = models.IntegerField(null=True, blank=True)
     
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Delta sync: rows changed since a cursor (sync/delta.py)
+            models.Index(fields=['updated_at'], name='lead_updated_idx'),
+            # Identity lookups + one customer's leads newest-first (timeline keyset)
+            models.Index(fields=['phone_key', '-created_at', '-id'], name='lead_identity_timeline_idx'),
+            # Ingest dedupe by email, compared lower-cased (sales/ingest.py)
+            models.Index(Lower('email'), F('created_at').desc(), name='lead_email_idx'),
+        ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
     # --- THE NEW AUTOMATION LOGIC ---
     def save(self, *args, **kwargs):
+        self.phone_key = normalize_phone(self.phone)
+
         # 1. If we mark this Lead as SOLD...
         if self.status == 'SOLD' and self.vehicle:
             # ...Find the car and mark it SOLD too
@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from .ingest import append_leads, clean_lead, flush_buffer
+from .models import Lead
+
+
+class FlushDedupeTests(TestCase):
+
+    def setUp(self):
+        self.buffer = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.buffer, ignore_errors=True)
+        override = override_settings(LEAD_INGEST_BUFFER_DIR=self.buffer)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def ingest(self, *payloads):
+        append_leads([clean_lead(payload)[0] for payload in payloads])
+
+    def test_only_the_segments_own_keys_are_looked_up(self):
+        # Entered through the API: email kept as typed
+        Lead.objects.create(first_name='Ann', last_name='Lee', phone='555-0100', email='Ann@Example.com')
+        for n in range(30):
+            Lead.objects.create(first_name='Old', last_name=str(n), phone=f'555-02{n:02}', email=f'old{n}@example.com')
+
+        self.ingest(
+            {'name': 'Ann Lee', 'phone': '555-0199', 'email': 'ann@example.com'},  # same email
+            {'name': 'Ann Lee', 'phone': '(555) 0100'},  # same phone
+            {'name': 'Bob Ray', 'phone': '555-0300', 'email': 'bob@example.com'},
+            {'name': 'Bob Ray', 'phone': '555-0300'},  # same as the lead above it
+        )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(flush_buffer(), (1, 3))
+        self.assertTrue(Lead.objects.filter(email='bob@example.com').exists())
+
+        # Earlier leads in the window are looked up by this segment's keys, never read in full
+        window_reads = [
+            q['sql'] for q in queries.captured_queries
+            if q['sql'].startswith('SELECT') and '"sales_lead"."created_at" >=' in q['sql']
+        ]
+        self.assertTrue(window_reads)
+        for sql in window_reads:
+            self.assertIn(' IN (', sql)
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LeadViewSet
+from .views import LeadViewSet, ingest_leads
 
 router = DefaultRouter()
 router.register(r'leads', LeadViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path('ingest/', ingest_leads, name='ingest-leads'),
 ]
\ No newline at end of file
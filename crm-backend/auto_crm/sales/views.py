@@ -1,18 +1,40 @@
+import json
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from inventory.models import Vehicle
 from .models import Lead
 from .serializers import LeadSerializer
-from auto_crm.sms import send_sms_notification
+from service.models import Customer
+from service.serializers import CustomerSerializer
+from .ingest import MAX_BATCH, clean_lead, append_leads
+from auto_crm.conditional import ConditionalGetMixin
+from auto_crm.fast_list import ValuesListMixin
+from auto_crm.documents import pdf_response
+from notifications.outbox import enqueue_sms
+from sync.delta import DeltaSyncMixin
 
-class LeadViewSet(viewsets.ModelViewSet):
+class LeadViewSet(DeltaSyncMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Lead.objects.all().order_by('-created_at')
     serializer_class = LeadSerializer
+    etag_depends_on = (Vehicle,)  # vehicle_details
 
     def perform_update(self, serializer):
         instance = self.get_object()
         old_status = instance.status
-        
-        updated_lead = serializer.save()
 
+        # The status change and its SMS commit together (or not at all)
+        with transaction.atomic():
+            updated_lead = serializer.save()
+            self.queue_sold_sms(old_status, updated_lead)
+
+    def queue_sold_sms(self, old_status, updated_lead):
         # FIX: Check for 'SOLD' (matching your frontend dropdown) instead of 'WON'
         if old_status != 'SOLD' and updated_lead.status == 'SOLD':
             
@@ -29,5 +51,56 @@ class LeadViewSet(viewsets.ModelViewSet):
                 f"🎁 BONUS: Your 5k, 10k, and 15k mile services are on us!"
             )
             
-            # Send the SMS
-            send_sms_notification(updated_lead.phone, message)
\ No newline at end of file
+            # Queue the SMS (sent by `manage.py dispatch_sms`); once per lead + car
+            enqueue_sms(
+                updated_lead.phone, message, kind='lead-sold',
+                dedupe_key=f'lead-sold:{updated_lead.pk}:{updated_lead.vehicle_id}',
+            )
+
+    # GET /api/sales/leads/<id>/service-customers/ (one join through CustomerLink)
+    @action(detail=True, methods=['get'], url_path='service-customers')
+    def service_customers(self, request, pk=None):
+        customers = Customer.objects.filter(lead_links__lead_id=pk).order_by('id')
+        return Response(CustomerSerializer(customers, many=True).data)
+
+    @action(detail=True, methods=['get'], url_path='bill-of-sale')
+    def bill_of_sale(self, request, pk=None):
+        lead = self.get_object()
+        if lead.status != 'SOLD' or not lead.vehicle:
+            return Response({"error": "Bill of sale is only available for sold leads with a vehicle."}, status=400)
+        return pdf_response('bill_of_sale', lead, f"bill-of-sale-{lead.pk:06d}.pdf")
+
+# --- WEB LEAD INGESTION (Website / Facebook / Google forms) ---
+# Plain Django view on purpose: no DRF parsing/serializer per lead, just
+# validate cheaply, append to the local buffer and return 202.
+@csrf_exempt
+@require_POST
+def ingest_leads(request):
+    token = getattr(settings, 'LEAD_INGEST_TOKEN', '')
+    if token and not constant_time_compare(request.headers.get('X-Ingest-Token', ''), token):
+        return JsonResponse({"error": "Invalid ingest token"}, status=403)
+
+    try:
+        payload = json.loads(request.body or b'null')
+    except ValueError:
+        return JsonResponse({"error": "Body must be JSON"}, status=400)
+
+    # Accept a single lead, a list, or {"leads": [...]}
+    if isinstance(payload, dict) and isinstance(payload.get('leads'), list):
+        payload = payload['leads']
+    items = payload if isinstance(payload, list) else [payload]
+
+    if len(items) > MAX_BATCH:
+        return JsonResponse({"error": f"At most {MAX_BATCH} leads per request"}, status=413)
+
+    default_source = request.GET.get('source', 'Website')
+    rows, rejected = [], []
+    for index, item in enumerate(items):
+        row, error = clean_lead(item, default_source)
+        if error:
+            rejected.append({"index": index, "error": error})
+        else:
+            rows.append(row)
+
+    accepted = append_leads(rows)
+    return JsonResponse({"accepted": accepted, "rejected": rejected}, status=202 if accepted else 400)
@@ -0,0 +1,69 @@
+import random
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand
+from django.test import Client
+from django.utils import timezone
+
+from auto_crm.benchmarks import rolled_back, timed
+from service import scheduling
+from service.models import Customer, ServiceAppointment
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks the service calendar on a seeded multi-year history: the window list, "
+        "the overlap check and the free-slot searches. The seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--years', type=int, default=4, help="Years of appointment history to seed")
+        parser.add_argument('--per-day', type=int, default=40, help="Appointments seeded per day")
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        first = timezone.localdate().replace(month=1, day=1) - timedelta(days=365 * (options['years'] - 1))
+        rng = random.Random(28)
+
+        with rolled_back():
+            customer = Customer.objects.create(name='Bench Customer', phone='555-0028')
+            appointments = []
+            for offset in range(365 * options['years']):
+                opening = timezone.make_aware(datetime.combine(first + timedelta(days=offset), datetime.min.time()))
+                opening += timedelta(hours=8)
+                for _ in range(options['per_day']):
+                    start = opening + timedelta(minutes=15 * rng.randint(0, 40))
+                    appointments.append(ServiceAppointment(
+                        customer=customer, title='Bench', start_time=start,
+                        end_time=start + timedelta(minutes=rng.choice([30, 60, 120])),
+                    ))
+            ServiceAppointment.objects.bulk_create(appointments, batch_size=2000)
+            self.stdout.write(f"Seeded {len(appointments)} appointments over {options['years']} years")
+
+            # A week in the middle of the history
+            monday = first + timedelta(days=365 * (options['years'] // 2))
+            monday -= timedelta(days=monday.weekday())
+            week_end, month_end = monday + timedelta(days=6), monday + timedelta(days=29)
+            client = Client()
+
+            def get(url):
+                response = client.get(url)
+                assert response.status_code == 200, response.content[:200]
+                return response.json()
+
+            rows = [
+                ('week list', f'/api/service/appointments/?start={monday}&end={week_end}'),
+                ('month free windows', f'/api/service/appointments/free-slots/?start={monday}&end={month_end}&duration=60&capacity=12'),
+                ('day free windows', f'/api/service/appointments/free-slots/?start={monday}&end={monday}&duration=60&capacity=5'),
+            ]
+            for label, url in rows:
+                ms, body = timed(lambda: get(url), repeat)
+                self.stdout.write(f"{label:<20} {ms:8.2f} ms  ({len(body)} rows)")
+
+            start = timezone.make_aware(datetime.combine(monday, datetime.min.time())) + timedelta(hours=10)
+            ms, peak = timed(lambda: scheduling.peak_occupancy(start, start + timedelta(hours=1)), repeat)
+            self.stdout.write(f"{'overlap check':<20} {ms:8.2f} ms  (peak {peak})")
+
+            self.stdout.write("Query plan of the overlap range scan:")
+            self.stdout.write(scheduling.overlapping(start, start + timedelta(hours=1)).explain())
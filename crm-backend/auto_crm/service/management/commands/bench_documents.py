@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from django.utils import timezone
+
+from auto_crm.documents import KINDS, month_jobs, render_batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmarks month-end PDF rendering in documents per second, per worker count, "
+        "into a scratch cache directory (the real document cache is left alone)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help="YYYY-MM (default: last month)")
+        parser.add_argument('--kind', action='append', choices=KINDS, help="Only these document kinds (repeatable)")
+        parser.add_argument('--workers', type=int, action='append', help="Worker counts to try (default: 1 and the CPU count)")
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                year, month = (int(part) for part in options['month'].split('-'))
+            except ValueError:
+                raise CommandError("--month must look like 2025-01")
+        else:
+            today = timezone.localdate()
+            year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+
+        jobs = list(month_jobs(year, month, options['kind'] or KINDS))
+        if not jobs:
+            raise CommandError(f"No documents dated {year}-{month:02d} - pick a --month with service jobs or sales.")
+        self.stdout.write(f"{year}-{month:02d}: {len(jobs)} documents, {os.cpu_count()} CPU(s)")
+
+        worker_counts = options['workers'] or sorted({1, os.cpu_count() or 1})
+        for workers in worker_counts:
+            scratch = tempfile.mkdtemp(prefix='bench_documents_')
+            try:
+                with override_settings(DOCUMENT_CACHE_DIR=scratch):
+                    started = time.perf_counter()
+                    result = render_batch(jobs, workers=workers)
+                    rendered = time.perf_counter() - started
+
+                    # Same documents again: all cached now
+                    started = time.perf_counter()
+                    again = render_batch(jobs, workers=workers)
+                    cached = time.perf_counter() - started
+            finally:
+                shutil.rmtree(scratch, ignore_errors=True)
+
+            self.stdout.write(
+                f"--workers {workers}: {result['rendered']} rendered in {rendered:.2f}s "
+                f"({result['rendered'] / rendered:.0f} docs/s); re-run {again['cached']} cached in {cached:.2f}s"
+            )
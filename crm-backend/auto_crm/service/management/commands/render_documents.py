@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from auto_crm.documents import KINDS, month_jobs, render_batch
+
+
+class Command(BaseCommand):
+    help = "Month-end run: renders (and caches) invoices, job cards and bills of sale as PDF."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help="YYYY-MM (default: last month)")
+        parser.add_argument('--kind', action='append', choices=KINDS, help="Only these document kinds (repeatable)")
+        parser.add_argument('--workers', type=int, help="Worker processes (default: DOCUMENT_RENDER_WORKERS)")
+
+    def handle(self, *args, **options):
+        if options['month']:
+            try:
+                year, month = (int(part) for part in options['month'].split('-'))
+            except ValueError:
+                raise CommandError("--month must look like 2025-01")
+        else:
+            today = timezone.localdate()
+            year, month = (today.year, today.month - 1) if today.month > 1 else (today.year - 1, 12)
+
+        kinds = options['kind'] or KINDS
+        started = time.perf_counter()
+        result = render_batch(month_jobs(year, month, kinds), workers=options['workers'])
+        elapsed = time.perf_counter() - started
+
+        total = result['rendered'] + result['cached']
+        rate = result['rendered'] / elapsed if elapsed else 0
+        self.stdout.write(
+            f"{year}-{month:02d}: {total} documents in {elapsed:.2f}s "
+            f"({result['rendered']} rendered, {result['cached']} already cached, {rate:.1f} docs/s)"
+        )
@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 10:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0004_servicerecord_labor_cost_servicerecord_parts_cost'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='serviceappointment',
+            index=models.Index(fields=['start_time', 'end_time'], name='appt_time_range_idx'),
+        ),
+    ]
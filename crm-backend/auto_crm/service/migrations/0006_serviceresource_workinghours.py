@@ -0,0 +1,46 @@
+# Generated by Django 6.0 on 2026-10-19 10:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0005_serviceappointment_time_range_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceResource',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('kind', models.CharField(choices=[('BAY', 'Service Bay'), ('TECH', 'Technician')], max_length=10)),
+                ('is_active', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='serviceappointment',
+            name='bay',
+            field=models.ForeignKey(blank=True, limit_choices_to={'kind': 'BAY'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='bay_appointments', to='service.serviceresource'),
+        ),
+        migrations.AddField(
+            model_name='serviceappointment',
+            name='technician',
+            field=models.ForeignKey(blank=True, limit_choices_to={'kind': 'TECH'}, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='technician_appointments', to='service.serviceresource'),
+        ),
+        migrations.CreateModel(
+            name='WorkingHours',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('weekday', models.IntegerField(choices=[(0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'), (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday')])),
+                ('start_time', models.TimeField()),
+                ('end_time', models.TimeField()),
+                ('resource', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='working_hours', to='service.serviceresource')),
+            ],
+            options={
+                'ordering': ['weekday', 'start_time'],
+            },
+        ),
+    ]
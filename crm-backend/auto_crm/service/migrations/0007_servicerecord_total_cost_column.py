@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-19 10:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0006_serviceresource_workinghours'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicerecord',
+            name='discount',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='servicerecord',
+            name='tax',
+            field=models.DecimalField(decimal_places=2, default=0.0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='servicerecord',
+            name='total_cost',
+            field=models.GeneratedField(db_persist=True, expression=models.F('parts_cost') + models.F('labor_cost') - models.F('discount') + models.F('tax'), output_field=models.DecimalField(decimal_places=2, max_digits=12)),
+        ),
+        migrations.AddIndex(
+            model_name='servicerecord',
+            index=models.Index(fields=['status', 'date', 'total_cost'], name='record_revenue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicerecord',
+            index=models.Index(fields=['total_cost'], name='record_total_cost_idx'),
+        ),
+    ]
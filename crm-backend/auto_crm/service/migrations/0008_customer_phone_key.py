@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-19 10:59
+
+from django.db import migrations, models
+
+from auto_crm.identity import normalize_phone
+
+
+def backfill_phone_key(apps, schema_editor):
+    Customer = apps.get_model('service', 'Customer')
+    batch = []
+    for customer in Customer.objects.only('id', 'phone').iterator(chunk_size=2000):
+        customer.phone_key = normalize_phone(customer.phone)
+        batch.append(customer)
+        if len(batch) == 2000:
+            Customer.objects.bulk_update(batch, ['phone_key'])
+            batch = []
+    Customer.objects.bulk_update(batch, ['phone_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0007_servicerecord_total_cost_column'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='phone_key',
+            field=models.CharField(blank=True, db_index=True, editable=False, max_length=16),
+        ),
+        migrations.RunPython(backfill_phone_key, migrations.RunPython.noop),
+    ]
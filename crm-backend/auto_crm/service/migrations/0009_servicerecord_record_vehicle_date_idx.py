@@ -0,0 +1,17 @@
+# Generated by Django 6.0 on 2026-10-19 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0008_customer_phone_key'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicerecord',
+            index=models.Index(fields=['vehicle', '-date', '-id'], name='record_vehicle_date_idx'),
+        ),
+    ]
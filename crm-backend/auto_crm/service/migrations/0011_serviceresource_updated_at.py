@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 12:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('service', '0010_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='serviceresource',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
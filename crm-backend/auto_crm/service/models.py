@@ -1,10 +1,28 @@
+from decimal import Decimal
+
 from django.db import models
+from django.db.models import F
+
+from auto_crm.identity import normalize_phone, normalize_plate
 
 class Customer(models.Model):
     name = models.CharField(max_length=100)
     phone = models.CharField(max_length=20)
+    # Normalized phone (+15551234567) used to find returning customers
+    phone_key = models.CharField(max_length=16, blank=True, db_index=True, editable=False)
     email = models.EmailField(blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Delta sync: rows changed since a cursor (sync/delta.py)
+            models.Index(fields=['updated_at'], name='customer_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.phone_key = normalize_phone(self.phone)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return self.name
@@ -13,9 +31,23 @@ class ServiceVehicle(models.Model):
     # This links the car to the customer
     owner = models.ForeignKey(Customer, on_delete=models.CASCADE, related_name='vehicles')
     license_plate = models.CharField(max_length=20, unique=True)
+    # Normalized plate (check-in already stores it that way, the API may not) -
+    # what sold inventory cars are matched on (notifications/campaigns.py)
+    plate_key = models.CharField(max_length=20, blank=True, db_index=True, editable=False)
     make = models.CharField(max_length=50)
     model = models.CharField(max_length=50)
     year = models.IntegerField(null=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Delta sync: rows changed since a cursor (sync/delta.py)
+            models.Index(fields=['updated_at'], name='svehicle_updated_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.plate_key = normalize_plate(self.license_plate)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.license_plate} - {self.owner.name}"
@@ -33,16 +65,83 @@ class ServiceRecord(models.Model):
     # --- NEW BILLING FIELDS ---
     parts_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
     labor_cost = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    discount = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
+    tax = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
 
-    # Helper to calculate total
-    @property
-    def total_cost(self):
-        return self.parts_cost + self.labor_cost
+    # Invoice total, computed and stored by the database so revenue reports
+    # can Sum()/filter/sort on it without recomputing parts + labor.
+    total_cost = models.GeneratedField(
+        expression=F('parts_cost') + F('labor_cost') - F('discount') + F('tax'),
+        output_field=models.DecimalField(max_digits=12, decimal_places=2),
+        db_persist=True,
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Delta sync: rows changed since a cursor (sync/delta.py)
+            models.Index(fields=['updated_at'], name='record_updated_idx'),
+            # Revenue reports: status='COMPLETED' + date range, summed straight from
+            # the index (covering) without touching the table rows
+            models.Index(fields=['status', 'date', 'total_cost'], name='record_revenue_idx'),
+            models.Index(fields=['total_cost'], name='record_total_cost_idx'),
+            # A vehicle's (and so a customer's) jobs newest-first: history + timeline keyset
+            models.Index(fields=['vehicle', '-date', '-id'], name='record_vehicle_date_idx'),
+        ]
+
+    COST_FIELDS = ('parts_cost', 'labor_cost', 'discount', 'tax')
+
+    def save(self, *args, **kwargs):
+        # total_cost is stored by the database. An INSERT hands it back (RETURNING),
+        # an UPDATE doesn't - so work it out here the same way, and the SMS text and
+        # the API response show the new total without a SELECT after every save
+        if not self.get_deferred_fields().intersection(self.COST_FIELDS):
+            parts, labor, discount, tax = (
+                self._meta.get_field(name).to_python(getattr(self, name)) for name in self.COST_FIELDS
+            )
+            self.total_cost = (parts + labor - discount + tax).quantize(Decimal('0.01'))
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.vehicle.license_plate} - {self.description}"
     
 
+class ServiceResource(models.Model):
+    # Anything an appointment has to reserve: a lift/bay or a technician
+    KIND_CHOICES = [
+        ('BAY', 'Service Bay'),
+        ('TECH', 'Technician'),
+    ]
+
+    name = models.CharField(max_length=100)
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    is_active = models.BooleanField(default=True)
+    # Appointments show bay / technician names: their ETags follow this (auto_crm/conditional.py)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.get_kind_display()})"
+
+
+class WorkingHours(models.Model):
+    # One row per shift. A split shift is simply two rows for the same weekday.
+    WEEKDAY_CHOICES = [
+        (0, 'Monday'), (1, 'Tuesday'), (2, 'Wednesday'), (3, 'Thursday'),
+        (4, 'Friday'), (5, 'Saturday'), (6, 'Sunday'),
+    ]
+
+    resource = models.ForeignKey(ServiceResource, on_delete=models.CASCADE, related_name='working_hours')
+    weekday = models.IntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        ordering = ['weekday', 'start_time']
+
+    def __str__(self):
+        return f"{self.resource.name}: {self.get_weekday_display()} {self.start_time}-{self.end_time}"
+
+
 class ServiceAppointment(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE)
     vehicle = models.ForeignKey(ServiceVehicle, on_delete=models.SET_NULL, null=True, blank=True)
@@ -55,5 +154,24 @@ class ServiceAppointment(models.Model):
         ('CANCELLED', 'Cancelled')
     ])
 
+    # Optional resource booking (see service/scheduling.py::find_slots)
+    bay = models.ForeignKey(
+        ServiceResource, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='bay_appointments', limit_choices_to={'kind': 'BAY'}
+    )
+    technician = models.ForeignKey(
+        ServiceResource, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='technician_appointments', limit_choices_to={'kind': 'TECH'}
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Delta sync: rows changed since a cursor (sync/delta.py)
+            models.Index(fields=['updated_at'], name='appt_updated_idx'),
+            # Calendar window + overlap queries (see service/scheduling.py)
+            models.Index(fields=['start_time', 'end_time'], name='appt_time_range_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.start_time})"
\ No newline at end of file
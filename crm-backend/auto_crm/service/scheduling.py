@@ -0,0 +1,298 @@
+# service/scheduling.py
+"""
+Calendar helpers for ServiceAppointment.
+
+Every lookup here is a bounded range scan on the (start_time, end_time)
+index: an appointment can only overlap [start, end) if it starts before `end`
+and no earlier than `start - SERVICE_MAX_APPOINTMENT_HOURS`. That keeps
+overlap checks and free-slot searches flat no matter how many years of
+history the table holds.
+"""
+import bisect
+import heapq
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import ServiceAppointment, ServiceResource
+
+ACTIVE_STATUSES = ['SCHEDULED', 'COMPLETED']
+
+
+def max_duration():
+    return timedelta(hours=getattr(settings, 'SERVICE_MAX_APPOINTMENT_HOURS', 72))
+
+
+def default_capacity():
+    # Once bays are modelled, the shop's capacity is simply how many we have
+    bays = ServiceResource.objects.filter(kind='BAY', is_active=True).count()
+    return bays or getattr(settings, 'SERVICE_BAY_CAPACITY', 1)
+
+
+def parse_when(value, end_of_day=False):
+    """Accepts an ISO datetime or a plain date (YYYY-MM-DD) from a query param."""
+    if not value:
+        return None
+
+    # A plain date first: parse_datetime() also takes one (as midnight) on Python 3.11+
+    day = parse_date(value) if len(value) == 10 else None
+    if day is not None:
+        dt = timezone.datetime.combine(day, timezone.datetime.min.time())
+        if end_of_day:
+            dt += timedelta(days=1)
+    else:
+        dt = parse_datetime(value)
+        if dt is None:
+            raise ValueError(f"Invalid date: {value}")
+
+    if timezone.is_naive(dt):
+        dt = timezone.make_aware(dt)
+    return dt
+
+
+# --- 1. RANGE QUERY ---
+
+def overlapping(start, end, queryset=None):
+    """Appointments intersecting [start, end), using the start_time index."""
+    if queryset is None:
+        queryset = ServiceAppointment.objects.all()
+
+    return queryset.filter(
+        start_time__gte=start - max_duration(),
+        start_time__lt=end,
+        end_time__gt=start,
+    )
+
+
+# --- 2. SWEEP LINE ---
+
+def occupancy(intervals, start, end):
+    """
+    Turns a list of (start, end) intervals into a piecewise-constant timeline
+    of how many appointments run at once inside [start, end).
+    Returns [(segment_start, segment_end, count), ...] sorted by time.
+    """
+    events = []
+    for s, e in intervals:
+        s, e = max(s, start), min(e, end)
+        if s < e:
+            events.append((s, 1))
+            events.append((e, -1))
+    events.sort()
+
+    timeline = []
+    cursor, count = start, 0
+    for moment, delta in events:
+        if moment > cursor:
+            timeline.append((cursor, moment, count))
+            cursor = moment
+        count += delta
+    if cursor < end:
+        timeline.append((cursor, end, count))
+    return timeline
+
+
+def peak_occupancy(start, end, exclude_id=None):
+    queryset = overlapping(start, end).filter(status__in=ACTIVE_STATUSES)
+    if exclude_id:
+        queryset = queryset.exclude(pk=exclude_id)
+
+    intervals = list(queryset.values_list('start_time', 'end_time'))
+    return max((count for _, _, count in occupancy(intervals, start, end)), default=0)
+
+
+def resource_conflicts(start, end, bay=None, technician=None, exclude_id=None):
+    """Names of the requested bay/technician that are already booked in [start, end)."""
+    conflicts = []
+    for field, resource in (('bay', bay), ('technician', technician)):
+        if resource is None:
+            continue
+        queryset = overlapping(start, end).filter(status__in=ACTIVE_STATUSES, **{field: resource})
+        if exclude_id:
+            queryset = queryset.exclude(pk=exclude_id)
+        if queryset.exists():
+            conflicts.append(str(resource))
+    return conflicts
+
+
+# --- 3. FREE SLOTS ---
+
+def free_windows(start, end, duration, capacity=None):
+    """
+    Maximal windows inside [start, end) where fewer than `capacity`
+    appointments overlap and a job of `duration` fits.
+    """
+    intervals = list(
+        overlapping(start, end)
+        .filter(status__in=ACTIVE_STATUSES)
+        .values_list('start_time', 'end_time')
+    )
+    return _windows_below(intervals, start, end, duration, capacity or default_capacity())
+
+
+def _windows_below(intervals, start, end, duration, capacity):
+    windows = []
+    run_start = None
+    for seg_start, seg_end, count in occupancy(intervals, start, end):
+        if count < capacity:
+            if run_start is None:
+                run_start = seg_start
+        elif run_start is not None:
+            windows.append((run_start, seg_start))
+            run_start = None
+    if run_start is not None:
+        windows.append((run_start, end))
+
+    return [(s, e) for s, e in windows if e - s >= duration]
+
+
+# --- 4. BAY + TECHNICIAN SLOT FINDER ---
+
+def _working_intervals(resource, start, end, _cache):
+    """
+    A resource's shifts inside [start, end), as aware datetimes in local time.
+    Most resources share the same shifts, so (day, shift) -> datetimes is
+    memoized in `_cache` for the duration of one search.
+    """
+    shifts = defaultdict(list)
+    for hours in resource.working_hours.all():
+        shifts[hours.weekday].append((hours.start_time, hours.end_time))
+
+    local_tz = timezone.get_current_timezone()
+    intervals = []
+    day = timezone.localtime(start).date()
+    last_day = timezone.localtime(end).date()
+    while day <= last_day:
+        for shift in shifts.get(day.weekday(), ()):
+            key = (day, shift)
+            if key not in _cache:
+                s = max(datetime.combine(day, shift[0], tzinfo=local_tz), start)
+                e = min(datetime.combine(day, shift[1], tzinfo=local_tz), end)
+                _cache[key] = (s, e) if s < e else None
+            if _cache[key]:
+                intervals.append(_cache[key])
+        day += timedelta(days=1)
+    return sorted(intervals)
+
+
+def _subtract(free, busy):
+    """Working intervals minus booked intervals (both sorted) in one merge pass."""
+    result = []
+    busy = sorted(busy)
+    i = 0
+    for s, e in free:
+        # Skip bookings that end before this shift starts
+        while i < len(busy) and busy[i][1] <= s:
+            i += 1
+        j = i
+        cursor = s
+        while j < len(busy) and busy[j][0] < e:
+            if busy[j][0] > cursor:
+                result.append((cursor, busy[j][0]))
+            cursor = max(cursor, busy[j][1])
+            j += 1
+        if cursor < e:
+            result.append((cursor, e))
+    return result
+
+
+def _align(moment, step):
+    """Rounds up to the next step boundary (clock-aligned, e.g. :00/:15/:30)."""
+    step_seconds = int(step.total_seconds())
+    epoch = int(moment.timestamp())
+    aligned = -(-epoch // step_seconds) * step_seconds
+    return datetime.fromtimestamp(aligned, tz=moment.tzinfo)
+
+
+def find_slots(duration, start, end, limit=10, step=timedelta(minutes=30)):
+    """
+    Earliest start times in [start, end) where some bay AND some technician
+    are both free for `duration`, within their working hours.
+
+    Sweep line over "usable start" intervals: a free interval [s, e) of a
+    resource can host a job starting anywhere in [s, e - duration]. Those
+    intervals from every resource become open/close events on one timeline,
+    and we walk it once keeping the set of bays and techs currently usable.
+    Cost is O(R log R) in the number of free intervals, independent of how
+    many candidate times there are. Appointments are loaded with a single
+    range scan on the time index. Slots also respect the shop-wide capacity
+    booking enforces (see free_windows()).
+    """
+    resources = list(ServiceResource.objects.filter(is_active=True).prefetch_related('working_hours'))
+    kinds = {kind for kind, _ in ServiceResource.KIND_CHOICES if any(r.kind == kind for r in resources)}
+    if not kinds:
+        return []
+
+    busy = defaultdict(list)
+    booked = list(
+        overlapping(start, end)
+        .filter(status__in=ACTIVE_STATUSES)
+        .values_list('bay_id', 'technician_id', 'start_time', 'end_time')
+    )
+    for bay_id, tech_id, s, e in booked:
+        if bay_id:
+            busy[bay_id].append((s, e))
+        if tech_id:
+            busy[tech_id].append((s, e))
+
+    # Booking also refuses a time once the shop is at capacity - unassigned
+    # appointments included (ServiceAppointmentSerializer.validate), so only
+    # offer slots that lie inside one of free_windows()' windows
+    open_windows = _windows_below([(s, e) for _, _, s, e in booked], start, end, duration, default_capacity())
+    window_starts = [s for s, _ in open_windows]
+
+    def under_capacity(candidate):
+        i = bisect.bisect_right(window_starts, candidate) - 1
+        return i >= 0 and candidate + duration <= open_windows[i][1]
+
+    # Usable-start intervals -> events. Closing is inclusive, so it's
+    # scheduled one second after the last usable start.
+    events = []
+    shift_cache = {}
+    for resource in resources:
+        free = _subtract(_working_intervals(resource, start, end, shift_cache), busy[resource.pk])
+        for s, e in free:
+            if e - s >= duration:
+                events.append((s, 1, resource.pk, resource.kind))
+                events.append((e - duration + timedelta(seconds=1), -1, resource.pk, resource.kind))
+    if not events:
+        return []
+    heapq.heapify(events)
+
+    names = {r.pk: r.name for r in resources}
+    usable = {kind: set() for kind in kinds}
+    slots = []
+
+    while events and len(slots) < limit:
+        moment = events[0][0]
+        # Apply every event at this instant (closes sort before opens)
+        while events and events[0][0] == moment:
+            _, delta, pk, kind = heapq.heappop(events)
+            if delta > 0:
+                usable[kind].add(pk)
+            else:
+                usable[kind].discard(pk)
+
+        if not all(usable.values()):
+            continue
+
+        # Every grid time until the next event has the same usable sets
+        segment_end = events[0][0] if events else end
+        candidate = _align(moment, step)
+        while candidate < segment_end and len(slots) < limit:
+            if not under_capacity(candidate):
+                candidate += step
+                continue
+            slot = {"start": candidate, "end": candidate + duration}
+            for kind, field in (('BAY', 'bay'), ('TECH', 'technician')):
+                if kind in usable:
+                    pk = min(usable[kind])
+                    slot[field] = {"id": pk, "name": names[pk]}
+                    slot[f"free_{field}s"] = len(usable[kind])
+            slots.append(slot)
+            candidate += step
+
+    return slots
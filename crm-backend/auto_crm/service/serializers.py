@@ -1,6 +1,12 @@
+from django.db import transaction
+from django.db.models import Q
 from rest_framework import serializers
 from .models import Customer, ServiceVehicle, ServiceRecord
-from .models import ServiceAppointment
+from .models import ServiceAppointment, ServiceResource, WorkingHours
+from . import scheduling
+
+# Key of the Postgres advisory lock bookings take turns on (any number no other lock uses)
+BOOKING_LOCK_ID = 0x53455256  # 'SERV'
 
 # 1. SIMPLE SERIALIZER (Avoids circular errors)
 class SimpleVehicleSerializer(serializers.ModelSerializer):
@@ -21,27 +27,144 @@ class ServiceRecordSerializer(serializers.ModelSerializer):
         model = ServiceRecord
         fields = '__all__'
 
-# 3. MAIN VEHICLE SERIALIZER (Uses the Record)
+# 3. MAIN VEHICLE SERIALIZER (Flat row - one per vehicle, no history)
 class ServiceVehicleSerializer(serializers.ModelSerializer):
-    # Include history so we see past jobs when we scan a car
-    history = ServiceRecordSerializer(many=True, read_only=True)
+    owner_name = serializers.CharField(source='owner.name', read_only=True)
+    owner_phone = serializers.CharField(source='owner.phone', read_only=True)
 
     class Meta:
         model = ServiceVehicle
         fields = '__all__'
 
-# 4. CUSTOMER SERIALIZER
+# 3b. VEHICLE + HISTORY (Opt-in with ?expand=history, e.g. when we scan a car)
+class ServiceVehicleHistorySerializer(ServiceVehicleSerializer):
+    history = ServiceRecordSerializer(many=True, read_only=True)
+
+# 4. CUSTOMER SERIALIZER (Flat row)
 class CustomerSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Customer
+        fields = '__all__'
+
+# 4b. CUSTOMER + VEHICLES (?expand=vehicles)
+class CustomerVehiclesSerializer(CustomerSerializer):
     vehicles = ServiceVehicleSerializer(many=True, read_only=True)
 
+# 4c. CUSTOMER + VEHICLES + HISTORY (?expand=vehicles,history)
+class CustomerHistorySerializer(CustomerSerializer):
+    vehicles = ServiceVehicleHistorySerializer(many=True, read_only=True)
+
+# 5. BAYS / TECHNICIANS
+class WorkingHoursSerializer(serializers.ModelSerializer):
     class Meta:
-        model = Customer
+        model = WorkingHours
+        fields = '__all__'
+
+    def validate(self, attrs):
+        start = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        if end <= start:
+            raise serializers.ValidationError({"end_time": "Shift must end after it starts."})
+        return attrs
+
+class ServiceResourceSerializer(serializers.ModelSerializer):
+    working_hours = WorkingHoursSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = ServiceResource
         fields = '__all__'
 
 class ServiceAppointmentSerializer(serializers.ModelSerializer):
     # Optional: Nested details if you want to show names in the calendar JSON
     customer_name = serializers.CharField(source='customer.name', read_only=True)
+    bay_name = serializers.CharField(source='bay.name', read_only=True, default=None)
+    technician_name = serializers.CharField(source='technician.name', read_only=True, default=None)
 
     class Meta:
         model = ServiceAppointment
-        fields = '__all__'
\ No newline at end of file
+        fields = '__all__'
+
+    def validate(self, attrs):
+        # Partial updates (e.g. status only) fall back to the saved values
+        start = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+
+        if end <= start:
+            raise serializers.ValidationError({"end_time": "End time must be after start time."})
+        if end - start > scheduling.max_duration():
+            raise serializers.ValidationError({"end_time": "Appointment is longer than the allowed maximum."})
+
+        # Early answer for the form; repeated under the locks when saving
+        self.check_availability(attrs)
+        return attrs
+
+    def check_availability(self, attrs):
+        """Double-booking check (cancelled appointments don't take a bay)."""
+        start = attrs.get('start_time', getattr(self.instance, 'start_time', None))
+        end = attrs.get('end_time', getattr(self.instance, 'end_time', None))
+        status = attrs.get('status', getattr(self.instance, 'status', 'SCHEDULED'))
+
+        # A plain status change on an existing booking doesn't re-check.
+        rebooking = (
+            self.instance is None
+            or 'start_time' in attrs or 'end_time' in attrs
+            or 'bay' in attrs or 'technician' in attrs
+            or self.instance.status == 'CANCELLED'
+        )
+        if not rebooking or status == 'CANCELLED':
+            return
+
+        exclude_id = getattr(self.instance, 'pk', None)
+        busy = scheduling.peak_occupancy(start, end, exclude_id=exclude_id)
+        if busy >= scheduling.default_capacity():
+            raise serializers.ValidationError({"start_time": "This time slot is already fully booked."})
+
+        bay = attrs.get('bay', getattr(self.instance, 'bay', None))
+        technician = attrs.get('technician', getattr(self.instance, 'technician', None))
+        taken = scheduling.resource_conflicts(start, end, bay, technician, exclude_id=exclude_id)
+        if taken:
+            raise serializers.ValidationError({"start_time": f"Already booked at this time: {', '.join(taken)}."})
+
+    def lock_resources(self, attrs):
+        """
+        Makes concurrent bookings take turns, so the re-check in create() /
+        update() sees whatever was booked just before. On Postgres that's a
+        transaction-level advisory lock - always taken, even when the shop has
+        no bay rows and the booking no technician, where locking rows would
+        lock nothing. On SQLite the transaction's write lock (BEGIN IMMEDIATE,
+        db_profiles.py) does the same. Elsewhere the rows a booking needs are
+        locked: every active bay (the shop's capacity) and the technician.
+        """
+        connection = transaction.get_connection()
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_xact_lock(%s)', [BOOKING_LOCK_ID])
+            return
+
+        technician = attrs.get('technician', getattr(self.instance, 'technician', None))
+        resources = Q(kind='BAY', is_active=True)
+        if technician is not None:
+            resources |= Q(pk=technician.pk)
+        list(ServiceResource.objects.select_for_update().filter(resources).order_by('pk').values_list('pk', flat=True))
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            self.lock_resources(validated_data)
+            self.check_availability(validated_data)
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            self.lock_resources(validated_data)
+            self.check_availability(validated_data)
+            return super().update(instance, validated_data)
+
+    def validate_bay(self, value):
+        if value and value.kind != 'BAY':
+            raise serializers.ValidationError("Selected resource is not a service bay.")
+        return value
+
+    def validate_technician(self, value):
+        if value and value.kind != 'TECH':
+            raise serializers.ValidationError("Selected resource is not a technician.")
+        return value
\ No newline at end of file
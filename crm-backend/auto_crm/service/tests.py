@@ -0,0 +1,218 @@
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from notifications.models import OutboundSMS
+
+from . import scheduling
+from .models import Customer, ServiceAppointment, ServiceRecord, ServiceResource, ServiceVehicle, WorkingHours
+from .serializers import BOOKING_LOCK_ID, ServiceAppointmentSerializer
+
+
+def local(day, hour, minute=0):
+    return datetime.combine(day, time(hour, minute), tzinfo=timezone.get_current_timezone())
+
+
+class SlotCapacityTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bay = ServiceResource.objects.create(name='Lift 1', kind='BAY')
+        cls.tech = ServiceResource.objects.create(name='Sam', kind='TECH')
+        for resource in (cls.bay, cls.tech):
+            WorkingHours.objects.bulk_create([
+                WorkingHours(resource=resource, weekday=weekday, start_time=time(8), end_time=time(17))
+                for weekday in range(7)
+            ])
+        cls.customer = Customer.objects.create(name='Ann Lee', phone='555-0100')
+        cls.day = timezone.localdate() + timedelta(days=7)
+
+    def test_unassigned_booking_takes_the_only_bay(self):
+        # No bay or technician picked, but it still counts against the one-bay capacity
+        ServiceAppointment.objects.create(
+            customer=self.customer, title='Oil change',
+            start_time=local(self.day, 9), end_time=local(self.day, 10),
+        )
+
+        slots = scheduling.find_slots(timedelta(hours=1), local(self.day, 8), local(self.day, 12), limit=10)
+
+        starts = [slot['start'] for slot in slots]
+        self.assertEqual(starts, [local(self.day, 8), local(self.day, 10), local(self.day, 10, 30), local(self.day, 11)])
+        for slot in slots:
+            serializer = ServiceAppointmentSerializer(data={
+                'customer': self.customer.pk, 'title': 'Brakes',
+                'start_time': slot['start'], 'end_time': slot['end'],
+                'bay': slot['bay']['id'], 'technician': slot['technician']['id'],
+            })
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+
+    def test_booking_rechecks_when_saving(self):
+        # Two requests for the last bay both pass validation before either saves
+        data = {
+            'customer': self.customer.pk, 'title': 'Brakes', 'bay': self.bay.pk,
+            'start_time': local(self.day, 13), 'end_time': local(self.day, 14),
+        }
+        first, second = ServiceAppointmentSerializer(data=data), ServiceAppointmentSerializer(data=data)
+        self.assertTrue(first.is_valid(), first.errors)
+        self.assertTrue(second.is_valid(), second.errors)
+
+        first.save()
+        with self.assertRaises(ValidationError):
+            second.save()
+        self.assertEqual(ServiceAppointment.objects.filter(start_time=local(self.day, 13)).count(), 1)
+
+    def test_plain_end_date_includes_that_whole_day(self):
+        # The calendar's day view asks for ?start=<day>&end=<day>
+        ServiceAppointment.objects.create(
+            customer=self.customer, title='Oil change', start_time=local(self.day, 15), end_time=local(self.day, 16),
+        )
+        response = self.client.get(f'/api/service/appointments/?start={self.day}&end={self.day}')
+        self.assertEqual([row['title'] for row in response.json()], ['Oil change'])
+
+    def test_postgres_booking_always_takes_the_booking_lock(self):
+        # No active bay and no technician: no row a booking could lock
+        ServiceResource.objects.filter(kind='BAY').update(is_active=False)
+        connection = mock.MagicMock(vendor='postgresql')
+        with mock.patch('service.serializers.transaction.get_connection', return_value=connection):
+            ServiceAppointmentSerializer().lock_resources({})
+        connection.cursor().__enter__().execute.assert_called_once_with(
+            'SELECT pg_advisory_xact_lock(%s)', [BOOKING_LOCK_ID],
+        )
+
+
+class ServiceQueryCountTests(TestCase):
+    """
+    Each endpoint's query count is pinned, and has to stay the same as the
+    data grows - a serializer field that lazily loads a relation would add
+    one query per row.
+    """
+
+    # (url, queries). {customer} / {vehicle} / {record} / {appointment}: an existing id.
+    # Lists and details: the ETag aggregate (+ one per etag_depends_on model), the
+    # rows, one per prefetched relation; history actions: object, count, page
+    ENDPOINTS = [
+        ('/api/service/customers/', 2),
+        ('/api/service/customers/?expand=vehicles', 4),
+        ('/api/service/customers/?expand=vehicles,history', 6),
+        ('/api/service/customers/{customer}/', 2),
+        ('/api/service/customers/{customer}/?expand=vehicles,history', 6),
+        ('/api/service/customers/{customer}/history/', 3),
+        ('/api/service/vehicles/', 3),
+        ('/api/service/vehicles/?expand=history', 5),
+        ('/api/service/vehicles/{vehicle}/', 3),
+        ('/api/service/vehicles/{vehicle}/?expand=history', 5),
+        ('/api/service/vehicles/{vehicle}/history/', 3),
+        ('/api/service/records/', 4),
+        ('/api/service/records/{record}/', 4),
+        ('/api/service/appointments/', 4),
+        ('/api/service/appointments/?start={day}&end={day}', 4),
+        ('/api/service/appointments/{appointment}/', 4),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.bay = ServiceResource.objects.create(name='Lift 1', kind='BAY')
+        cls.tech = ServiceResource.objects.create(name='Sam', kind='TECH')
+        cls.day = timezone.localdate() + timedelta(days=7)
+        cls.add_customers(0, 3)
+
+    @classmethod
+    def add_customers(cls, first, count):
+        for n in range(first, first + count):
+            customer = Customer.objects.create(name=f'Customer {n}', phone=f'555-03{n:02}')
+            for v in range(2):
+                vehicle = ServiceVehicle.objects.create(
+                    owner=customer, license_plate=f'P{n:03}{v}', make='Kia', model='Rio', year=2020,
+                )
+                for r in range(3):
+                    ServiceRecord.objects.create(vehicle=vehicle, description=f'Job {r}', parts_cost=10, labor_cost=20)
+            ServiceAppointment.objects.create(
+                customer=customer, vehicle=vehicle, title='Oil change', bay=cls.bay, technician=cls.tech,
+                start_time=local(cls.day, 8) + timedelta(minutes=n), end_time=local(cls.day, 9) + timedelta(minutes=n),
+            )
+
+    def url(self, template):
+        record = ServiceRecord.objects.order_by('id').first()
+        return template.format(
+            customer=record.vehicle.owner_id, vehicle=record.vehicle_id, record=record.pk,
+            appointment=ServiceAppointment.objects.order_by('id').first().pk, day=self.day.isoformat(),
+        )
+
+    def test_query_counts(self):
+        for template, queries in self.ENDPOINTS:
+            with self.subTest(template):
+                url = self.url(template)
+                with self.assertNumQueries(queries):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_query_counts_do_not_grow_with_rows(self):
+        self.add_customers(3, 7)
+        self.test_query_counts()
+
+
+class CheckInTests(TestCase):
+
+    def test_check_in_finds_a_car_saved_with_a_dashed_plate(self):
+        owner = Customer.objects.create(name='Ann Lee', phone='555-0100')
+        response = self.client.post('/api/service/vehicles/', {
+            'owner': owner.pk, 'license_plate': 'abc-123', 'make': 'Kia', 'model': 'Rio',
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201, response.content)
+
+        response = self.client.post('/api/service/check-in/', {
+            'name': 'Ann Lee', 'phone': '555-0100', 'license_plate': 'ABC 123', 'description': 'Brakes',
+        }, content_type='application/json')
+
+        self.assertEqual(response.status_code, 201, response.content)
+        vehicle = ServiceVehicle.objects.get()
+        self.assertEqual(response.json()['vehicle']['id'], vehicle.pk)
+        self.assertEqual(vehicle.history.count(), 1)
+
+
+class ManualSMSTests(TestCase):
+
+    def test_sms_goes_to_the_vehicle_owner(self):
+        owner = Customer.objects.create(name='Ann Lee', phone='555-0100')
+        vehicle = ServiceVehicle.objects.create(owner=owner, license_plate='ABC123', make='Kia', model='Rio')
+        record = ServiceRecord.objects.create(vehicle=vehicle, description='Brakes', parts_cost=100, labor_cost=50)
+
+        response = self.client.post(f'/api/service/records/{record.pk}/sms/')
+
+        self.assertEqual(response.status_code, 200)
+        sms = OutboundSMS.objects.get()
+        self.assertEqual((sms.to, sms.kind), ('555-0100', 'service-manual'))
+        self.assertIn('Hi Ann Lee', sms.body)
+        self.assertIn('Kia Rio', sms.body)
+        self.assertIn('$150.00', sms.body)
+
+
+class ServiceRecordTotalTests(TestCase):
+
+    def test_save_sets_total_without_reading_it_back(self):
+        owner = Customer.objects.create(name='Ann Lee', phone='555-0100')
+        vehicle = ServiceVehicle.objects.create(owner=owner, license_plate='ABC123', make='Kia', model='Rio')
+
+        with CaptureQueriesContext(connection) as insert:
+            record = ServiceRecord.objects.create(
+                vehicle=vehicle, description='Brakes', parts_cost=100, labor_cost='49.99', tax=Decimal('12.50'),
+            )
+        self.assertEqual(record.total_cost, Decimal('162.49'))
+
+        record.discount = Decimal('20.00')
+        record.labor_cost = Decimal('60.00')
+        with CaptureQueriesContext(connection) as update:
+            record.save()
+        self.assertEqual(record.total_cost, Decimal('152.50'))
+
+        # What the database stored is what the instance shows
+        self.assertEqual(ServiceRecord.objects.get(pk=record.pk).total_cost, record.total_cost)
+        reload = 'SELECT "service_servicerecord"."id", "service_servicerecord"."total_cost" FROM'
+        for query in insert.captured_queries + update.captured_queries:
+            self.assertFalse(query['sql'].startswith(reload), query['sql'])
@@ -1,14 +1,17 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import LicensePlateScanView, CustomerViewSet, ServiceAppointmentViewSet, ServiceVehicleViewSet, ServiceRecordViewSet
+from .views import LicensePlateScanView, CheckInView, CustomerViewSet, ServiceAppointmentViewSet, ServiceVehicleViewSet, ServiceRecordViewSet, ServiceResourceViewSet, WorkingHoursViewSet
 
 router = DefaultRouter()
 router.register(r'customers', CustomerViewSet)
 router.register(r'vehicles', ServiceVehicleViewSet)
 router.register(r'records', ServiceRecordViewSet)
 router.register(r'appointments', ServiceAppointmentViewSet)
+router.register(r'resources', ServiceResourceViewSet)
+router.register(r'working-hours', WorkingHoursViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
     path('scan-plate/', LicensePlateScanView.as_view(), name='scan-plate'),
+    path('check-in/', CheckInView.as_view(), name='check-in'),
 ]
\ No newline at end of file
@@ -1,39 +1,164 @@
 import cv2
 import easyocr
 import numpy as np
+from datetime import timedelta
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.utils import timezone
 from rest_framework import viewsets, views, status
 from rest_framework.response import Response
-from rest_framework.decorators import api_view, parser_classes
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.parsers import MultiPartParser, FormParser
-from .models import Customer, ServiceVehicle, ServiceRecord, ServiceAppointment
+from .models import Customer, ServiceVehicle, ServiceRecord, ServiceAppointment, ServiceResource, WorkingHours
 from .serializers import (
     CustomerSerializer, 
+    CustomerVehiclesSerializer,
+    CustomerHistorySerializer,
     ServiceVehicleSerializer, 
+    ServiceVehicleHistorySerializer,
     ServiceRecordSerializer, 
-    ServiceAppointmentSerializer
+    ServiceAppointmentSerializer,
+    ServiceResourceSerializer,
+    WorkingHoursSerializer
 )
-from auto_crm.sms import send_sms_notification
+from auto_crm.conditional import ConditionalGetMixin
+from auto_crm.fast_list import ValuesListMixin
+from auto_crm.documents import pdf_response
+from auto_crm.identity import normalize_phone, normalize_plate
+from notifications.outbox import enqueue_sms
+from sales.models import Lead
+from sales.serializers import LeadSerializer
+from sync.delta import DeltaSyncMixin
+from . import scheduling
 
 # --- 1. STANDARD CRUD VIEWSETS ---
 
-class CustomerViewSet(viewsets.ModelViewSet):
+class HistoryPagination(PageNumberPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+
+
+def history_queryset():
+    # Every record needs vehicle + owner for vehicle_details / customer_name
+    return ServiceRecord.objects.select_related('vehicle__owner').order_by('-date')
+
+
+class ExpandMixin:
+    """
+    List/detail endpoints return flat rows by default.
+    Nested data is opt-in: ?expand=vehicles or ?expand=vehicles,history
+    """
+    def get_expand(self):
+        return set(filter(None, self.request.query_params.get('expand', '').split(',')))
+
+    def paginated_history(self, records):
+        paginator = HistoryPagination()
+        page = paginator.paginate_queryset(records, self.request, view=self)
+        return paginator.get_paginated_response(ServiceRecordSerializer(page, many=True).data)
+
+
+class CustomerViewSet(DeltaSyncMixin, ConditionalGetMixin, ValuesListMixin, ExpandMixin, viewsets.ModelViewSet):
     queryset = Customer.objects.all()
     serializer_class = CustomerSerializer
 
-class ServiceVehicleViewSet(viewsets.ModelViewSet):
+    def get_etag_depends_on(self):
+        expand = self.get_expand()
+        if 'history' in expand:
+            return (ServiceVehicle, ServiceRecord)
+        if 'vehicles' in expand:
+            return (ServiceVehicle,)
+        return ()
+
+    def get_queryset(self):
+        queryset = Customer.objects.order_by('id')
+        expand = self.get_expand()
+        if 'history' in expand:
+            queryset = queryset.prefetch_related(
+                Prefetch('vehicles', queryset=ServiceVehicle.objects.select_related('owner')),
+                Prefetch('vehicles__history', queryset=history_queryset()),
+            )
+        elif 'vehicles' in expand:
+            queryset = queryset.prefetch_related(
+                Prefetch('vehicles', queryset=ServiceVehicle.objects.select_related('owner'))
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        expand = self.get_expand()
+        if 'history' in expand:
+            return CustomerHistorySerializer
+        if 'vehicles' in expand:
+            return CustomerVehiclesSerializer
+        return CustomerSerializer
+
+    # GET /api/service/customers/<id>/history/?page=2
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        customer = self.get_object()
+        return self.paginated_history(history_queryset().filter(vehicle__owner=customer))
+
+
+    # GET /api/service/customers/<id>/leads/ - sales leads for this person (via CustomerLink)
+    @action(detail=True, methods=['get'])
+    def leads(self, request, pk=None):
+        leads = Lead.objects.filter(service_links__customer_id=pk).select_related('vehicle').order_by('-created_at')
+        paginator = HistoryPagination()
+        page = paginator.paginate_queryset(leads, request, view=self)
+        return paginator.get_paginated_response(LeadSerializer(page, many=True).data)
+
+
+class ServiceVehicleViewSet(DeltaSyncMixin, ConditionalGetMixin, ValuesListMixin, ExpandMixin, viewsets.ModelViewSet):
     queryset = ServiceVehicle.objects.all()
     serializer_class = ServiceVehicleSerializer
 
-class ServiceRecordViewSet(viewsets.ModelViewSet):
-    queryset = ServiceRecord.objects.all()
+    def get_etag_depends_on(self):
+        # owner_name / owner_phone (+ the jobs with ?expand=history)
+        if 'history' in self.get_expand():
+            return (Customer, ServiceRecord)
+        return (Customer,)
+
+    def get_queryset(self):
+        queryset = ServiceVehicle.objects.select_related('owner').order_by('id')
+
+        # Manual plate search: ?license_plate=ABC123
+        plate = self.request.query_params.get('license_plate')
+        if plate:
+            queryset = queryset.filter(license_plate__iexact=plate.strip())
+
+        if 'history' in self.get_expand():
+            queryset = queryset.prefetch_related(Prefetch('history', queryset=history_queryset()))
+        return queryset
+
+    def get_serializer_class(self):
+        if 'history' in self.get_expand():
+            return ServiceVehicleHistorySerializer
+        return ServiceVehicleSerializer
+
+    # GET /api/service/vehicles/<id>/history/?page=2
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        vehicle = self.get_object()
+        return self.paginated_history(history_queryset().filter(vehicle=vehicle))
+
+class ServiceRecordViewSet(DeltaSyncMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = ServiceRecord.objects.select_related('vehicle__owner')
     serializer_class = ServiceRecordSerializer
+    etag_depends_on = (ServiceVehicle, Customer)  # vehicle_details, customer_name / phone
 
     # This handles AUTOMATIC SMS when status changes to 'COMPLETED'
     def perform_update(self, serializer):
         instance = self.get_object()
         old_status = instance.status
-        updated_record = serializer.save()
 
+        # The status change and its SMS commit together (or not at all)
+        with transaction.atomic():
+            updated_record = serializer.save()
+            self.queue_completed_sms(old_status, updated_record)
+
+    def queue_completed_sms(self, old_status, updated_record):
         if old_status != 'COMPLETED' and updated_record.status == 'COMPLETED':
             
             phone = None
@@ -60,7 +185,7 @@ class ServiceRecordViewSet(viewsets.ModelViewSet):
                              name = f"{owner.first_name} {owner.last_name or ''}"
                         break
             
-            # --- 2. SEND SMS ---
+            # --- 2. QUEUE SMS (sent by `manage.py dispatch_sms`) ---
             if phone:
                 # Get Vehicle Name
                 vehicle_info = "your vehicle"
@@ -74,66 +199,203 @@ class ServiceRecordViewSet(viewsets.ModelViewSet):
                     f"✅ Good news! The service for {vehicle_info} is completed. \n"
                     f"Total Due: ${updated_record.total_cost}"
                 )
-                send_sms_notification(phone, message)
+                enqueue_sms(phone, message, kind='service-completed', dedupe_key=f'service-completed:{updated_record.pk}')
             else:
                 print("❌ SMS FAILED: Found the Owner, but they have no phone number saved.")
 
-class ServiceAppointmentViewSet(viewsets.ModelViewSet):
-    queryset = ServiceAppointment.objects.all()
+    # --- MANUAL SMS ("Send SMS" button) ---
+    # POST /api/service/records/<id>/sms/
+    @action(detail=True, methods=['post'])
+    def sms(self, request, pk=None):
+        record = self.get_object()
+        owner = record.vehicle.owner
+        if not owner.phone:
+            return Response({"error": "No phone number found for this customer."}, status=400)
+
+        vehicle_name = f"{record.vehicle.make or ''} {record.vehicle.model or ''}".strip() or "your vehicle"
+        message = (
+            f"Hi {owner.name or 'Valued Customer'},\n"
+            f"✅ Good news! The service for {vehicle_name} is completed.\n"
+            f"Total Due: ${record.total_cost}"
+        )
+        # Asked for explicitly, so no dedupe key
+        enqueue_sms(owner.phone, message, kind='service-manual')
+        return Response({"status": "SMS Queued", "to": owner.phone})
+
+    # --- PDF DOCUMENTS (cached by content hash, see auto_crm/documents.py) ---
+    @action(detail=True, methods=['get'])
+    def invoice(self, request, pk=None):
+        record = self.get_object()
+        return pdf_response('invoice', record, f"invoice-{record.pk:06d}.pdf")
+
+    @action(detail=True, methods=['get'], url_path='job-card')
+    def job_card(self, request, pk=None):
+        record = self.get_object()
+        return pdf_response('job_card', record, f"job-card-{record.pk:06d}.pdf")
+
+class ServiceAppointmentViewSet(DeltaSyncMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
+    queryset = ServiceAppointment.objects.select_related('customer', 'bay', 'technician')
     serializer_class = ServiceAppointmentSerializer
+    etag_depends_on = (Customer, ServiceResource)  # customer / bay / technician names
 
+    def get_queryset(self):
+        queryset = ServiceAppointment.objects.select_related('customer', 'bay', 'technician').order_by('start_time')
 
-# --- 2. MANUAL SMS TRIGGER (For the "Send SMS" Button) ---
-@api_view(['POST'])
-def send_service_sms(request, pk):
-    try:
-        service = ServiceRecord.objects.get(pk=pk)
-        
-        # --- 1. FIND PHONE NUMBER ---
-        phone = None
-        
-        # A. Direct field
-        if service.customer_phone:
-            phone = service.customer_phone
-            
-        # B. Owner field
-        elif service.vehicle and hasattr(service.vehicle, 'owner') and service.vehicle.owner:
-            owner = service.vehicle.owner
-            for field in ['phone', 'phone_number', 'mobile', 'contact_number']:
-                if hasattr(owner, field) and getattr(owner, field):
-                    phone = getattr(owner, field)
-                    break
+        # Calendar window: ?start=2026-01-01&end=2026-02-01
+        if self.action == 'list':
+            try:
+                start = scheduling.parse_when(self.request.query_params.get('start'))
+                end = scheduling.parse_when(self.request.query_params.get('end'), end_of_day=True)
+            except ValueError as e:
+                raise ValidationError({"error": str(e)})
+            if start and end:
+                queryset = scheduling.overlapping(start, end, queryset)
+            elif start:
+                queryset = queryset.filter(end_time__gt=start)
+            elif end:
+                queryset = queryset.filter(start_time__lt=end)
+        return queryset
 
-        if not phone:
-            return Response({"error": "No phone number found for this customer."}, status=400)
+    # GET /api/service/appointments/free-slots/?start=...&end=...&duration=60&capacity=2
+    @action(detail=False, methods=['get'], url_path='free-slots')
+    def free_slots(self, request):
+        params = request.query_params
+        try:
+            start = scheduling.parse_when(params.get('start')) or timezone.now()
+            end = scheduling.parse_when(params.get('end'), end_of_day=True) or start + timedelta(days=7)
+            duration = timedelta(minutes=int(params.get('duration', 60)))
+            capacity = int(params.get('capacity', 0)) or None
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
 
-        # --- 2. PREPARE MESSAGE ---
-        customer_name = service.customer_name or "Valued Customer"
-        if service.vehicle and hasattr(service.vehicle, 'owner') and service.vehicle.owner:
-             customer_name = str(service.vehicle.owner)
+        if end <= start or duration.total_seconds() <= 0:
+            return Response({"error": "end must be after start and duration must be positive"}, status=400)
+        if end - start > timedelta(days=366):
+            return Response({"error": "Search window is limited to one year"}, status=400)
 
-        # Build Vehicle Name
-        vehicle_name = "your vehicle"
-        if service.vehicle:
-            vehicle_name = f"{service.vehicle.make or ''} {service.vehicle.model or ''}"
+        windows = scheduling.free_windows(start, end, duration, capacity)
+        return Response([{"start": s, "end": e} for s, e in windows])
 
-        message = (
-            f"Hi {customer_name},\n"
-            f"✅ Good news! The service for {vehicle_name} is completed.\n"
-            f"Total Due: ${service.total_cost}"
+
+class ServiceResourceViewSet(viewsets.ModelViewSet):
+    queryset = ServiceResource.objects.prefetch_related('working_hours').order_by('kind', 'name')
+    serializer_class = ServiceResourceSerializer
+
+    # GET /api/service/resources/slots/?duration=90&start=2026-03-02&end=2026-03-31&limit=10&step=30
+    @action(detail=False, methods=['get'])
+    def slots(self, request):
+        params = request.query_params
+        try:
+            start = scheduling.parse_when(params.get('start')) or timezone.now()
+            end = scheduling.parse_when(params.get('end'), end_of_day=True) or start + timedelta(days=31)
+            duration = timedelta(minutes=int(params.get('duration', 60)))
+            step = timedelta(minutes=int(params.get('step', 30)))
+            limit = min(int(params.get('limit', 10)), 100)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=400)
+
+        if end <= start or duration.total_seconds() <= 0 or step.total_seconds() <= 0:
+            return Response({"error": "end must be after start; duration and step must be positive"}, status=400)
+        if end - start > timedelta(days=92):
+            return Response({"error": "Search window is limited to three months"}, status=400)
+
+        return Response(scheduling.find_slots(duration, start, end, limit=limit, step=step))
+
+class WorkingHoursViewSet(viewsets.ModelViewSet):
+    queryset = WorkingHours.objects.select_related('resource')
+    serializer_class = WorkingHoursSerializer
+
+
+# --- WALK-IN CHECK-IN (Customer + Vehicle + Job in one transaction) ---
+class CheckInView(views.APIView):
+    """
+    Endpoint: POST /api/service/check-in/
+    Body: { "name", "phone", "email"?, "license_plate", "make"?, "model"?, "year"?, "description" }
+    Finds the customer by normalized phone and the car by normalized plate
+    (creating either if missing), opens a PENDING job and returns the job card.
+    """
+    def post(self, request):
+        data = request.data
+        phone_key = normalize_phone(data.get('phone'))
+        plate = normalize_plate(data.get('license_plate'))
+        description = (data.get('description') or '').strip()
+
+        errors = {}
+        if not phone_key:
+            errors['phone'] = "A valid phone number is required."
+        if not plate:
+            errors['license_plate'] = "License plate is required."
+        if not description:
+            errors['description'] = "Describe the service needed."
+        if data.get('year') and not str(data['year']).isdigit():
+            errors['year'] = "Year must be a number."
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with transaction.atomic():
+                customer = self._upsert_customer(data, phone_key)
+                vehicle = self._upsert_vehicle(data, plate, customer)
+                record = ServiceRecord.objects.create(vehicle=vehicle, description=description)
+        except IntegrityError:
+            # Another advisor registered the same plate at the same moment
+            return Response({"license_plate": "This plate was just registered, please retry."}, status=409)
+
+        vehicle = (
+            ServiceVehicle.objects.select_related('owner')
+            .prefetch_related(Prefetch('history', queryset=history_queryset()))
+            .get(pk=vehicle.pk)
         )
+        return Response({
+            "job": ServiceRecordSerializer(record).data,
+            "customer": CustomerSerializer(customer).data,
+            "vehicle": ServiceVehicleHistorySerializer(vehicle).data,
+        }, status=status.HTTP_201_CREATED)
+
+    def _upsert_customer(self, data, phone_key):
+        customer = Customer.objects.select_for_update().filter(phone_key=phone_key).order_by('id').first()
+        if customer is None:
+            return Customer.objects.create(
+                name=(data.get('name') or '').strip() or "Walk-in Customer",
+                phone=data.get('phone'),
+                email=data.get('email') or None,
+            )
 
-        # --- 3. SEND ---
-        send_sms_notification(phone, message)
-        return Response({"status": "SMS Sent", "to": phone})
+        # Returning customer: only fill in what we didn't know yet
+        if data.get('email') and not customer.email:
+            customer.email = data['email']
+            customer.save(update_fields=['email', 'updated_at'])
+        return customer
 
-    except ServiceRecord.DoesNotExist:
-        return Response({"error": "Service Record not found"}, status=404)
-    except Exception as e:
-        return Response({"error": str(e)}, status=500)
+    def _upsert_vehicle(self, data, plate, customer):
+        details = {}
+        for field in ('make', 'model'):
+            value = (data.get(field) or '').strip()
+            if value and value != 'Unknown':
+                details[field] = value
+        if data.get('year'):
+            details['year'] = int(data['year'])
 
+        # The API stores plates as typed ("abc-123"), so match on the normalized key
+        vehicle = ServiceVehicle.objects.select_for_update().filter(plate_key=plate).order_by('id').first()
+        if vehicle is None:
+            return ServiceVehicle.objects.create(
+                license_plate=plate,
+                owner=customer,
+                make=details.get('make', 'Unknown'),
+                model=details.get('model', 'Unknown'),
+                year=details.get('year'),
+            )
 
-# --- 3. AI SCANNER LOGIC ---
+        # Known car: whoever brings it in is the current owner
+        vehicle.owner = customer
+        for field, value in details.items():
+            setattr(vehicle, field, value)
+        vehicle.save()
+        return vehicle
+
+
+# --- 2. AI SCANNER LOGIC ---
 class LicensePlateScanView(views.APIView):
     parser_classes = (MultiPartParser, FormParser)
 
@@ -166,11 +428,13 @@ class LicensePlateScanView(views.APIView):
 
             # D. Search Database
             vehicle_data = None
-            try:
-                vehicle = ServiceVehicle.objects.get(license_plate=detected_text)
-                vehicle_data = ServiceVehicleSerializer(vehicle).data
-            except ServiceVehicle.DoesNotExist:
-                vehicle_data = None
+            vehicle = (
+                ServiceVehicle.objects.select_related('owner')
+                .prefetch_related(Prefetch('history', queryset=history_queryset()))
+                .filter(plate_key=detected_text).order_by('id').first()
+            )
+            if vehicle is not None:
+                vehicle_data = ServiceVehicleHistorySerializer(vehicle).data
 
             return Response({
                 "plate": detected_text,
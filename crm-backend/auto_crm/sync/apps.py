@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class SyncConfig(AppConfig):
+    name = 'sync'
+
+    def ready(self):
+        # Writes a Tombstone for every deleted row of a synced model
+        from . import signals  # noqa: F401
@@ -0,0 +1,112 @@
+# sync/delta.py
+"""
+Delta sync ("changes since") for the list endpoints, so a client that already
+holds a list refreshes it at the cost of what changed, not of the table.
+
+Every list response carries an X-Sync-Cursor header. Sending it back as
+?since=<cursor> (with the same filters) returns instead:
+
+    {"cursor": "<next cursor>", "changed": [rows...], "deleted": [ids...]}
+
+- changed: rows of the filtered list whose updated_at is at or after the
+  cursor (one range scan of the updated_at index), serialized as usual;
+- deleted: Tombstones (sync/signals.py) since the cursor, plus rows that
+  changed but no longer match the filters (e.g. an appointment moved out of
+  the calendar window) - either way the client drops them.
+
+A cursor is the server time when the previous response was started, and
+each delta reaches SYNC_OVERLAP_SECONDS further back, so a row saved by a
+transaction that committed while that response was being built is still
+picked up. Rows may therefore arrive twice; clients upsert by id. A cursor
+older than SYNC_TOMBSTONE_DAYS gets 410 Gone: reload the full list.
+
+Nested details of related rows (a lead's vehicle_details, a job's customer
+name) are only refreshed when the row itself changes.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from inventory.models import Vehicle
+from sales.models import Lead
+from service.models import Customer, ServiceAppointment, ServiceRecord, ServiceVehicle
+from .models import Tombstone
+
+CURSOR_HEADER = 'X-Sync-Cursor'
+
+# Models with updated_at (indexed) whose deletes leave tombstones
+SYNCED_MODELS = [Vehicle, Lead, Customer, ServiceVehicle, ServiceRecord, ServiceAppointment]
+
+
+# --- 1. CURSOR ---
+
+def encode_cursor(moment):
+    # Microseconds since the epoch - opaque to clients
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_cursor(token):
+    """Returns an aware datetime or raises ValueError."""
+    try:
+        return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise ValueError("Invalid since cursor")
+
+
+# --- 2. LIST ENDPOINTS ---
+
+class DeltaSyncMixin:
+    """For ModelViewSets of SYNCED_MODELS: list() takes ?since=<cursor>."""
+
+    def list(self, request, *args, **kwargs):
+        # Taken before reading, so anything saved meanwhile is in the next delta
+        cursor = encode_cursor(timezone.now())
+        since = request.query_params.get('since')
+        if not since:
+            response = super().list(request, *args, **kwargs)
+            response[CURSOR_HEADER] = cursor
+            return response
+
+        try:
+            since = decode_cursor(since)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if since < timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_DAYS):
+            return Response(
+                {"error": "Cursor is older than the deletes we keep - reload the full list."},
+                status=status.HTTP_410_GONE,
+            )
+
+        changes = self.delta(since - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS))
+        return Response({'cursor': cursor, **changes}, headers={CURSOR_HEADER: cursor})
+
+    def delta(self, since):
+        queryset = self.filter_queryset(self.get_queryset())
+        model = queryset.model
+        changed = list(queryset.filter(updated_at__gte=since))
+        listed = {row.pk for row in changed}
+
+        deleted = set(
+            Tombstone.objects.filter(model=model._meta.model_name, deleted_at__gte=since)
+            .values_list('object_id', flat=True)
+        )
+        # Changed, but filtered out of this list now
+        deleted.update(
+            pk for pk in model.objects.filter(updated_at__gte=since).values_list('pk', flat=True)
+            if pk not in listed
+        )
+        return {
+            'changed': self.get_serializer(changed, many=True).data,
+            'deleted': sorted(deleted),
+        }
+
+
+# --- 3. RETENTION ---
+
+def prune_tombstones(now=None):
+    """Deletes tombstones no cursor can ask for any more. Returns how many."""
+    cutoff = (now or timezone.now()) - timedelta(days=settings.SYNC_TOMBSTONE_DAYS)
+    return Tombstone.objects.filter(deleted_at__lt=cutoff).delete()[0]
@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from sync.delta import prune_tombstones
+
+
+class Command(BaseCommand):
+    help = "Deletes delta-sync tombstones older than SYNC_TOMBSTONE_DAYS."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help="Run again every --interval seconds (worker mode)")
+        parser.add_argument('--interval', type=float, default=3600.0, help="Seconds between runs in --loop mode")
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.perf_counter()
+            deleted = prune_tombstones()
+            self.stdout.write(f"Pruned {deleted} tombstones in {time.perf_counter() - started:.1f}s")
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
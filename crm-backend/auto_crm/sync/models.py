@@ -0,0 +1,22 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Tombstone(models.Model):
+    """
+    A deleted row of a delta-synced list (sync/delta.py), so clients holding
+    a copy of the list learn to drop it. Kept for SYNC_TOMBSTONE_DAYS by
+    `python manage.py prune_tombstones`; older cursors get a full reload.
+    """
+    model = models.CharField(max_length=30)  # model name, e.g. 'lead'
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted {self.deleted_at:%Y-%m-%d %H:%M}"
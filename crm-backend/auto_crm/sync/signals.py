@@ -0,0 +1,41 @@
+# sync/signals.py
+"""
+Keeps delta sync (sync/delta.py) complete for deletes:
+
+- every deleted row of a synced model leaves a Tombstone;
+- rows whose foreign key is about to be nulled by an on_delete=SET_NULL
+  (a lead's vehicle, an appointment's car, bay or technician) get their
+  updated_at bumped first - the database's SET NULL doesn't touch it.
+"""
+from django.apps import apps
+from django.db.models import SET_NULL
+from django.db.models.signals import post_delete, pre_delete
+from django.utils import timezone
+
+from .delta import SYNCED_MODELS
+from .models import Tombstone
+
+
+def leave_tombstone(sender, instance, **kwargs):
+    Tombstone.objects.create(model=sender._meta.model_name, object_id=instance.pk)
+
+
+def touch_set_null_rows(sender, instance, **kwargs):
+    now = timezone.now()
+    for relation in SET_NULL_RELATIONS[sender]:
+        relation.related_model.objects.filter(**{relation.field.name: instance}).update(updated_at=now)
+
+
+for model in SYNCED_MODELS:
+    post_delete.connect(leave_tombstone, sender=model, dispatch_uid=f'sync-tombstone-{model.__name__}')
+
+# Model -> its SET_NULL relations from synced models
+SET_NULL_RELATIONS = {}
+for model in apps.get_models():
+    relations = [
+        relation for relation in model._meta.related_objects
+        if relation.on_delete is SET_NULL and relation.related_model in SYNCED_MODELS
+    ]
+    if relations:
+        SET_NULL_RELATIONS[model] = relations
+        pre_delete.connect(touch_set_null_rows, sender=model, dispatch_uid=f'sync-set-null-{model.__name__}')